@@ -0,0 +1,342 @@
+import sys
+import os
+
+# --- FIX IMPORTS ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+# -------------------
+
+import argparse
+import json
+import math
+import platform
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+from connect4.connect_state import ConnectState
+from connect4.rollouts import ROLLOUTS
+from groups.Magnus_Carlsen.policy import Aha as Magnus, Node
+from groups.Magnus_Old.policy import Aha as MagnusOld
+
+BASELINE_FILE = os.path.join(SCRIPT_DIR, "benchmarks", "baseline.json")
+RESULTS_FILE = os.path.join(SCRIPT_DIR, "benchmarks", "results.json")
+
+# Registry: name -> (function returning a measurement, unit, higher_is_better)
+BENCHMARKS: dict[str, tuple[Callable[[], float], str, bool]] = {}
+
+
+def benchmark(name: str, unit: str, higher_is_better: bool):
+    def register(fn):
+        BENCHMARKS[name] = (fn, unit, higher_is_better)
+        return fn
+
+    return register
+
+
+def fixed_position(plies: int, seed: int = 7) -> ConnectState:
+    """Deterministic non-final position reached by random play from the empty board."""
+    rng = np.random.default_rng(seed)
+    while True:
+        state = ConnectState()
+        for _ in range(plies):
+            state = state.transition(int(rng.choice(state.get_free_cols())))
+            if state.is_final():
+                break
+        if not state.is_final():
+            return state
+
+
+POSITIONS = {
+    "opening": lambda: fixed_position(4),
+    "middlegame": lambda: fixed_position(14),
+    "endgame": lambda: fixed_position(28),
+}
+
+
+def ops_per_second(
+    fn: Callable[[], object], min_time: float = 0.2, trials: int = 3
+) -> float:
+    """
+    Run ``fn`` in batches until ``min_time`` elapses and return calls/second.
+    The best of ``trials`` runs is kept to reduce scheduling noise.
+    """
+    best = 0.0
+    for _ in range(trials):
+        calls = 0
+        batch = 1
+        start = time.perf_counter()
+        while True:
+            for _ in range(batch):
+                fn()
+            calls += batch
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            batch *= 2
+        best = max(best, calls / elapsed)
+    return best
+
+
+#                 MICRO: MOTOR DEL JUEGO
+
+@benchmark("state.transition", "ops/s", True)
+def bench_transition() -> float:
+    state = POSITIONS["middlegame"]()
+    col = state.get_free_cols()[0]
+    return ops_per_second(lambda: state.transition(col))
+
+
+@benchmark("state.get_winner", "ops/s", True)
+def bench_get_winner() -> float:
+    state = POSITIONS["middlegame"]()
+    return ops_per_second(state.get_winner)
+
+
+@benchmark("state.get_free_cols", "ops/s", True)
+def bench_get_free_cols() -> float:
+    state = POSITIONS["middlegame"]()
+    return ops_per_second(state.get_free_cols)
+
+
+@benchmark("state.get_heights", "ops/s", True)
+def bench_get_heights() -> float:
+    state = POSITIONS["middlegame"]()
+    return ops_per_second(state.get_heights)
+
+
+@benchmark("rollout.random", "rollouts/s", True)
+def bench_random_rollout() -> float:
+    agent = Magnus(q_file=os.devnull)
+    agent.rng = np.random.default_rng(0)
+    state = POSITIONS["opening"]()
+    return ops_per_second(lambda: agent._rollout(state, state.player), 0.5)
+
+
+def bench_rollout_policy(name: str) -> Callable[[], float]:
+    def bench() -> float:
+        policy = ROLLOUTS[name]()
+        rng = np.random.default_rng(0)
+        state = POSITIONS["opening"]()
+        return ops_per_second(lambda: policy.play(state, rng), 0.5)
+
+    return bench
+
+
+for _name in ROLLOUTS:
+    benchmark(f"rollout.{_name}.play", "rollouts/s", True)(bench_rollout_policy(_name))
+
+
+@benchmark("node.best_child", "ops/s", True)
+def bench_best_child() -> float:
+    rng = np.random.default_rng(0)
+    root = Node(POSITIONS["middlegame"]())
+    for action in list(root.untried_actions):
+        child = Node(root.state.transition(action), parent=root, parent_action=action)
+        child.visits = int(rng.integers(1, 50))
+        child.value = float(rng.random() * child.visits)
+        root.children[action] = child
+        root.visits += child.visits
+    root.untried_actions = []
+    return ops_per_second(lambda: root.best_child(math.sqrt(2), {}, 0.7))
+
+
+#                 MACRO: LATENCIA DE LOS AGENTES
+
+def act_latency(make_agent: Callable[[], object], seed: int, repeats: int = 3) -> float:
+    """Median seconds per ``act`` over the fixed positions."""
+    samples = []
+    for make_state in POSITIONS.values():
+        board = make_state().board
+        for _ in range(repeats):
+            agent = make_agent()
+            agent.rng = np.random.default_rng(seed)
+            start = time.perf_counter()
+            agent.act(board.copy())
+            samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+@benchmark("Magnus_Carlsen.act", "s", False)
+def bench_magnus_act() -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        q_file = os.path.join(tmp, "q.pkl")
+        return act_latency(lambda: Magnus(simulations=100, q_file=q_file), seed=0)
+
+
+@benchmark("Magnus_Old.act", "s", False)
+def bench_magnus_old_act() -> float:
+    return act_latency(lambda: MagnusOld(simulations=20), seed=0)
+
+
+#          FUERZA POR SEGUNDO DE CADA VARIANTE DE BÚSQUEDA
+
+# Variantes de Magnus comparadas con --strength: nombre -> argumentos de Aha
+STRENGTH_VARIANTS = {
+    **{name: {"rollout": name} for name in ROLLOUTS},
+    "uniform+rave": {"rollout": "uniform", "rave": True},
+    "uniform+rave@50": {"rollout": "uniform", "rave": True, "simulations": 50},
+    "puct": {"selection": "puct"},
+    "puct@50": {"selection": "puct", "simulations": 50},
+}
+
+
+def strength_per_second(
+    games: int = 10, simulations: int = 150, seed: int = 0, **agent_kwargs
+) -> dict:
+    """
+    Magnus (construido con ``agent_kwargs``) contra un rival fijo (Magnus_Old,
+    20 simulaciones), alternando colores. La fuerza es la puntuación media
+    (1 victoria, 0.5 empate); se divide por el tiempo medio que Magnus
+    gastó por jugada para comparar políticas más caras con más baratas.
+    """
+    rng = np.random.default_rng(seed)
+    score = 0.0
+    think = 0.0
+    moves = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for game in range(games):
+            agent = Magnus(
+                **{
+                    "simulations": simulations,
+                    "q_file": os.path.join(tmp, "q.pkl"),
+                    "autosave": False,
+                    "background_load": False,
+                    **agent_kwargs,
+                }
+            )
+            agent.rng = np.random.default_rng(rng.integers(2**32))
+            opponent = MagnusOld(simulations=20)
+            opponent.rng = np.random.default_rng(rng.integers(2**32))
+            magnus_player = -1 if game % 2 == 0 else 1
+
+            state = ConnectState()
+            while not state.is_final():
+                if state.player == magnus_player:
+                    start = time.perf_counter()
+                    col = agent.act(state.board.copy())
+                    think += time.perf_counter() - start
+                    moves += 1
+                else:
+                    col = opponent.act(state.board.copy())
+                state = state.transition(int(col))
+
+            winner = state.get_winner()
+            score += 1.0 if winner == magnus_player else 0.5 if winner == 0 else 0.0
+
+    strength = score / games
+    seconds_per_move = think / moves if moves else 0.0
+    return {
+        "score": strength,
+        "seconds_per_move": seconds_per_move,
+        "strength_per_second": strength / seconds_per_move if seconds_per_move else 0.0,
+    }
+
+
+def run_strength(games: int) -> dict:
+    results = {}
+    print(f"{'variant':<18} {'score':>7} {'s/move':>9} {'score/s':>9}")
+    for name, agent_kwargs in STRENGTH_VARIANTS.items():
+        entry = strength_per_second(games=games, **agent_kwargs)
+        results[name] = entry
+        print(
+            f"{name:<18} {entry['score']:>7.2f} {entry['seconds_per_move']:>9.4f} "
+            f"{entry['strength_per_second']:>9.2f}"
+        )
+    return results
+
+
+#                       RESULTADOS Y BASELINE
+
+def run(selected: list[str] | None = None) -> dict:
+    results = {}
+    for name, (fn, unit, higher_is_better) in BENCHMARKS.items():
+        if selected and name not in selected:
+            continue
+        value = fn()
+        results[name] = {
+            "value": value,
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        print(f"{name:<28} {value:>14.6g} {unit}")
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Return the benchmarks that got worse than the baseline by more than
+    ``threshold``, plus those that have no baseline entry (a check that
+    cannot run counts as failing; refresh with --save-baseline).
+    """
+    regressions = []
+    for name, entry in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["value"] <= 0:
+            print(f"{name:<28} {'':>8}  NO BASELINE")
+            regressions.append(name)
+            continue
+        ratio = entry["value"] / base["value"]
+        change = ratio - 1 if entry["higher_is_better"] else 1 / ratio - 1
+        status = "REGRESSION" if change < -threshold else "ok"
+        print(f"{name:<28} {change:+8.1%}  {status}")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect-4 engine and agent benchmarks")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="allowed relative slowdown before failing (default 0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--strength", type=int, metavar="GAMES", default=0,
+        help="también medir fuerza por segundo de cada variante con GAMES partidas",
+    )
+    args = parser.parse_args()
+
+    current = run(args.names)
+    if args.strength:
+        print("\n===== FUERZA POR SEGUNDO (VARIANTES) =====")
+        current["strength"] = run_strength(args.strength)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print("Baseline guardado en:", args.baseline)
+        return
+
+    if not os.path.exists(args.baseline):
+        # Igual que en compare(): una comparación que no se pudo hacer falla
+        print("No hay baseline, ejecuta con --save-baseline primero.")
+        sys.exit(1)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    print("\n===== COMPARACIÓN CONTRA BASELINE =====")
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print("Regresiones o sin baseline:", ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
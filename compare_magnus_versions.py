@@ -68,7 +68,9 @@ def play_game(policy1: Policy, policy2: Policy, name1: str, name2: str, verbose:
     return winner
 
 
-def evaluate_against_random(PolicyClass, name: str, games: int = 20, simulations: int = 200):
+def evaluate_against_random(
+    PolicyClass, name: str, games: int = 20, simulations: int = 200, **agent_kwargs
+):
     wins = 0
     losses = 0
     draws = 0
@@ -78,7 +80,7 @@ def evaluate_against_random(PolicyClass, name: str, games: int = 20, simulations
         # Instancia de la policy (vieja o nueva)
         # Para la nueva, ignorará parámetros que no existan si la firma es distinta
         try:
-            agent = PolicyClass(simulations=simulations)
+            agent = PolicyClass(simulations=simulations, **agent_kwargs)
         except TypeError:
             # Por si la versión nueva tiene más parámetros obligatorios,
             # puedes ajustar aquí si hace falta
@@ -117,7 +119,10 @@ def main():
     print("### 2) Magnus NEW vs Random")
     print("############################")
     # OJO: aquí asumo que MagnusNew acepta parámetro simulations
-    evaluate_against_random(MagnusNew, "Magnus_NEW", games=games, simulations=200)
+    # Q cargada en mount(): la primera jugada no juega con una tabla vacía
+    evaluate_against_random(
+        MagnusNew, "Magnus_NEW", games=games, simulations=200, background_load=False
+    )
 
 
 if __name__ == "__main__":
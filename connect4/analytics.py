@@ -0,0 +1,256 @@
+import argparse
+import json
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import numpy as np
+from connect4.match_log import GameRecord, iter_records, match_files, read_header
+
+COLS = 7
+MAX_PLIES = 42
+
+# Result columns used by every table: wins of Red, wins of Yellow, draws and
+# games that stopped early (forfeits)
+RESULTS = ("red", "yellow", "draw", "unfinished")
+
+
+@dataclass
+class AgentStats:
+    """
+    Results of one participant, from the games whose Red player is known
+    (``first_players`` in the match header) and their outcome. Games that
+    stopped early count in ``games`` and ``unfinished`` only.
+    """
+
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    unfinished: int = 0
+    red_games: int = 0
+    red_wins: int = 0
+    yellow_games: int = 0
+    yellow_wins: int = 0
+    # Latency from the LatencyStats of every match: (moves, p50, p95, max)
+    latency: list[tuple[int, float, float, float]] = field(default_factory=list)
+
+    def latency_summary(self) -> dict[str, float]:
+        """
+        Move-weighted mean of the per-match p50/p95 and the overall slowest
+        move. Headers keep only percentiles, not samples, so these are not
+        the percentiles of all moves pooled together.
+        """
+        if not self.latency:
+            return {}
+        moves, p50, p95, slowest = np.array(self.latency, dtype=float).T
+        weights = moves if moves.sum() > 0 else None
+        return {
+            "moves": int(moves.sum()),
+            "mean_match_p50": float(np.average(p50, weights=weights)),
+            "mean_match_p95": float(np.average(p95, weights=weights)),
+            "max": float(slowest.max()),
+        }
+
+
+@dataclass
+class Summary:
+    """Aggregates over any number of games; memory does not grow with them."""
+
+    games: int = 0
+    results: np.ndarray = field(default_factory=lambda: np.zeros(4, dtype=np.int64))
+    lengths: np.ndarray = field(
+        default_factory=lambda: np.zeros(MAX_PLIES + 1, dtype=np.int64)
+    )
+    first_moves: np.ndarray = field(
+        default_factory=lambda: np.zeros((COLS, 4), dtype=np.int64)
+    )
+    agents: dict[str, AgentStats] = field(default_factory=dict)
+
+    def agent(self, name: str) -> AgentStats:
+        return self.agents.setdefault(name, AgentStats())
+
+    def add_batch(self, records: list[GameRecord]) -> None:
+        """Fold a batch of games into the totals with vectorized counting."""
+        if not records:
+            return
+        # None (unfinished) is stored as 2, which is not a valid winner
+        winners = np.array(
+            [2 if r.winner is None else r.winner for r in records], dtype=np.int64
+        )
+        # -1 -> 0 (red), 1 -> 1 (yellow), 0 -> 2 (draw), 2 -> 3 (unfinished)
+        outcome = np.select(
+            [winners == -1, winners == 1, winners == 0], [0, 1, 2], default=3
+        )
+        lengths = np.array([len(r.moves) for r in records])
+        first = np.array([r.moves[0] if len(r.moves) else -1 for r in records])
+
+        self.games += len(records)
+        self.results += np.bincount(outcome, minlength=4)
+        self.lengths += np.bincount(lengths, minlength=MAX_PLIES + 1)[: MAX_PLIES + 1]
+        played = first >= 0
+        np.add.at(self.first_moves, (first[played], outcome[played]), 1)
+
+        # Per-agent statistics need to know who played Red: the winner is a
+        # colour, and agents swap colours between games
+        for record, result in zip(records, outcome.tolist()):
+            if record.red is None:
+                continue
+            yellow = record.player_b if record.red == record.player_a else record.player_a
+            red_stats, yellow_stats = self.agent(record.red), self.agent(yellow)
+            red_stats.red_games += 1
+            yellow_stats.yellow_games += 1
+            red_stats.red_wins += result == 0
+            yellow_stats.yellow_wins += result == 1
+            for stats, won, lost in ((red_stats, 0, 1), (yellow_stats, 1, 0)):
+                stats.games += 1
+                stats.wins += result == won
+                stats.losses += result == lost
+                stats.draws += result == 2
+                stats.unfinished += result == 3
+
+    def add_header(self, header: dict) -> None:
+        """Per-agent latency from the match header (results come from the games)."""
+        a, b = header.get("player_a"), header.get("player_b")
+        if a is None or b is None:
+            return
+        for name, latency in (
+            (a, header.get("player_a_latency")),
+            (b, header.get("player_b_latency")),
+        ):
+            stats = self.agent(name)
+            if latency and latency.get("moves"):
+                stats.latency.append(
+                    (latency["moves"], latency["p50"], latency["p95"], latency["max"])
+                )
+
+    def length_percentiles(self, q=(10, 50, 90)) -> dict[int, int]:
+        """Game length (plies) percentiles from the histogram."""
+        if not self.games:
+            return {}
+        cumulative = np.cumsum(self.lengths) / self.lengths.sum()
+        return {p: int(np.searchsorted(cumulative, p / 100)) for p in q}
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "results": dict(zip(RESULTS, self.results.tolist())),
+            "length_histogram": self.lengths.tolist(),
+            "length_percentiles": self.length_percentiles(),
+            "mean_length": (
+                float(np.dot(np.arange(MAX_PLIES + 1), self.lengths) / self.games)
+                if self.games
+                else 0.0
+            ),
+            "first_moves": {
+                col: dict(zip(RESULTS, row))
+                for col, row in enumerate(self.first_moves.tolist())
+                if sum(row)
+            },
+            "agents": {
+                name: {
+                    **{k: v for k, v in vars(stats).items() if k != "latency"},
+                    "latency": stats.latency_summary(),
+                }
+                for name, stats in sorted(self.agents.items())
+            },
+        }
+
+
+def _batches(records: Iterator[GameRecord], size: int) -> Iterator[list[GameRecord]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def summarize(paths: Iterable[str], batch_size: int = 4096) -> Summary:
+    """
+    Stream every game of the given match files into a ``Summary``.
+
+    Games are decoded one at a time (see ``match_log.iter_raw_games``) and
+    folded in batches of ``batch_size``, so memory stays constant however
+    many games the logs hold.
+    """
+    summary = Summary()
+    for path in paths:
+        summary.add_header(read_header(path))
+        for batch in _batches(iter_records([path]), batch_size):
+            summary.add_batch(batch)
+    return summary
+
+
+def _rate(part: int, total: int) -> str:
+    return f"{part / total:.1%}" if total else "-"
+
+
+def print_summary(summary: Summary) -> None:
+    """Plain-text summary tables."""
+    games = summary.games
+    red, yellow, draw, unfinished = summary.results.tolist()
+    print(f"Games: {games}")
+    print(f"{'':<12} {'games':>7} {'share':>7}")
+    for label, n in zip(RESULTS, (red, yellow, draw, unfinished)):
+        print(f"{label:<12} {n:>7} {_rate(n, games):>7}")
+
+    print("\nGame length (plies)")
+    if games:
+        mean = np.dot(np.arange(MAX_PLIES + 1), summary.lengths) / games
+        pct = summary.length_percentiles()
+        print(
+            f"mean {mean:.1f}  p10 {pct[10]}  p50 {pct[50]}  p90 {pct[90]}  "
+            f"max {int(np.flatnonzero(summary.lengths).max())}"
+        )
+
+    print("\nFirst move")
+    print(f"{'col':>3} {'games':>7} {'red':>7} {'yellow':>7} {'draw':>7}")
+    for col, row in enumerate(summary.first_moves.tolist()):
+        total = sum(row)
+        if total:
+            print(
+                f"{col:>3} {total:>7} {_rate(row[0], total):>7} "
+                f"{_rate(row[1], total):>7} {_rate(row[2], total):>7}"
+            )
+
+    print("\nAgents")
+    print(
+        f"{'agent':<20} {'games':>6} {'win':>7} {'unfin':>6} {'red win':>8} "
+        f"{'yel win':>8} {'~p50 s':>8} {'~p95 s':>8} {'max s':>8}"
+    )
+    for name, stats in sorted(summary.agents.items()):
+        latency = stats.latency_summary()
+        lat = (
+            f"{latency['mean_match_p50']:>8.4f} {latency['mean_match_p95']:>8.4f} "
+            f"{latency['max']:>8.4f}"
+            if latency
+            else f"{'-':>8} {'-':>8} {'-':>8}"
+        )
+        print(
+            f"{name:<20} {stats.games:>6} {_rate(stats.wins, stats.games):>7} "
+            f"{stats.unfinished:>6} "
+            f"{_rate(stats.red_wins, stats.red_games):>8} "
+            f"{_rate(stats.yellow_wins, stats.yellow_games):>8} {lat}"
+        )
+    print("~p50/~p95: move-weighted mean of each match's percentiles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect-4 match log analytics")
+    parser.add_argument("paths", nargs="*", help="match files or folders (default: versus)")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    paths = [p for root in (args.paths or ["versus"]) for p in match_files(root)]
+    summary = summarize(paths)
+    print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
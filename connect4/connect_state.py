@@ -2,22 +2,194 @@
 from connect4.environment_state import EnvironmentState
 
 # Types
-from typing import Any
+from typing import Any, Sequence
 
 # Libraries
 import numpy as np
 import matplotlib.pyplot as plt
 
 
+# One byte per cell: boards only hold -1, 0 and 1
+BOARD_DTYPE = np.int8
+
+
+def board_key(cells: Sequence[int] | np.ndarray, rows: int = 6, cols: int = 7) -> int:
+    """
+    Encode a board as a unique 49-bit integer.
+
+    Each column uses ``rows + 1`` bits: its Red (-1) pieces as a bitmask from
+    the bottom up, plus a sentinel bit just above the top piece. The board
+    must respect gravity (no floating pieces), which every reachable
+    position does.
+
+    Parameters
+    ----------
+    cells : Sequence[int] | np.ndarray
+        Board as a ``rows x cols`` array or its row-major flattening.
+    """
+    if isinstance(cells, np.ndarray):
+        cells = cells.ravel().tolist()
+    key = 0
+    for c in range(cols):
+        code = 0
+        height = 0
+        for r in range(rows - 1, -1, -1):
+            cell = cells[r * cols + c]
+            if cell == 0:
+                break
+            if cell == -1:
+                code |= 1 << height
+            height += 1
+        key |= (code | (1 << height)) << (c * (rows + 1))
+    return key
+
+
+def move_key(key: int, col: int, height: int, player: int, rows: int = 6) -> int:
+    """
+    ``board_key`` after ``player`` drops a piece in ``col``, which holds
+    ``height`` pieces: the sentinel bit moves up one and, for Red, leaves a
+    1 where it was.
+    """
+    bit = col * (rows + 1) + height
+    key += 1 << (bit + 1)
+    if player == 1:
+        key -= 1 << bit
+    return key
+
+
+def board_from_key(key: int, rows: int = 6, cols: int = 7) -> np.ndarray:
+    """Inverse of ``board_key``."""
+    board = np.zeros((rows, cols), dtype=BOARD_DTYPE)
+    column_mask = (1 << (rows + 1)) - 1
+    for c in range(cols):
+        code = (key >> (c * (rows + 1))) & column_mask
+        height = code.bit_length() - 1
+        for i in range(height):
+            board[rows - 1 - i, c] = -1 if code >> i & 1 else 1
+    return board
+
+
+def completes_four(
+    cells: list[list[int]], r: int, c: int, player: int, rows: int = 6, cols: int = 7
+) -> bool:
+    """
+    True if a ``player`` piece on cell (r, c) is part of four in a row.
+
+    Only the neighbours of (r, c) are read, so it works both for an empty
+    cell (would playing there win?) and for a piece just placed.
+    """
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        count = 1
+        for sign in (1, -1):
+            rr, cc = r + sign * dr, c + sign * dc
+            while 0 <= rr < rows and 0 <= cc < cols and cells[rr][cc] == player:
+                count += 1
+                rr += sign * dr
+                cc += sign * dc
+        if count >= 4:
+            return True
+    return False
+
+
+def build_lines(rows: int = 6, cols: int = 7) -> np.ndarray:
+    """Every four-in-a-row line of the board as flat cell indices (``r * cols + c``)."""
+    lines = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + 3 * dr, c + 3 * dc
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    lines.append([(r + i * dr) * cols + (c + i * dc) for i in range(4)])
+    return np.array(lines, dtype=np.intp)
+
+
+def build_cell_lines(lines: np.ndarray, cells: int = 42) -> np.ndarray:
+    """
+    Inverse of ``lines``: row ``cell`` holds the indices of the lines through
+    that cell, padded with -1 so the table can be gathered for many cells at once.
+    """
+    through = [np.flatnonzero((lines == cell).any(axis=1)) for cell in range(cells)]
+    table = np.full((cells, max(map(len, through))), -1, dtype=np.intp)
+    for cell, ids in enumerate(through):
+        table[cell, : len(ids)] = ids
+    return table
+
+
+# The 69 lines of the 6x7 board and, per cell, the (3 to 13) lines through it
+LINES = build_lines()
+CELL_LINES = build_cell_lines(LINES)
+
+# Weight of a line holding 0..4 pieces of a single player (see evaluate)
+LINE_WEIGHTS = np.array([0.0, 1.0, 4.0, 16.0, 1000.0])
+
+
+def line_sums(boards: np.ndarray) -> np.ndarray:
+    """
+    Sum of the four cells of every line.
+
+    ``boards`` is one board (``6 x 7``) or a batch (``n x 6 x 7``, or
+    already flattened to ``... x 42``); the result has shape ``... x 69``.
+    A sum of ``4 * p`` is a win for ``p`` and ``3 * p`` is a line with three
+    ``p`` pieces and one empty cell.
+    """
+    boards = np.asarray(boards)
+    if boards.shape[-2:] == (6, 7):
+        boards = boards.reshape(*boards.shape[:-2], 42)
+    return boards[..., LINES].sum(axis=-1)
+
+
+def count_threats(boards: np.ndarray, player: int) -> np.ndarray:
+    """Number of lines where ``player`` has three pieces and the fourth cell is empty."""
+    return (line_sums(boards) == 3 * player).sum(axis=-1)
+
+
+def evaluate(boards: np.ndarray, player: int = 1) -> np.ndarray:
+    """
+    Static evaluation of each board from ``player``'s point of view.
+
+    Every line still open for one side (no opponent piece on it) scores
+    ``LINE_WEIGHTS[pieces]`` for that side; the result is ``player``'s total
+    minus the opponent's. Works on a batch in a single gather.
+    """
+    boards = np.asarray(boards)
+    if boards.shape[-2:] == (6, 7):
+        boards = boards.reshape(*boards.shape[:-2], 42)
+    cells = boards[..., LINES]
+    own = (cells == player).sum(axis=-1)
+    opp = (cells == -player).sum(axis=-1)
+    return (
+        np.where(opp == 0, LINE_WEIGHTS[own], 0.0)
+        - np.where(own == 0, LINE_WEIGHTS[opp], 0.0)
+    ).sum(axis=-1)
+
+
 class ConnectState(EnvironmentState):
     ROWS = 6
     COLS = 7
 
-    def __init__(self, board: np.ndarray | None = None, player: int = -1):
+    __slots__ = ("board", "player")
+
+    def __init__(
+        self, board: np.ndarray | None = None, player: int = -1, copy: bool = True
+    ):
+        """
+        Parameters
+        ----------
+        board : np.ndarray | None
+            Board to start from (empty if None). It is stored as ``int8``.
+        player : int
+            Player to move: -1 = Red, 1 = Yellow.
+        copy : bool
+            If False and ``board`` is already ``int8``, the array is shared
+            instead of copied. Only pass False for boards nobody will modify
+            afterwards (e.g. a fresh array built for this state).
+        """
         if board is None:
-            self.board = np.zeros((self.ROWS, self.COLS), dtype=int)
+            self.board = np.zeros((self.ROWS, self.COLS), dtype=BOARD_DTYPE)
+        elif copy:
+            self.board = np.array(board, dtype=BOARD_DTYPE)
         else:
-            self.board = board.copy()
+            self.board = np.asarray(board, dtype=BOARD_DTYPE)
         self.player = player  # -1 = Red, 1 = Yellow type: ignore
 
     def is_final(self) -> bool:
@@ -32,57 +204,89 @@ class ConnectState(EnvironmentState):
         )
 
     def get_winner(self) -> int:
-        # Check all 4 directions
-        for r in range(self.ROWS):
-            for c in range(self.COLS):
-                player = self.board[r, c]
-                if player == 0:
-                    continue
-
-                # Right
-                if c + 3 < self.COLS and all(
-                    self.board[r, c + i] == player for i in range(4)
-                ):
-                    return player
-                # Down
-                if r + 3 < self.ROWS and all(
-                    self.board[r + i, c] == player for i in range(4)
-                ):
-                    return player
-                # Diagonal right-down
-                if (
-                    r + 3 < self.ROWS
-                    and c + 3 < self.COLS
-                    and all(self.board[r + i, c + i] == player for i in range(4))
-                ):
-                    return player
-                # Diagonal left-down
-                if (
-                    r + 3 < self.ROWS
-                    and c - 3 >= 0
-                    and all(self.board[r + i, c - i] == player for i in range(4))
-                ):
-                    return player
-
+        sums = self.board.ravel()[LINES].sum(axis=1)
+        if (sums == -4).any():
+            return -1
+        if (sums == 4).any():
+            return 1
         return 0
 
+    def key(self) -> int:
+        """Unique integer encoding of the board (see ``board_key``)."""
+        return board_key(self.board, self.ROWS, self.COLS)
+
+    def threat_mask(self, player: int) -> int:
+        """
+        Bitmask of the empty cells (bit ``r * COLS + c``) where a ``player``
+        piece would complete four in a row, playable now or not.
+        """
+        flat = self.board.ravel()
+        threes = LINES[flat[LINES].sum(axis=1) == 3 * player]
+        mask = 0
+        for cell in np.unique(threes[flat[threes] == 0]).tolist():
+            mask |= 1 << cell
+        return mask
+
+    def count_threats(self, player: int) -> int:
+        """Lines where ``player`` has three pieces and an empty fourth cell."""
+        return int(count_threats(self.board, player))
+
+    def evaluate(self, player: int) -> float:
+        """Static evaluation of the board for ``player`` (see ``evaluate``)."""
+        return float(evaluate(self.board, player))
+
+    def tactics(self, player: int) -> tuple[int, int, int]:
+        """
+        Immediate tactics for ``player`` in one pass over the playable cells,
+        without copying the board.
+
+        Returns
+        -------
+        tuple[int, int, int]
+            Column bitmasks (bit ``c`` set for column ``c``):
+            - wins: columns where ``player`` wins by playing now.
+            - blocks: columns where the opponent would win by playing now.
+            - unsafe: columns whose landing cell sits right under an opponent
+              winning cell, so playing there hands the opponent the win.
+        """
+        cells = self.board.tolist()
+        wins = blocks = unsafe = 0
+        for c, height in enumerate(self.get_heights()):
+            if height == self.ROWS:
+                continue
+            r = self.ROWS - 1 - height
+            if completes_four(cells, r, c, player, self.ROWS, self.COLS):
+                wins |= 1 << c
+            if completes_four(cells, r, c, -player, self.ROWS, self.COLS):
+                blocks |= 1 << c
+            if r > 0 and completes_four(
+                cells, r - 1, c, -player, self.ROWS, self.COLS
+            ):
+                unsafe |= 1 << c
+        return wins, blocks, unsafe
+
+    @staticmethod
+    def mask_to_cols(mask: int) -> list[int]:
+        """Columns set in a column bitmask, in ascending order."""
+        cols = []
+        c = 0
+        while mask:
+            if mask & 1:
+                cols.append(c)
+            mask >>= 1
+            c += 1
+        return cols
+
     def is_col_free(self, col: int) -> bool:
         return self.board[0, col] == 0
 
     def get_heights(self) -> list[int]:
-        heights = []
-        for c in range(self.COLS):
-            col = self.board[:, c]
-            for r in range(self.ROWS):
-                if col[r] != 0:
-                    heights.append(self.ROWS - r)
-                    break
-            else:
-                heights.append(0)
-        return heights
+        # Pieces never float, so a column's height is its number of pieces
+        return (self.board != 0).sum(axis=0).tolist()
 
     def get_free_cols(self) -> list[int]:
-        return [c for c in range(self.COLS) if self.is_col_free(c)]
+        top = self.board[0].tolist()
+        return [c for c in range(self.COLS) if top[c] == 0]
 
     def transition(self, col: int) -> "ConnectState":
         if not self.is_applicable(col):
@@ -94,7 +298,8 @@ class ConnectState(EnvironmentState):
                 new_board[r, col] = self.player
                 break
 
-        return ConnectState(new_board, -self.player)
+        # new_board is private to the new state: no need to copy it again
+        return ConnectState(new_board, -self.player, copy=False)
 
     def show(self, size: int = 1500, ax: plt.Axes | None = None) -> None:
         if ax is None:
@@ -12,6 +12,27 @@ class Game(list[tuple[State, Action]]):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class LatencyStats(BaseModel):
+    moves: int = Field(default=0, description="Number of timed moves.")
+    timeouts: int = Field(default=0, description="Moves that exceeded the deadline.")
+    p50: float = Field(default=0.0, description="Median seconds per move.")
+    p95: float = Field(default=0.0, description="95th percentile seconds per move.")
+    max: float = Field(default=0.0, description="Slowest move in seconds.")
+
+    @classmethod
+    def from_samples(cls, samples: list[float], timeouts: int = 0) -> "LatencyStats":
+        if not samples:
+            return cls(timeouts=timeouts)
+        values = np.asarray(samples, dtype=float)
+        return cls(
+            moves=len(samples),
+            timeouts=timeouts,
+            p50=float(np.percentile(values, 50)),
+            p95=float(np.percentile(values, 95)),
+            max=float(values.max()),
+        )
+
+
 class Match(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -22,6 +43,17 @@ class Match(BaseModel):
     player_b_wins: int = Field(default=0, description="Games won by Second Player.")
     draws: int = Field(default=0, description="Games ended in draw.")
 
+    player_a_latency: LatencyStats | None = Field(
+        default=None, description="Per-move latency of First Player."
+    )
+    player_b_latency: LatencyStats | None = Field(
+        default=None, description="Per-move latency of Second Player."
+    )
+
+    first_players: list[str] = Field(
+        default=[], description="Player that moved first (Red) in each game."
+    )
+
     games: list[Game] = Field(
         default=[],
         description="List of the history of each game, a state-action pair list produced by the alternating sequence of player actions.",
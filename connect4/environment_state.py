@@ -10,6 +10,9 @@ class EnvironmentState(ABC):
     Abstract base class representing the state of a reinforcement learning environment.
     """
 
+    # Subclasses may declare their own __slots__ to avoid a per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
     def is_final(self) -> bool:
         """
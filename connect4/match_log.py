@@ -0,0 +1,160 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import numpy as np
+from connect4.connect_state import BOARD_DTYPE, completes_four
+
+ROWS, COLS = 6, 7
+
+_GAMES_KEY = re.compile(r'"games"\s*:\s*\[')
+
+
+@dataclass
+class GameRecord:
+    """
+    One game of a match log, reduced to what is needed to replay it.
+
+    ``moves`` are the columns played from ``start`` (normally the empty
+    board, Red to move). ``winner`` is -1, 1 or 0 for a draw, and None when
+    the log stops before the game is over (e.g. a forfeit on timeout).
+    ``red`` is the participant that moved first, when the log records it.
+    """
+
+    player_a: str
+    player_b: str
+    index: int
+    start: np.ndarray
+    moves: np.ndarray
+    winner: int | None
+    red: str | None = None
+
+    @property
+    def first_player(self) -> int:
+        """Colour that made the first move (-1 unless ``start`` is not empty)."""
+        return -1 if np.sum(self.start == -1) == np.sum(self.start == 1) else 1
+
+
+def read_header(path: str, chunk_size: int = 1 << 16) -> dict:
+    """Top-level fields of a ``Match`` file written before ``games``, without the games."""
+    with open(path) as f:
+        buf = ""
+        while True:
+            match = _GAMES_KEY.search(buf)
+            if match:
+                head = buf[: match.start()].rstrip().rstrip(",")
+                return json.loads(head + "}")
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return json.loads(buf)
+            buf += chunk
+
+
+def iter_raw_games(path: str, chunk_size: int = 1 << 20) -> Iterator[list]:
+    """
+    Yield the games of a ``Match`` file one at a time, as decoded JSON.
+
+    The file is read in chunks and every game is decoded with
+    ``JSONDecoder.raw_decode`` as soon as it is complete, so memory stays
+    bounded by one game plus one chunk however large the file is.
+    """
+    decoder = json.JSONDecoder()
+    with open(path) as f:
+        buf = ""
+        pos = None
+        while pos is None:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+            match = _GAMES_KEY.search(buf)
+            if match:
+                pos = match.end()
+
+        eof = False
+        while True:
+            # Skip separators between games
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf) and buf[pos] == "]":
+                return
+            if pos < len(buf):
+                try:
+                    game, pos = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                else:
+                    yield game
+                    continue
+            elif eof:
+                raise ValueError(f"{path}: unterminated games array")
+
+            # Need more text: drop what was consumed and read the next chunk
+            buf = buf[pos:]
+            pos = 0
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+
+
+def replay(start: np.ndarray, moves: Iterable[int]) -> int | None:
+    """Winner after playing ``moves`` from ``start`` (None if the game is not over)."""
+    cells = np.asarray(start).tolist()
+    heights = [sum(1 for r in range(ROWS) if cells[r][c] != 0) for c in range(COLS)]
+    player = -1 if sum(row.count(-1) for row in cells) == sum(
+        row.count(1) for row in cells
+    ) else 1
+
+    for col in moves:
+        col = int(col)
+        row = ROWS - 1 - heights[col]
+        cells[row][col] = player
+        heights[col] += 1
+        if completes_four(cells, row, col, player, ROWS, COLS):
+            return player
+        player = -player
+    return 0 if all(h == ROWS for h in heights) else None
+
+
+def record_from_game(
+    game: Iterable, player_a: str = "", player_b: str = "", index: int = 0
+) -> GameRecord | None:
+    """
+    Build a ``GameRecord`` from a ``dtos.Game`` (or its JSON form): a list of
+    (board before the move, action) pairs. Returns None for an empty game.
+    """
+    pairs = list(game)
+    if not pairs:
+        return None
+    start = np.array(pairs[0][0], dtype=BOARD_DTYPE)
+    moves = np.array([action for _, action in pairs], dtype=np.int8)
+    return GameRecord(player_a, player_b, index, start, moves, replay(start, moves))
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[GameRecord]:
+    """Stream every game of every match file in ``paths`` as a ``GameRecord``."""
+    for path in paths:
+        header = read_header(path)
+        player_a = header.get("player_a", "")
+        player_b = header.get("player_b", "")
+        first_players = header.get("first_players", [])
+        for index, game in enumerate(iter_raw_games(path)):
+            record = record_from_game(game, player_a, player_b, index)
+            if record is not None:
+                if index < len(first_players):
+                    record.red = first_players[index]
+                yield record
+
+
+def match_files(root: str = "versus") -> list[str]:
+    """Match logs (``match_*.json``) found in ``root``, sorted by name."""
+    if os.path.isfile(root):
+        return [root]
+    return sorted(
+        os.path.join(root, name)
+        for name in os.listdir(root)
+        if name.startswith("match_") and name.endswith(".json")
+    )
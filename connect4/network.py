@@ -0,0 +1,206 @@
+import numpy as np
+
+ROWS, COLS = 6, 7
+INPUT_SIZE = 2 * ROWS * COLS
+
+
+def board_planes(boards: np.ndarray, players: np.ndarray | int) -> np.ndarray:
+    """
+    Encode boards as two flattened planes from the point of view of the
+    player to move: its own pieces, then the opponent's.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        One ``6 x 7`` board or a batch ``n x 6 x 7``.
+    players : np.ndarray | int
+        Player to move in each board (-1 or 1).
+
+    Returns
+    -------
+    np.ndarray
+        ``n x 84`` float32 array.
+    """
+    boards = np.asarray(boards).reshape(-1, ROWS * COLS)
+    players = np.broadcast_to(np.asarray(players).reshape(-1, 1), (len(boards), 1))
+    return np.concatenate([boards == players, boards == -players], axis=1).astype(
+        np.float32
+    )
+
+
+def legal_mask(boards: np.ndarray) -> np.ndarray:
+    """``n x 7`` boolean mask of the columns that still have room."""
+    return np.asarray(boards).reshape(-1, ROWS, COLS)[:, 0, :] == 0
+
+
+class ValuePolicyNet:
+    """
+    Small multi-layer perceptron with a value head and a policy head.
+
+    The input are the two board planes of ``board_planes``; the hidden
+    layers use ReLU. The value head returns ``tanh`` in ``[-1, 1]`` for the
+    player to move and the policy head a softmax over the legal columns.
+    Everything is plain NumPy in float32, so a batch of leaves costs one
+    matrix multiply per layer on the CPU.
+    """
+
+    def __init__(self, hidden: tuple[int, ...] = (128, 64), seed: int | None = None):
+        rng = np.random.default_rng(seed)
+        sizes = [INPUT_SIZE, *hidden]
+        self.params: dict[str, np.ndarray] = {}
+        for i, (fan_in, fan_out) in enumerate(zip(sizes, sizes[1:])):
+            self.params[f"W{i}"] = self._init(rng, fan_in, fan_out)
+            self.params[f"b{i}"] = np.zeros(fan_out, dtype=np.float32)
+        self.params["Wv"] = self._init(rng, sizes[-1], 1)
+        self.params["bv"] = np.zeros(1, dtype=np.float32)
+        self.params["Wp"] = self._init(rng, sizes[-1], COLS)
+        self.params["bp"] = np.zeros(COLS, dtype=np.float32)
+        self._adam: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._steps = 0
+
+    @staticmethod
+    def _init(rng: np.random.Generator, fan_in: int, fan_out: int) -> np.ndarray:
+        scale = np.sqrt(2.0 / fan_in)
+        return (rng.standard_normal((fan_in, fan_out)) * scale).astype(np.float32)
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for name in self.params if name.startswith("W")) - 2
+
+    def _forward(self, x: np.ndarray):
+        activations = [x]
+        h = x
+        for i in range(self.depth):
+            h = np.maximum(h @ self.params[f"W{i}"] + self.params[f"b{i}"], 0.0)
+            activations.append(h)
+        value = np.tanh(h @ self.params["Wv"] + self.params["bv"])[:, 0]
+        logits = h @ self.params["Wp"] + self.params["bp"]
+        return activations, value, logits
+
+    @staticmethod
+    def _softmax(logits: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        logits = np.where(mask, logits, -np.inf)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def predict(
+        self, boards: np.ndarray, players: np.ndarray | int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate a batch of non-final positions.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Values (``n``) for the player to move and move priors
+            (``n x 7``, zero on full columns).
+        """
+        _, value, logits = self._forward(board_planes(boards, players))
+        return value, self._softmax(logits, legal_mask(boards))
+
+    def train_batch(
+        self,
+        x: np.ndarray,
+        z: np.ndarray,
+        pi: np.ndarray,
+        mask: np.ndarray,
+        lr: float = 1e-3,
+        weight_decay: float = 1e-4,
+    ) -> float:
+        """
+        One Adam step on ``(z - v)^2 - pi . log p`` averaged over the batch.
+
+        ``x`` are board planes, ``z`` the game outcomes for the player to
+        move, ``pi`` the target move distributions and ``mask`` the legal
+        columns. Returns the loss before the update.
+        """
+        n = len(x)
+        activations, value, logits = self._forward(x)
+        probs = self._softmax(logits, mask)
+
+        loss = np.mean((z - value) ** 2) - np.mean(
+            np.sum(pi * np.log(np.where(mask, probs, 1.0)), axis=1)
+        )
+
+        h = activations[-1]
+        d_value = (-2.0 / n) * (z - value) * (1.0 - value**2)
+        d_logits = (probs - pi) / n
+        grads = {
+            "Wv": h.T @ d_value[:, None],
+            "bv": d_value.sum(keepdims=True),
+            "Wp": h.T @ d_logits,
+            "bp": d_logits.sum(axis=0),
+        }
+        d_h = d_value[:, None] @ self.params["Wv"].T + d_logits @ self.params["Wp"].T
+        for i in reversed(range(self.depth)):
+            d_h = d_h * (activations[i + 1] > 0)
+            grads[f"W{i}"] = activations[i].T @ d_h
+            grads[f"b{i}"] = d_h.sum(axis=0)
+            d_h = d_h @ self.params[f"W{i}"].T
+
+        self._steps += 1
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        for name, grad in grads.items():
+            if name.startswith("W"):
+                grad = grad + weight_decay * self.params[name]
+            m, v = self._adam.get(name, (np.zeros_like(grad), np.zeros_like(grad)))
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad**2
+            self._adam[name] = (m, v)
+            m_hat = m / (1 - beta1**self._steps)
+            v_hat = v / (1 - beta2**self._steps)
+            self.params[name] -= (lr * m_hat / (np.sqrt(v_hat) + eps)).astype(
+                np.float32
+            )
+        return float(loss)
+
+    def fit(
+        self,
+        boards: np.ndarray,
+        players: np.ndarray,
+        z: np.ndarray,
+        pi: np.ndarray,
+        epochs: int = 10,
+        batch_size: int = 256,
+        lr: float = 1e-3,
+        seed: int = 0,
+    ) -> list[float]:
+        """
+        Train on a dataset of positions; returns the mean loss of each epoch.
+
+        Every position is also used mirrored left to right, which is a
+        symmetry of the game.
+        """
+        boards = np.asarray(boards).reshape(-1, ROWS, COLS)
+        boards = np.concatenate([boards, boards[:, :, ::-1]])
+        players = np.concatenate([players, players])
+        z = np.concatenate([z, z]).astype(np.float32)
+        pi = np.concatenate([pi, pi[:, ::-1]]).astype(np.float32)
+
+        x = board_planes(boards, players)
+        mask = legal_mask(boards)
+        rng = np.random.default_rng(seed)
+
+        history = []
+        for _ in range(epochs):
+            order = rng.permutation(len(x))
+            losses = []
+            for start in range(0, len(x), batch_size):
+                idx = order[start : start + batch_size]
+                losses.append(self.train_batch(x[idx], z[idx], pi[idx], mask[idx], lr))
+            history.append(float(np.mean(losses)))
+        return history
+
+    def save(self, path: str) -> None:
+        """Store the weights in a compressed ``.npz`` (float32)."""
+        np.savez_compressed(path, **self.params)
+
+    @classmethod
+    def load(cls, path: str) -> "ValuePolicyNet":
+        with np.load(path) as data:
+            params = {name: data[name].astype(np.float32) for name in data.files}
+        depth = sum(1 for name in params if name.startswith("W")) - 2
+        net = cls(hidden=tuple(params[f"W{i}"].shape[1] for i in range(depth)))
+        net.params = params
+        return net
@@ -0,0 +1,157 @@
+import argparse
+import importlib
+import time
+from dataclasses import dataclass, field
+from typing import Type
+
+from connect4.connect_state import ConnectState
+
+
+@dataclass
+class PerftLevel:
+    nodes: int = 0
+    wins: int = 0  # games won by the player to move at the root
+    losses: int = 0
+    draws: int = 0
+
+
+@dataclass
+class PerftResult:
+    levels: list[PerftLevel] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def total_nodes(self) -> int:
+        return sum(level.nodes for level in self.levels)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.total_nodes / self.seconds if self.seconds > 0 else 0.0
+
+
+# Counts produced by the reference ndarray backend from the empty board.
+# Any other backend must reproduce them exactly.
+EMPTY_BOARD_PERFT = [
+    (1, 0, 0, 0),
+    (7, 0, 0, 0),
+    (49, 0, 0, 0),
+    (343, 0, 0, 0),
+    (2401, 0, 0, 0),
+    (16807, 0, 0, 0),
+    (117649, 0, 0, 0),
+    (823536, 13032, 0, 0),
+    (5673234, 0, 44430, 0),
+]
+
+
+def perft(state, depth: int) -> PerftResult:
+    """
+    Count the positions reachable from ``state`` at each depth up to ``depth``.
+
+    Only the public ``ConnectState`` API (``get_winner``, ``get_free_cols``
+    and ``transition``) is used, so any backend exposing it can be checked.
+    Final positions are counted at the depth where they occur and are not
+    expanded further; their outcome is recorded from the point of view of
+    the player to move at the root.
+
+    Parameters
+    ----------
+    state : ConnectState
+        Root position.
+    depth : int
+        Number of plies to explore.
+
+    Returns
+    -------
+    PerftResult
+        One ``PerftLevel`` per depth (index 0 is the root) and elapsed time.
+    """
+    result = PerftResult(levels=[PerftLevel() for _ in range(depth + 1)])
+    root_player = state.player
+
+    def visit(node, ply: int) -> None:
+        level = result.levels[ply]
+        level.nodes += 1
+
+        winner = node.get_winner()
+        free = node.get_free_cols() if winner == 0 else []
+        if winner == root_player:
+            level.wins += 1
+            return
+        if winner != 0:
+            level.losses += 1
+            return
+        if not free:
+            level.draws += 1
+            return
+        if ply == depth:
+            return
+        for col in free:
+            visit(node.transition(col), ply + 1)
+
+    start = time.perf_counter()
+    visit(state, 0)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def state_from_moves(moves: str, backend: Type = ConnectState):
+    """Build a position by playing a string of column digits, e.g. ``"3344"``."""
+    state = backend()
+    for col in moves:
+        state = state.transition(int(col))
+    return state
+
+
+def load_backend(spec: str) -> Type:
+    """Resolve a ``module:Class`` backend specification."""
+    module_name, class_name = spec.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect-4 perft")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument(
+        "--moves", default="", help="columns played from the empty board, e.g. 3344"
+    )
+    parser.add_argument(
+        "--backend",
+        default="connect4.connect_state:ConnectState",
+        help="state class as module:Class",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="compare against the reference empty-board counts",
+    )
+    args = parser.parse_args()
+
+    backend = load_backend(args.backend)
+    result = perft(state_from_moves(args.moves, backend), args.depth)
+
+    print(f"{'depth':>5} {'nodes':>12} {'wins':>10} {'losses':>10} {'draws':>8}")
+    for ply, level in enumerate(result.levels):
+        print(
+            f"{ply:>5} {level.nodes:>12} {level.wins:>10} "
+            f"{level.losses:>10} {level.draws:>8}"
+        )
+    print(
+        f"{result.total_nodes} nodes in {result.seconds:.3f}s "
+        f"({result.nodes_per_second:,.0f} nodes/s)"
+    )
+
+    if args.check:
+        if args.moves:
+            raise SystemExit("--check only applies to the empty board")
+        counts = [
+            (lvl.nodes, lvl.wins, lvl.losses, lvl.draws) for lvl in result.levels
+        ]
+        expected = EMPTY_BOARD_PERFT[: len(counts)]
+        if counts[: len(expected)] != expected:
+            raise SystemExit("perft mismatch against reference counts")
+        print("perft counts match the reference")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from connect4.dtos import Participant
+from connect4.policy import Policy
+from connect4.policy_worker import MoveTimeout, PolicyWorker, enable_telemetry
+
+
+class PolicyPool:
+    """
+    Lifecycle manager that instantiates and mounts each participant only once.
+
+    Policies are created lazily the first time they are requested, reused for
+    every following game and torn down when the pool is closed. Two optional
+    hooks are honoured when a policy defines them:
+
+    - ``reset()``: called between games so the policy can drop per-game state.
+    - ``teardown()``: called once when the pool is closed.
+    - ``pop_telemetry()``: returns (and clears) per-move search records.
+    - ``enable_telemetry()``: called before ``mount()`` when the pool is
+      built with ``telemetry=True`` (policies are created without arguments,
+      so this is how a tournament turns their telemetry on).
+
+    When ``move_timeout`` is given every policy runs inside a
+    ``PolicyWorker`` process so that its moves can be cut off at the deadline,
+    and its mount at ``setup_timeout`` (default: ``move_timeout``). A worker
+    that does not mount in time is restarted by its first move, which then
+    counts as a timeout.
+
+    Policies are looked up by participant name, so names must be unique:
+    asking for a second participant with a name already in use raises
+    ``ValueError`` instead of silently sharing the first one's instance.
+    """
+
+    def __init__(
+        self,
+        move_timeout: float | None = None,
+        setup_timeout: float | None = None,
+        telemetry: bool = False,
+    ):
+        self.move_timeout = move_timeout
+        self.setup_timeout = setup_timeout
+        self.telemetry_enabled = telemetry
+        self._policies: dict[str, Policy] = {}
+        self._participants: dict[str, Participant] = {}
+
+    def get(self, participant: Participant) -> Policy:
+        """
+        Return the mounted policy instance of a participant, creating it on
+        first use.
+
+        Parameters
+        ----------
+        participant : Participant
+            (name, policy class) tuple.
+
+        Returns
+        -------
+        Policy
+            Mounted policy instance shared by every game played by that name.
+
+        Raises
+        ------
+        ValueError
+            If another participant with the same name was already requested.
+        """
+        name, policy_class = participant
+        known = self._participants.setdefault(name, participant)
+        if known is not participant:
+            raise ValueError(f"Two different participants are named {name!r}")
+        policy = self._policies.get(name)
+        if policy is None:
+            if self.move_timeout is None:
+                policy = policy_class()
+                if self.telemetry_enabled:
+                    enable_telemetry(policy)
+                policy.mount()
+            else:
+                policy = PolicyWorker(
+                    policy_class,
+                    self.move_timeout,
+                    self.setup_timeout,
+                    self.telemetry_enabled,
+                )
+                try:
+                    policy.mount()
+                except MoveTimeout:
+                    pass
+            self._policies[name] = policy
+        return policy
+
+    def reset(self) -> None:
+        """Call the optional ``reset()`` hook of every live policy."""
+        for policy in self._policies.values():
+            reset = getattr(policy, "reset", None)
+            if callable(reset):
+                reset()
+
+    def telemetry(self) -> dict[str, list[dict]]:
+        """Collect the pending telemetry records of every policy that has any."""
+        records = {}
+        for name, policy in self._policies.items():
+            pop = getattr(policy, "pop_telemetry", None)
+            if callable(pop):
+                pending = pop()
+                if pending:
+                    records[name] = pending
+        return records
+
+    def close(self) -> None:
+        """Call the optional ``teardown()`` hook and forget every policy."""
+        for policy in self._policies.values():
+            teardown = getattr(policy, "teardown", None)
+            if callable(teardown):
+                teardown()
+        self._policies.clear()
+        self._participants.clear()
+
+    def __enter__(self) -> "PolicyPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
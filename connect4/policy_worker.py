@@ -0,0 +1,167 @@
+import multiprocessing as mp
+import numpy as np
+from multiprocessing.connection import Connection
+from typing import Type
+from connect4.policy import Policy
+
+
+class MoveTimeout(TimeoutError):
+    """Raised when a policy does not answer before the per-move deadline."""
+
+
+def enable_telemetry(policy: Policy) -> None:
+    """Call the optional ``enable_telemetry()`` hook of a policy."""
+    enable = getattr(policy, "enable_telemetry", None)
+    if callable(enable):
+        enable()
+
+
+def _serve(
+    policy_class: Type[Policy], conn: Connection, telemetry: bool = False
+) -> None:
+    """Worker loop: mount the policy once and answer commands until closed."""
+    policy = policy_class()
+    if telemetry:
+        enable_telemetry(policy)
+    policy.mount()
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+
+        try:
+            if command == "act":
+                conn.send(("ok", int(policy.act(payload))))
+            elif command == "reset":
+                reset = getattr(policy, "reset", None)
+                if callable(reset):
+                    reset()
+                conn.send(("ok", None))
+            elif command == "telemetry":
+                pop = getattr(policy, "pop_telemetry", None)
+                conn.send(("ok", pop() if callable(pop) else []))
+            elif command == "close":
+                teardown = getattr(policy, "teardown", None)
+                if callable(teardown):
+                    teardown()
+                conn.send(("ok", None))
+                break
+        except Exception as e:
+            conn.send(("error", repr(e)))
+
+    conn.close()
+
+
+class PolicyWorker(Policy):
+    """
+    Runs a policy in a dedicated process so that each move can be bounded by a
+    wall-clock deadline.
+
+    The policy is instantiated and mounted once per worker. When a move
+    exceeds the deadline the worker is killed and ``MoveTimeout`` is raised;
+    the next call transparently starts (and mounts) a fresh worker.
+
+    The other calls are bounded too, so a hung worker cannot block the
+    caller: ``mount`` must finish within ``setup_timeout`` (default:
+    ``move_timeout``) or raises ``MoveTimeout``; a worker that does not
+    answer ``reset`` or ``pop_telemetry`` within ``move_timeout`` is killed,
+    and the fresh one started on the next move has no per-game state anyway.
+
+    With ``telemetry`` the policy's optional ``enable_telemetry()`` hook is
+    called in the worker before mounting.
+    """
+
+    def __init__(
+        self,
+        policy_class: Type[Policy],
+        move_timeout: float,
+        setup_timeout: float | None = None,
+        telemetry: bool = False,
+    ):
+        self.policy_class = policy_class
+        self.telemetry = telemetry
+        self.move_timeout = move_timeout
+        self.setup_timeout = move_timeout if setup_timeout is None else setup_timeout
+        self._process: mp.Process | None = None
+        self._conn: Connection | None = None
+
+    def mount(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        parent_conn, child_conn = mp.Pipe()
+        self._process = mp.Process(
+            target=_serve,
+            args=(self.policy_class, child_conn, self.telemetry),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        # Wait until the policy is mounted
+        if not self._conn.poll(self.setup_timeout):
+            self._kill()
+            raise MoveTimeout(
+                f"{self.policy_class.__name__} did not mount in {self.setup_timeout}s."
+            )
+        self._receive()
+
+    def act(self, s: np.ndarray) -> int:
+        self.mount()
+        self._conn.send(("act", s))
+        if not self._conn.poll(self.move_timeout):
+            self._kill()
+            raise MoveTimeout(
+                f"{self.policy_class.__name__} exceeded {self.move_timeout}s."
+            )
+        return self._receive()
+
+    def reset(self) -> None:
+        if self._process is None or not self._process.is_alive():
+            return
+        self._conn.send(("reset", None))
+        if not self._conn.poll(self.move_timeout):
+            self._kill()
+            return
+        self._receive()
+
+    def pop_telemetry(self) -> list[dict]:
+        if self._process is None or not self._process.is_alive():
+            return []
+        self._conn.send(("telemetry", None))
+        if not self._conn.poll(self.move_timeout):
+            self._kill()
+            return []
+        return self._receive()
+
+    def teardown(self) -> None:
+        if self._process is None:
+            return
+        try:
+            if self._process.is_alive():
+                self._conn.send(("close", None))
+                if self._conn.poll(self.move_timeout):
+                    self._conn.recv()
+        except (BrokenPipeError, EOFError):
+            pass
+        self._kill()
+
+    def _receive(self):
+        status, payload = self._conn.recv()
+        if status == "error":
+            raise RuntimeError(
+                f"{self.policy_class.__name__} failed in worker: {payload}"
+            )
+        return payload
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+from typing import Iterable
+
+import numpy as np
+from connect4.connect_state import ConnectState, board_key, move_key
+from connect4.match_log import GameRecord, iter_records, match_files
+
+ROWS, COLS = 6, 7
+
+# One slot of the on-disk table. A key of 0 marks an empty slot: board_key
+# always sets a sentinel bit per column, so no position encodes to 0.
+# Games that never finished (forfeits, truncated logs) count as plays only.
+ENTRY_DTYPE = np.dtype(
+    [
+        ("key", "<u8"),
+        ("plays", "<u4", COLS),  # times each column was played here
+        ("wins", "<u4", COLS),  # ... and the player who moved went on to win
+        ("draws", "<u4", COLS),  # ... and the game was drawn
+        ("losses", "<u4", COLS),  # ... and the opponent won
+    ]
+)
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def _slot(key: int, bits: int) -> int:
+    """Fibonacci hashing of a 49-bit board key into a table of 2**bits slots."""
+    return ((key * _GOLDEN) & _MASK64) >> (64 - bits)
+
+
+def game_keys(record: GameRecord) -> list[int]:
+    """
+    ``board_key`` of the position before each move of ``record``.
+
+    Keys are updated incrementally with ``move_key`` instead of re-encoding
+    the board after every move.
+    """
+    key = board_key(record.start)
+    heights = (np.asarray(record.start) != 0).sum(axis=0).tolist()
+    player = record.first_player
+    keys = []
+    for col in record.moves.tolist():
+        keys.append(key)
+        key = move_key(key, col, heights[col], player, ROWS)
+        heights[col] += 1
+        player = -player
+    return keys
+
+
+class PositionIndexBuilder:
+    """Accumulates per-position move statistics in memory before ``save``."""
+
+    def __init__(self):
+        self._rows: dict[int, int] = {}
+        self._stats = np.zeros((1024, 4, COLS), dtype=np.uint32)
+        self.games = 0
+        self.sources: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add_record(self, record: GameRecord) -> None:
+        player = record.first_player
+        for key, col in zip(game_keys(record), record.moves.tolist()):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self._rows)
+                if row == len(self._stats):
+                    self._stats = np.concatenate([self._stats, np.zeros_like(self._stats)])
+            stats = self._stats[row]
+            stats[0, col] += 1
+            if record.winner == player:
+                stats[1, col] += 1
+            elif record.winner == 0:
+                stats[2, col] += 1
+            elif record.winner == -player:
+                stats[3, col] += 1
+            player = -player
+        self.games += 1
+
+    def add_files(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            for record in iter_records([path]):
+                self.add_record(record)
+            self.sources.append(path)
+
+    def table(self, load_factor: float = 0.5) -> np.ndarray:
+        """Open-addressing (linear probing) table with every position."""
+        bits = max(int(np.ceil(np.log2(max(len(self._rows), 1) / load_factor))), 4)
+        table = np.zeros(1 << bits, dtype=ENTRY_DTYPE)
+        mask = (1 << bits) - 1
+        keys = table["key"]
+        for key, row in self._rows.items():
+            slot = _slot(key, bits)
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = (key, *self._stats[row])
+        return table
+
+    def save(self, path: str) -> None:
+        """Write the table as ``.npy`` plus a small ``.meta.json`` next to it."""
+        np.save(path, self.table())
+        with open(_meta_path(path), "w") as f:
+            json.dump(
+                {"games": self.games, "positions": len(self), "sources": self.sources},
+                f,
+                indent=2,
+            )
+
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".meta.json"
+
+
+class PositionIndex:
+    """
+    Read-only view of a table written by ``PositionIndexBuilder.save``.
+
+    The table is memory-mapped, so opening it is instant and a lookup only
+    touches the few slots it probes.
+    """
+
+    def __init__(self, table: np.ndarray, meta: dict | None = None):
+        self.table = table
+        self.meta = meta or {}
+        self._bits = len(table).bit_length() - 1
+        self._mask = len(table) - 1
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "PositionIndex":
+        table = np.load(path, mmap_mode="r" if mmap else None)
+        meta = None
+        if os.path.exists(_meta_path(path)):
+            with open(_meta_path(path)) as f:
+                meta = json.load(f)
+        return cls(table, meta)
+
+    def __len__(self) -> int:
+        if "positions" in self.meta:
+            return self.meta["positions"]
+        return int(np.count_nonzero(self.table["key"]))
+
+    def lookup(self, position) -> np.void | None:
+        """
+        Entry of a position given as a ``ConnectState``, a board or a
+        ``board_key``; None if it never appeared in the indexed games.
+        """
+        if isinstance(position, ConnectState):
+            key = position.key()
+        elif isinstance(position, (int, np.integer)):
+            key = int(position)
+        else:
+            key = board_key(np.asarray(position))
+
+        keys = self.table["key"]
+        slot = _slot(key, self._bits)
+        while True:
+            stored = int(keys[slot])
+            if stored == key:
+                return self.table[slot]
+            if stored == 0:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def moves(self, position) -> list[dict]:
+        """
+        Per-column statistics of a position, most played first. Plays of
+        games that never finished are reported as ``unfinished``.
+        """
+        entry = self.lookup(position)
+        if entry is None:
+            return []
+        rows = []
+        for col in range(COLS):
+            plays = int(entry["plays"][col])
+            if not plays:
+                continue
+            wins, draws = int(entry["wins"][col]), int(entry["draws"][col])
+            losses = int(entry["losses"][col])
+            rows.append(
+                {
+                    "col": col,
+                    "plays": plays,
+                    "wins": wins,
+                    "draws": draws,
+                    "losses": losses,
+                    "unfinished": plays - wins - draws - losses,
+                }
+            )
+        return sorted(rows, key=lambda r: r["plays"], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect-4 position database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="index match logs")
+    build.add_argument("paths", nargs="*", help="match files or folders (default: versus)")
+    build.add_argument("--output", default="positions.npy")
+
+    explore = sub.add_parser("explore", help="show move statistics of a position")
+    explore.add_argument("--db", default="positions.npy")
+    explore.add_argument(
+        "--moves", default="", help="columns played from the empty board, e.g. 3344"
+    )
+    args = parser.parse_args()
+
+    if args.command == "build":
+        paths = [p for root in (args.paths or ["versus"]) for p in match_files(root)]
+        builder = PositionIndexBuilder()
+        builder.add_files(paths)
+        builder.save(args.output)
+        print(
+            f"{builder.games} games, {len(builder)} positions "
+            f"from {len(paths)} files -> {args.output}"
+        )
+        return
+
+    index = PositionIndex.load(args.db)
+    state = ConnectState()
+    for col in args.moves:
+        state = state.transition(int(col))
+
+    rows = index.moves(state)
+    if not rows:
+        print("Position not found in the database.")
+        return
+    mover = "Red" if state.player == -1 else "Yellow"
+    print(f"{mover} to move, {sum(r['plays'] for r in rows)} games")
+    print(f"{'col':>3} {'plays':>7} {'win':>7} {'draw':>7} {'loss':>7} {'unfin':>7}")
+    for r in rows:
+        print(
+            f"{r['col']:>3} {r['plays']:>7} {r['wins'] / r['plays']:>7.1%} "
+            f"{r['draws'] / r['plays']:>7.1%} {r['losses'] / r['plays']:>7.1%} "
+            f"{r['unfinished'] / r['plays']:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
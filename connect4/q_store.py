@@ -0,0 +1,317 @@
+import heapq
+import queue
+import sys
+from collections.abc import Mapping, MutableMapping
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Hashable
+
+import numpy as np
+from connect4.connect_state import board_from_key, board_key
+
+
+class BoundedQStore(MutableMapping):
+    """
+    Capacity-bounded Q-table with least-frequently-used eviction and aging.
+
+    Every read or write of a key bumps its frequency. When the table grows
+    past ``capacity`` (plus a small ``slack`` so eviction is amortised), the
+    least used entries are dropped until it is back at ``capacity``. Every
+    ``aging_interval`` accesses all frequencies are halved, so entries that
+    were popular long ago eventually become evictable.
+
+    The capacity may be given in entries or as an approximate byte budget.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        max_bytes: int | None = None,
+        slack: float = 0.1,
+        aging_interval: int | None = None,
+    ):
+        if capacity is None and max_bytes is None:
+            raise ValueError("BoundedQStore needs a capacity or a max_bytes budget")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.slack = slack
+        self.aging_interval = aging_interval
+
+        self._data: dict[Hashable, Any] = {}
+        self._freq: dict[Hashable, float] = {}
+        self._entry_bytes: int | None = None
+        self._accesses = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def estimate_entry_bytes(key: Hashable, value: Any) -> int:
+        """Approximate memory of one entry (key, value and two dict slots)."""
+        size = sys.getsizeof(key) + sys.getsizeof(value) + 2 * 3 * 8
+        if isinstance(key, tuple):
+            size += sum(sys.getsizeof(part) for part in key if isinstance(part, tuple))
+        return size
+
+    @property
+    def target_entries(self) -> int:
+        """Number of entries the table is trimmed down to."""
+        limits = []
+        if self.capacity is not None:
+            limits.append(self.capacity)
+        if self.max_bytes is not None and self._entry_bytes:
+            limits.append(self.max_bytes // self._entry_bytes)
+        return max(min(limits), 1) if limits else sys.maxsize
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the stored entries."""
+        return len(self._data) * (self._entry_bytes or 0)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "target": self.target_entries,
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _touch(self, key: Hashable) -> None:
+        self._freq[key] += 1
+        self._accesses += 1
+        interval = self.aging_interval or self.target_entries
+        if self._accesses >= interval:
+            self._accesses = 0
+            for k in self._freq:
+                self._freq[k] *= 0.5
+
+    def _evict(self) -> None:
+        target = self.target_entries
+        excess = len(self._data) - target
+        if excess <= 0:
+            return
+        for key in heapq.nsmallest(excess, self._freq, key=self._freq.__getitem__):
+            del self._data[key]
+            del self._freq[key]
+        self.evictions += excess
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._touch(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if key in self._data:
+            self._data[key] = value
+            self._touch(key)
+            return
+
+        if self._entry_bytes is None:
+            self._entry_bytes = self.estimate_entry_bytes(key, value)
+        self._data[key] = value
+        self._freq[key] = 1.0
+        if len(self._data) > self.target_entries * (1 + self.slack):
+            self._evict()
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self._data[key]
+        del self._freq[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def to_dict(self) -> dict:
+        """Plain dictionary copy, used to persist the table."""
+        return dict(self._data)
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; only its creator is responsible for unlinking."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block with this process's
+        # resource tracker, which would unlink it (or warn about a leak)
+        # when the process exits; the creator owns it, so forget it here
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class SharedQTable(MutableMapping):
+    """
+    Read-mostly Q-table stored in ``multiprocessing.shared_memory``.
+
+    The parent builds the table once with ``create`` and workers ``attach``
+    to it by name without copying: keys ``(board tuple, action)`` are packed
+    into sorted ``uint64`` codes (``board_key(board) << 3 | action``) and
+    looked up with a binary search next to a ``float64`` value array.
+
+    Only the creator (the single writer) updates shared values in place.
+    Every other process writes new values into a private overlay; if an
+    ``updates`` queue is given those writes are also sent to the writer,
+    which applies them with ``drain``. Keys that are not in the shared block
+    always go to the overlay.
+    """
+
+    HEADER = 8  # one uint64 with the number of entries
+
+    def __init__(self, shm, writer: bool, updates=None):
+        self._shm = shm
+        self.writer = writer
+        self.updates = updates
+        self._overlay: dict[Hashable, Any] = {}
+
+        (n,) = np.frombuffer(shm.buf, dtype=np.uint64, count=1)
+        self._n = int(n)
+        self._codes = np.frombuffer(
+            shm.buf, dtype=np.uint64, count=self._n, offset=self.HEADER
+        )
+        self._values = np.frombuffer(
+            shm.buf, dtype=np.float64, count=self._n, offset=self.HEADER + 8 * self._n
+        )
+        if not writer:
+            self._values = self._values.view()
+            self._values.flags.writeable = False
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @staticmethod
+    def encode(key: tuple) -> int:
+        cells, action = key
+        return board_key(cells) << 3 | action
+
+    @staticmethod
+    def decode(code: int) -> tuple:
+        cells = tuple(int(x) for x in board_from_key(code >> 3).ravel())
+        return cells, code & 7
+
+    @classmethod
+    def create(cls, table: Mapping, name: str | None = None, updates=None):
+        """Copy ``table`` into a new shared block owned by this process."""
+        items = sorted((cls.encode(k), float(v)) for k, v in table.items())
+        n = len(items)
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls.HEADER + 16 * max(n, 1)
+        )
+        np.frombuffer(shm.buf, dtype=np.uint64, count=1)[0] = n
+        if n:
+            codes, values = zip(*items)
+            np.frombuffer(shm.buf, dtype=np.uint64, count=n, offset=cls.HEADER)[:] = codes
+            np.frombuffer(
+                shm.buf, dtype=np.float64, count=n, offset=cls.HEADER + 8 * n
+            )[:] = values
+        return cls(shm, writer=True, updates=updates)
+
+    @classmethod
+    def attach(cls, name: str, updates=None):
+        """Map an existing table created by another process (zero-copy)."""
+        return cls(_attach_shared_memory(name), writer=False, updates=updates)
+
+    def _find(self, code: int) -> int:
+        i = int(np.searchsorted(self._codes, code))
+        if i < self._n and self._codes[i] == code:
+            return i
+        return -1
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if key in self._overlay:
+            return self._overlay[key]
+        i = self._find(self.encode(key))
+        if i < 0:
+            raise KeyError(key)
+        return float(self._values[i])
+
+    def get_encoded(self, key: Hashable, code: int, default: Any = None) -> Any:
+        """
+        Like ``get`` when the caller already has ``encode(key)``, so lookups
+        of the same board with different actions do not re-encode it.
+        """
+        if self._overlay and key in self._overlay:
+            return self._overlay[key]
+        i = self._find(code)
+        return float(self._values[i]) if i >= 0 else default
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        if self.writer:
+            i = self._find(self.encode(key))
+            if i >= 0:
+                self._values[i] = value
+                return
+        self._overlay[key] = value
+        if self.updates is not None and not self.writer:
+            self.updates.put((key, value))
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key not in self._overlay:
+            raise TypeError("entries of the shared block cannot be deleted")
+        del self._overlay[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._overlay or self._find(self.encode(key)) >= 0
+
+    def __iter__(self):
+        for code in self._codes:
+            key = self.decode(int(code))
+            if key not in self._overlay:
+                yield key
+        yield from self._overlay
+
+    def __len__(self) -> int:
+        shared_in_overlay = sum(
+            1 for key in self._overlay if self._find(self.encode(key)) >= 0
+        )
+        return self._n + len(self._overlay) - shared_in_overlay
+
+    def drain(self, apply=None, count: int | None = None) -> int:
+        """
+        Apply the pending updates of the ``updates`` queue (writer only).
+
+        Each message ``(key, value)`` is stored with ``self[key] = value``,
+        or handed to ``apply(key, value)`` if given (e.g. to merge learning
+        statistics instead of overwriting). With ``count`` the call blocks
+        until that many messages have arrived; otherwise it stops as soon
+        as the queue is empty.
+        """
+        applied = 0
+        while self.updates is not None and (count is None or applied < count):
+            try:
+                if count is None:
+                    key, value = self.updates.get_nowait()
+                else:
+                    key, value = self.updates.get()
+            except queue.Empty:
+                break
+            if apply is None:
+                self[key] = value
+            else:
+                apply(key, value)
+            applied += 1
+        return applied
+
+    def to_dict(self) -> dict:
+        """Plain dictionary copy, used to persist the table."""
+        return {key: self[key] for key in self}
+
+    def close(self) -> None:
+        """Detach from the shared block (the creator should also ``unlink``)."""
+        self._codes = self._values = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
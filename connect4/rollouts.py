@@ -0,0 +1,155 @@
+import numpy as np
+from connect4.connect_state import ConnectState, board_key, completes_four, move_key
+
+
+class RolloutPolicy:
+    """
+    Plays a game to the end from a given state, choosing moves cheaply.
+
+    The board is copied once into nested lists and column heights are kept
+    incrementally, so every ply costs a handful of list operations plus a
+    local four-in-a-row check around the piece just placed. Subclasses only
+    decide which column to play through ``choose``. The base class plays
+    uniformly at random among the legal columns.
+    """
+
+    name = "uniform"
+
+    def choose(
+        self,
+        cells: list[list[int]],
+        heights: list[int],
+        free: list[int],
+        player: int,
+        rng: np.random.Generator,
+    ) -> int:
+        return free[int(rng.integers(len(free)))]
+
+    def play(
+        self,
+        state: ConnectState,
+        rng: np.random.Generator,
+        moves: list[int] | None = None,
+        tablebase=None,
+    ) -> tuple[int, int]:
+        """
+        Play from ``state`` until the game ends.
+
+        If ``moves`` is given, the columns played are appended to it in
+        order (the first one by ``state.player``, then alternating).
+
+        With a ``tablebase`` (see ``connect4/tablebase.py``) the game stops
+        at the first position it has solved, once ``tablebase.max_empties``
+        or fewer cells are left, and its exact result is returned.
+
+        Returns
+        -------
+        tuple[int, int]
+            Winner (-1, 1 or 0 for a draw) and number of plies played.
+        """
+        winner = state.get_winner()
+        if winner != 0:
+            return winner, 0
+
+        rows, cols = state.ROWS, state.COLS
+        cells = state.board.tolist()
+        heights = state.get_heights()
+        player = state.player
+        plies = 0
+        empties = rows * cols - sum(heights)
+        # The key is only kept once the tablebase range is reached
+        key = None
+
+        while True:
+            if tablebase is not None and empties <= tablebase.max_empties:
+                if key is None:
+                    key = board_key([cell for row in cells for cell in row], rows, cols)
+                value = tablebase.probe(key)
+                if value is not None:
+                    return value * player, plies
+
+            free = [c for c in range(cols) if heights[c] < rows]
+            if not free:
+                return 0, plies
+
+            col = self.choose(cells, heights, free, player, rng)
+            row = rows - 1 - heights[col]
+            if key is not None:
+                key = move_key(key, col, heights[col], player, rows)
+            empties -= 1
+            cells[row][col] = player
+            heights[col] += 1
+            plies += 1
+            if moves is not None:
+                moves.append(col)
+
+            if completes_four(cells, row, col, player, rows, cols):
+                return player, plies
+            player = -player
+
+
+class UniformRollout(RolloutPolicy):
+    """Uniformly random legal columns (the classic MCTS rollout)."""
+
+    name = "uniform"
+
+
+class TacticalRollout(RolloutPolicy):
+    """
+    Win if possible, otherwise block an immediate loss, otherwise a random
+    column that does not land right under an opponent winning cell (the
+    ``unsafe`` columns of ``ConnectState.tactics``), unless all of them do.
+    """
+
+    name = "tactical"
+
+    def choose(self, cells, heights, free, player, rng):
+        rows = len(cells)
+        cols = len(cells[0])
+        block = None
+        safe = []
+        for c in free:
+            r = rows - 1 - heights[c]
+            if completes_four(cells, r, c, player, rows, cols):
+                return c
+            if block is None and completes_four(cells, r, c, -player, rows, cols):
+                block = c
+            if r == 0 or not completes_four(cells, r - 1, c, -player, rows, cols):
+                safe.append(c)
+        if block is not None:
+            return block
+        choices = safe or free
+        return choices[int(rng.integers(len(choices)))]
+
+
+class CenterRollout(RolloutPolicy):
+    """Random columns weighted towards the centre, where more lines pass."""
+
+    name = "center"
+    WEIGHTS = (1, 2, 3, 4, 3, 2, 1)
+
+    def choose(self, cells, heights, free, player, rng):
+        weights = [self.WEIGHTS[c] for c in free]
+        pick = rng.random() * sum(weights)
+        for c, w in zip(free, weights):
+            pick -= w
+            if pick < 0:
+                return c
+        return free[-1]
+
+
+ROLLOUTS = {
+    policy.name: policy for policy in (UniformRollout, TacticalRollout, CenterRollout)
+}
+
+
+def make_rollout(rollout: str | RolloutPolicy) -> RolloutPolicy:
+    """Resolve a rollout policy given by name or already built."""
+    if isinstance(rollout, RolloutPolicy):
+        return rollout
+    try:
+        return ROLLOUTS[rollout]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown rollout policy: {rollout} (choose from {sorted(ROLLOUTS)})"
+        ) from None
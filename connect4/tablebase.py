@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+from typing import Iterable
+
+import numpy as np
+from connect4.connect_state import ConnectState, board_key, completes_four, move_key
+from connect4.match_log import GameRecord, iter_records, match_files
+from connect4.position_db import _meta_path, _slot
+from connect4.rollouts import make_rollout
+
+ROWS, COLS = 6, 7
+
+# One slot of the on-disk table: the position (board_key, 0 = empty slot)
+# and its exact value for the player to move: 1 win, 0 draw, -1 loss.
+ENTRY_DTYPE = np.dtype([("key", "<u8"), ("value", "i1")])
+
+# Columns tried from the centre outwards: wins are found sooner there
+_ORDER = (3, 2, 4, 1, 5, 0, 6)
+
+
+class TablebaseBuilder:
+    """
+    Solves endgame positions exactly and collects their values in memory.
+
+    Every seed position with at most ``max_empties`` empty cells is solved
+    by negamax over its subtree and every position settled along the way is
+    kept. Values are memoized by ``board_key``, so the subtrees that seeds
+    share (most of them, this close to the end) are solved only once.
+    """
+
+    def __init__(self, max_empties: int = 10):
+        self.max_empties = max_empties
+        self.values: dict[int, int] = {}
+        self.seeds = 0
+        self.sources: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _solve(self, cells, heights, player, key) -> int:
+        value = self.values.get(key)
+        if value is not None:
+            return value
+
+        free = [c for c in _ORDER if heights[c] < ROWS]
+        if not free:
+            self.values[key] = 0
+            return 0
+
+        threats = []
+        for c in free:
+            r = ROWS - 1 - heights[c]
+            if completes_four(cells, r, c, player, ROWS, COLS):
+                self.values[key] = 1
+                return 1
+            if completes_four(cells, r, c, -player, ROWS, COLS):
+                threats.append(c)
+
+        # A single enemy threat must be blocked; two cannot both be
+        if len(threats) > 1:
+            self.values[key] = -1
+            return -1
+        if threats:
+            free = threats
+
+        best = -1
+        for c in free:
+            r = ROWS - 1 - heights[c]
+            child = move_key(key, c, heights[c], player)
+            cells[r][c] = player
+            heights[c] += 1
+            value = -self._solve(cells, heights, -player, child)
+            heights[c] -= 1
+            cells[r][c] = 0
+            if value > best:
+                best = value
+                if best == 1:
+                    break
+        self.values[key] = best
+        return best
+
+    def add_position(self, state: ConnectState) -> int | None:
+        """
+        Solve a non-final position; returns its value for the player to
+        move, or None if it has more than ``max_empties`` empty cells.
+        """
+        cells = state.board.tolist()
+        heights = state.get_heights()
+        if ROWS * COLS - sum(heights) > self.max_empties:
+            return None
+        self.seeds += 1
+        return self._solve(cells, heights, state.player, state.key())
+
+    def add_record(self, record: GameRecord) -> None:
+        """Solve the positions of a game once few enough cells are left."""
+        cells = np.asarray(record.start).tolist()
+        heights = (np.asarray(record.start) != 0).sum(axis=0).tolist()
+        player = record.first_player
+        key = board_key(record.start)
+        for col in record.moves.tolist():
+            if ROWS * COLS - sum(heights) <= self.max_empties:
+                self.seeds += 1
+                self._solve(cells, heights, player, key)
+            row = ROWS - 1 - heights[col]
+            key = move_key(key, col, heights[col], player)
+            cells[row][col] = player
+            heights[col] += 1
+            if completes_four(cells, row, col, player, ROWS, COLS):
+                return
+            player = -player
+
+    def add_files(self, paths: Iterable[str]) -> None:
+        for path in paths:
+            for record in iter_records([path]):
+                self.add_record(record)
+            self.sources.append(path)
+
+    def add_random(self, games: int, rollout: str = "tactical", seed: int = 0) -> None:
+        """Seed with games played by a rollout policy from the empty board."""
+        policy = make_rollout(rollout)
+        rng = np.random.default_rng(seed)
+        start = ConnectState()
+        for index in range(games):
+            moves = []
+            winner, _ = policy.play(start, rng, moves)
+            self.add_record(
+                GameRecord("", "", index, start.board, np.array(moves, dtype=np.int8), winner)
+            )
+        self.sources.append(f"random:{rollout}:{games}:{seed}")
+
+    def table(self, load_factor: float = 0.5) -> np.ndarray:
+        """Open-addressing (linear probing) table with every solved position."""
+        bits = max(int(np.ceil(np.log2(max(len(self.values), 1) / load_factor))), 4)
+        table = np.zeros(1 << bits, dtype=ENTRY_DTYPE)
+        mask = (1 << bits) - 1
+        keys = table["key"]
+        values = table["value"]
+        for key, value in self.values.items():
+            slot = _slot(key, bits)
+            while keys[slot]:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            values[slot] = value
+        return table
+
+    def save(self, path: str) -> None:
+        """Write the table as ``.npy`` plus a small ``.meta.json`` next to it."""
+        np.save(path, self.table())
+        with open(_meta_path(path), "w") as f:
+            json.dump(
+                {
+                    "max_empties": self.max_empties,
+                    "positions": len(self),
+                    "seeds": self.seeds,
+                    "sources": self.sources,
+                },
+                f,
+                indent=2,
+            )
+
+
+class Tablebase:
+    """
+    Read-only view of a table written by ``TablebaseBuilder.save``.
+
+    The table is memory-mapped and a probe hashes the key and reads one or
+    two slots, so it is cheap enough to call at every MCTS leaf and every
+    rollout ply once ``max_empties`` or fewer cells are left.
+    """
+
+    def __init__(self, table: np.ndarray, meta: dict | None = None):
+        self.table = table
+        self.meta = meta or {}
+        self.max_empties = self.meta.get("max_empties", ROWS * COLS)
+        self._keys = table["key"]
+        self._values = table["value"]
+        self._bits = len(table).bit_length() - 1
+        self._mask = len(table) - 1
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "Tablebase":
+        table = np.load(path, mmap_mode="r" if mmap else None)
+        meta = None
+        if os.path.exists(_meta_path(path)):
+            with open(_meta_path(path)) as f:
+                meta = json.load(f)
+        return cls(table, meta)
+
+    def __len__(self) -> int:
+        if "positions" in self.meta:
+            return self.meta["positions"]
+        return int(np.count_nonzero(self._keys))
+
+    def probe(self, key: int) -> int | None:
+        """Value for the player to move of the position ``key``, or None."""
+        keys = self._keys
+        slot = _slot(key, self._bits)
+        while True:
+            stored = keys.item(slot)
+            if stored == key:
+                return self._values.item(slot)
+            if stored == 0:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def value(self, position) -> int | None:
+        """Like ``probe``, for a ``ConnectState``, a board or a ``board_key``."""
+        if isinstance(position, ConnectState):
+            return self.probe(position.key())
+        if isinstance(position, (int, np.integer)):
+            return self.probe(int(position))
+        return self.probe(board_key(np.asarray(position)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connect-4 endgame tablebase")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="solve endgames seeded from games")
+    build.add_argument("paths", nargs="*", help="match files or folders (default: versus)")
+    build.add_argument("--empties", type=int, default=10, help="max empty cells")
+    build.add_argument(
+        "--random", type=int, default=0, help="also seed with this many rollout games"
+    )
+    build.add_argument("--rollout", default="tactical")
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--output", default="tablebase.npy")
+
+    probe = sub.add_parser("probe", help="value of a position and of its moves")
+    probe.add_argument("--db", default="tablebase.npy")
+    probe.add_argument(
+        "--moves", default="", help="columns played from the empty board, e.g. 3344"
+    )
+    args = parser.parse_args()
+
+    if args.command == "build":
+        builder = TablebaseBuilder(args.empties)
+        roots = args.paths or (["versus"] if os.path.isdir("versus") else [])
+        paths = [p for root in roots for p in match_files(root)]
+        builder.add_files(paths)
+        if args.random:
+            builder.add_random(args.random, args.rollout, args.seed)
+        builder.save(args.output)
+        print(
+            f"{len(builder)} positions with <= {args.empties} empty cells "
+            f"from {builder.seeds} seeds -> {args.output}"
+        )
+        return
+
+    tablebase = Tablebase.load(args.db)
+    state = ConnectState()
+    for col in args.moves:
+        state = state.transition(int(col))
+
+    if state.is_final():
+        print("The game is over.")
+        return
+
+    labels = {1: "win", 0: "draw", -1: "loss", None: "unknown"}
+    mover = "Red" if state.player == -1 else "Yellow"
+    print(f"{mover} to move: {labels[tablebase.value(state)]}")
+    for col in state.get_free_cols():
+        child = state.transition(col)
+        if child.get_winner() != 0:
+            result = "win"
+        else:
+            value = tablebase.value(child)
+            result = labels[None if value is None else -value]
+        print(f"{col:>3} {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,238 @@
+import ast
+import os
 import sys
+import json
+import time
+import hashlib
 import pathlib
-import inspect
 import importlib
+import subprocess
 from typing import Type
 
+MANIFEST_NAME = ".policy_manifest.json"
+
+# Seconds allowed for importing every new or changed module during discovery
+SCAN_TIMEOUT = 120
+
+# Run by _scan_modules in a separate interpreter, so discovery never leaves
+# group modules imported in the tournament process. Prints while importing
+# go to stderr; stdout only carries the JSON result.
+_SCAN_SCRIPT = """
+import importlib, inspect, json, sys
+
+project_root, base_module, base_name, module_names = json.loads(sys.argv[1])
+sys.path.insert(0, project_root)
+out, sys.stdout = sys.stdout, sys.stderr
+base = getattr(importlib.import_module(base_module), base_name)
+result = {}
+for module_name in module_names:
+    try:
+        module = importlib.import_module(module_name)
+    except BaseException as e:
+        result[module_name] = [[], f"{type(e).__name__}: {e}"]
+        continue
+    result[module_name] = [
+        [
+            name
+            for name, obj in vars(module).items()
+            if inspect.isclass(obj)
+            and issubclass(obj, base)
+            and obj is not base
+            and obj.__module__ == module_name
+        ],
+        None,
+    ]
+out.write(json.dumps(result))
+"""
+
+
+class LazyPolicy:
+    """
+    Callable stand-in for a policy class discovered on disk.
+
+    The module is imported the first time the class is needed (usually when
+    the participant is instantiated for its first match) and the time spent
+    importing is kept in ``import_seconds``.
+    """
+
+    def __init__(self, module_name: str, class_name: str, project_root: str):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.project_root = project_root
+        self.import_seconds: float | None = None
+        self._cls: Type | None = None
+
+    @property
+    def __name__(self) -> str:
+        return self.class_name
+
+    def load(self) -> Type:
+        if self._cls is None:
+            if self.project_root not in sys.path:
+                sys.path.insert(0, self.project_root)
+            start = time.perf_counter()
+            module = importlib.import_module(self.module_name)
+            self.import_seconds = time.perf_counter() - start
+            self._cls = getattr(module, self.class_name)
+        return self._cls
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getstate__(self) -> dict:
+        # Classes are re-imported on the other side (e.g. policy workers)
+        return {**self.__dict__, "_cls": None}
+
+    def __repr__(self) -> str:
+        return f"<LazyPolicy {self.module_name}.{self.class_name}>"
+
+
+def _defines_classes(source: str) -> bool:
+    """True if the module defines at least one top-level class."""
+    return any(isinstance(node, ast.ClassDef) for node in ast.parse(source).body)
+
+
+def _scan_modules(
+    module_names: list[str], base_class: Type, project_root: str
+) -> dict[str, tuple[list[str], str | None]]:
+    """
+    Import modules in a child interpreter and list the classes each defines
+    that subclass ``base_class`` (however the base was imported or aliased,
+    directly or through another class). Returns, per module, the names and
+    the import error, if any.
+    """
+    if not module_names:
+        return {}
+    args = [project_root, base_class.__module__, base_class.__qualname__, module_names]
+    # The child sees the same import path as this process
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", _SCAN_SCRIPT, json.dumps(args)],
+            capture_output=True,
+            text=True,
+            timeout=SCAN_TIMEOUT,
+            env=env,
+        )
+        result = json.loads(proc.stdout)
+    except subprocess.TimeoutExpired:
+        error = f"TimeoutError: import took more than {SCAN_TIMEOUT}s"
+        return {name: ([], error) for name in module_names}
+    except ValueError:
+        lines = proc.stderr.strip().splitlines() or [f"exit code {proc.returncode}"]
+        error = f"ScanError: {lines[-1]}"
+        return {name: ([], error) for name in module_names}
+    return {name: (classes, error) for name, (classes, error) in result.items()}
+
+
+def _load_manifest(path: pathlib.Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: pathlib.Path, manifest: dict) -> None:
+    try:
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    except OSError:
+        # Read-only checkouts still work, they just rescan on every run
+        pass
+
 
 def find_importable_classes(folder_route: str, base_class: Type) -> dict[str, Type]:
+    """
+    Discover subclasses of ``base_class`` below ``folder_route``.
+
+    A file that defines classes is imported once when it is new or has
+    changed, to find its subclasses and to check that it imports at all on
+    this Python version. Those imports run in a separate interpreter, so
+    this process only imports a group when it plays (and ``import_times``
+    measures real imports). The result is cached in a manifest keyed by file
+    mtime, size and hash (and the Python version), so unchanged groups are
+    neither re-read nor imported at startup. Files that fail to import are
+    skipped and reported on every run. Each participant is keyed by its
+    group folder and returned as a ``LazyPolicy`` that imports its module
+    only when first used.
+    """
     candidates = {}
     folder_path = pathlib.Path(folder_route).resolve()
     project_root = folder_path.parents[0]
+    manifest_path = folder_path / MANIFEST_NAME
 
-    if str(project_root) not in sys.path:
-        sys.path.insert(0, str(project_root))
-
-    for py_file in folder_path.rglob("*.py"):
-        rel_path = py_file.relative_to(project_root).with_suffix("")
-        module_name = ".".join(rel_path.parts)
-        try:
-            module = importlib.import_module(module_name)
-            for _, obj in inspect.getmembers(module, inspect.isclass):
-                if issubclass(obj, base_class) and obj is not base_class:
-                    candidates[obj.__module__.split(".")[1]] = obj
-        except Exception as _:
+    python = f"{sys.version_info.major}.{sys.version_info.minor}"
+    manifest = _load_manifest(manifest_path)
+    if manifest.get("python") != python:
+        manifest = {"python": python}
+    cached = manifest.get(base_class.__name__, {})
+    entries = {}
+    modules = {}
+    to_scan = {}
+
+    for py_file in sorted(folder_path.rglob("*.py")):
+        rel_path = py_file.relative_to(project_root)
+        stat = py_file.stat()
+        entry = cached.get(str(rel_path))
+        module_parts = rel_path.with_suffix("").parts
+        modules[str(rel_path)] = module_parts
+
+        if not (
+            entry
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and entry["size"] == stat.st_size
+        ):
+            source = py_file.read_bytes()
+            digest = hashlib.sha1(source).hexdigest()
+            if entry is None or entry["sha1"] != digest:
+                try:
+                    has_classes = _defines_classes(source.decode())
+                except (SyntaxError, UnicodeDecodeError) as e:
+                    classes, error = [], f"{type(e).__name__}: {e}"
+                else:
+                    classes, error = [], None
+                    if has_classes:
+                        to_scan[str(rel_path)] = ".".join(module_parts)
+            else:
+                classes, error = entry["classes"], entry.get("error")
+            entry = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha1": digest,
+                "classes": classes,
+                "error": error,
+            }
+        entries[str(rel_path)] = entry
+
+    # Every new or changed module is imported in one child interpreter
+    scanned = _scan_modules(list(to_scan.values()), base_class, str(project_root))
+    for rel_path, module_name in to_scan.items():
+        classes, error = scanned.get(module_name, ([], "ScanError: no result"))
+        entries[rel_path].update(classes=classes, error=error)
+
+    for rel_path, entry in entries.items():
+        module_parts = modules[rel_path]
+        module_name = ".".join(module_parts)
+        if entry.get("error"):
+            print(f"Skipping {rel_path}: {entry['error']}", file=sys.stderr)
             continue
+        for class_name in entry["classes"]:
+            candidates[module_parts[1]] = LazyPolicy(
+                module_name, class_name, str(project_root)
+            )
+
+    if entries != cached:
+        manifest[base_class.__name__] = entries
+        _save_manifest(manifest_path, manifest)
 
     return candidates
+
+
+def import_times(candidates: dict[str, Type]) -> dict[str, float]:
+    """Seconds spent importing each participant that has been loaded so far."""
+    return {
+        name: cls.import_seconds
+        for name, cls in candidates.items()
+        if isinstance(cls, LazyPolicy) and cls.import_seconds is not None
+    }
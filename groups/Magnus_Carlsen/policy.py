@@ -2,8 +2,87 @@ import math
 import numpy as np
 import os
 import pickle
+import sys
+import threading
+import time
 from connect4.policy import Policy
-from connect4.connect_state import ConnectState
+from connect4.connect_state import ConnectState, evaluate
+from connect4.network import ValuePolicyNet
+from connect4.q_store import BoundedQStore, SharedQTable
+from connect4.rollouts import make_rollout
+from connect4.tablebase import Tablebase
+
+
+#             PRIORS HEURÍSTICOS (SELECCIÓN PUCT)
+
+# Preferencia por columnas centrales (por ahí pasan más líneas)
+CENTER_BONUS = np.array([0.0, 1.0, 2.0, 3.0, 2.0, 1.0, 0.0])
+
+# Temperatura del softmax que convierte los puntajes en probabilidades
+PRIOR_TEMPERATURE = 8.0
+
+# Ajustes tácticos (en puntos de evaluate): tapar una victoria inmediata del
+# rival, y jugar justo debajo de una casilla ganadora suya (se la regalamos)
+BLOCK_BONUS = 50.0
+UNSAFE_PENALTY = 50.0
+
+
+def _parity_score(state: ConnectState, player: int) -> int:
+    """
+    Paridad de amenazas: al primer jugador (rojo) le sirven las casillas
+    ganadoras en filas impares contando desde abajo; al segundo, en las pares.
+    Devuelve amenazas útiles de 'player' menos las útiles del rival.
+    """
+    score = 0
+    for who, sign in ((player, 1), (-player, -1)):
+        good = 1 if who == -1 else 0  # rojo: filas 1, 3, 5 desde abajo
+        mask = state.threat_mask(who)
+        while mask:
+            cell = (mask & -mask).bit_length() - 1
+            if (state.ROWS - cell // state.COLS) % 2 == good:
+                score += sign
+            mask &= mask - 1
+    return score
+
+
+def heuristic_priors(state: ConnectState) -> dict:
+    """
+    Probabilidad a priori de cada columna legal para el jugador que mueve,
+    a partir de un evaluador estático barato de cada tablero resultante:
+
+      - evaluate(): líneas abiertas de 1, 2 y 3 fichas (y 4 = ganar)
+      - control del centro (CENTER_BONUS)
+      - paridad de amenazas (_parity_score)
+      - táctica inmediata (ConnectState.tactics): bonus por bloquear una
+        victoria del rival y penalización por las columnas "unsafe", salvo
+        que además ganen
+
+    Los puntajes se pasan por un softmax con PRIOR_TEMPERATURE.
+    """
+    player = state.player
+    actions = state.get_free_cols()
+    heights = state.get_heights()
+
+    boards = np.repeat(state.board[None], len(actions), axis=0)
+    for i, col in enumerate(actions):
+        boards[i, state.ROWS - 1 - heights[col], col] = player
+
+    scores = evaluate(boards, player) + CENTER_BONUS[actions]
+    scores += [
+        4.0 * _parity_score(ConnectState(board, -player, copy=False), player)
+        for board in boards
+    ]
+
+    wins, blocks, unsafe = state.tactics(player)
+    for i, col in enumerate(actions):
+        if blocks >> col & 1:
+            scores[i] += BLOCK_BONUS
+        if unsafe >> col & 1 and not wins >> col & 1:
+            scores[i] -= UNSAFE_PENALTY
+
+    weights = np.exp((scores - scores.max()) / PRIOR_TEMPERATURE)
+    weights /= weights.sum()
+    return dict(zip(actions, weights.tolist()))
 
 
 #                NODO DEL ÁRBOL PARA MCTS
@@ -18,8 +97,17 @@ class Node:
       - Los hijos ya explorados (un hijo por cada acción posible).
       - Estadísticas de visitas y valor acumulado (para UCB1).
       - Las acciones legales que todavía no se han explorado.
+
+    Usa __slots__ (sin __dict__ por nodo) porque un árbol puede tener
+    miles de nodos.
     """
 
+    __slots__ = (
+        "state", "parent", "parent_action", "children", "visits", "value",
+        "q_visits", "q_value", "amaf_visits", "amaf_value", "priors",
+        "untried_actions", "s_key", "q_code",
+    )
+
     def __init__(self, state, parent=None, parent_action=None):
         # Estado del juego en este nodo
         self.state = state
@@ -35,17 +123,56 @@ class Node:
         self.visits = 0                    # cuántas veces se ha visitado este nodo
         self.value = 0.0                   # suma de recompensas que han pasado por aquí
 
+        # Parte de visits/value que ya se volcó a la tabla Q (ver Aha._update_Q)
+        self.q_visits = 0
+        self.q_value = 0.0
+
+        # Estadísticas AMAF (RAVE): {acción -> visitas/valor} contando cada
+        # simulación en la que el jugador de este nodo jugó esa columna más
+        # adelante, en el árbol o en el rollout (ver Aha._backpropagate)
+        self.amaf_visits = {}
+        self.amaf_value = {}
+
+        # Priors heurísticos {acción -> probabilidad}, solo en modo PUCT
+        # (se calculan la primera vez que se selecciona desde este nodo)
+        self.priors = None
+
         # Acciones que todavía no se han expandido desde este estado
         # get_free_cols() ya devuelve solo columnas legales
         self.untried_actions = state.get_free_cols()
 
+        # Clave del estado en la tabla Q y su código en una SharedQTable;
+        # se calculan la primera vez que se piden (ver q_key / shared_code)
+        self.s_key = None
+        self.q_code = None
+
+    def q_key(self):
+        """Clave del estado para la tabla Q: tupla con las 42 casillas."""
+        if self.s_key is None:
+            self.s_key = tuple(self.state.board.ravel().tolist())
+        return self.s_key
+
+    def shared_code(self):
+        """board_key del estado desplazado 3 bits: código de (s, 0) en SharedQTable."""
+        if self.q_code is None:
+            self.q_code = self.state.key() << 3
+        return self.q_code
+
+    def q_get(self, Q_table, action, default=0.5):
+        """Q(s, action) de la tabla, sin volver a codificar el tablero."""
+        if isinstance(Q_table, SharedQTable):
+            return Q_table.get_encoded(
+                (self.q_key(), action), self.shared_code() | action, default
+            )
+        return Q_table.get((self.q_key(), action), default)
+
     def is_fully_expanded(self):
         """
         Devuelve True si ya exploramos todas las acciones legales de este estado.
         """
         return len(self.untried_actions) == 0
 
-    def best_child(self, c_param, Q_table, beta):
+    def best_child(self, c_param, Q_table, beta, rave_k=None):
         """
         Elige el mejor hijo usando una mezcla entre:
 
@@ -57,24 +184,30 @@ class Node:
         donde:
           PRIOR  = Q(s,a) si existe, en otro caso 0.5 (neutro)
           UCB1   = (valor_promedio) + c * sqrt( ln(N_padre) / N_hijo )
+
+        Si se da rave_k, el valor promedio se mezcla con el valor AMAF de la
+        acción con peso b = sqrt(rave_k / (3 * N_hijo + rave_k)), que decae a
+        medida que el hijo acumula visitas propias.
         """
 
         best_score = -float("inf")
         best_nodes = []
 
-        # Convertimos el tablero a tupla para poder usarlo como clave en Q_table
-        s_key = tuple(int(x) for x in self.state.board.flatten())
-
         # Recorremos todos los hijos ya creados
         for action, child in self.children.items():
 
             # 1) PRIOR: valor aprendido de Q(s,a)
-            prior = Q_table.get((s_key, action), 0.5)
+            prior = self.q_get(Q_table, action)
 
             # 2) UCB1 clásico
             if child.visits > 0:
                 # Explotación: qué tan bien le ha ido a este hijo
                 exploitation = child.value / child.visits
+                amaf_visits = self.amaf_visits.get(action, 0)
+                if rave_k is not None and amaf_visits:
+                    b = math.sqrt(rave_k / (3 * child.visits + rave_k))
+                    amaf = self.amaf_value[action] / amaf_visits
+                    exploitation = (1 - b) * exploitation + b * amaf
                 # Exploración: incentiva visitar nodos menos explorados
                 exploration = c_param * math.sqrt(
                     math.log(self.visits) / child.visits
@@ -99,6 +232,146 @@ class Node:
         # Si hay empate entre varios hijos, escogemos uno al azar
         return np.random.default_rng().choice(best_nodes)
 
+    def puct_action(self, c_puct, root_player):
+        """
+        Selección PUCT (estilo AlphaZero) sobre todas las acciones legales,
+        expandidas o no:
+
+        score = Q + c_puct * P * sqrt(N_padre) / (1 + N_hijo)
+
+        donde P es el prior heurístico y Q el valor promedio del hijo visto
+        por el jugador que mueve en este nodo (value guarda la recompensa
+        del jugador raíz, así que se invierte en los turnos del rival). Un
+        hijo sin visitas vale 0.5, así que el prior decide el orden en que
+        se prueban las columnas en lugar de expandirlas todas a ciegas.
+        """
+        if self.priors is None:
+            self.priors = heuristic_priors(self.state)
+
+        flip = self.state.player != root_player
+        sqrt_n = math.sqrt(max(self.visits, 1))
+        best_score = -float("inf")
+        best_action = None
+
+        for action, prior in self.priors.items():
+            child = self.children.get(action)
+            if child is not None and child.visits > 0:
+                q = child.value / child.visits
+                if flip:
+                    q = 1.0 - q
+                n = child.visits
+            else:
+                q, n = 0.5, 0
+            score = q + c_puct * prior * sqrt_n / (1 + n)
+            if score > best_score:
+                best_score = score
+                best_action = action
+
+        return best_action
+
+
+
+#             POOL DE NODOS (MEMORIA ACOTADA)
+
+class NodePool:
+    """
+    Crea y recicla los nodos del árbol de búsqueda.
+
+    Los nodos que se descartan (al podar o al terminar una búsqueda) van a
+    una lista libre y se reutilizan en vez de crear objetos nuevos. Si se da
+    max_nodes, la búsqueda llama a prune() cuando el árbol llega al límite:
+    se eliminan los subárboles con menos visitas hasta dejar el árbol en
+    (1 - prune_fraction) * max_nodes. También se registra el pico de nodos
+    vivos y de bytes para dimensionar cuántos agentes caben en una máquina.
+    """
+
+    def __init__(self, max_nodes=None, prune_fraction=0.25):
+        self.max_nodes = max_nodes
+        self.prune_fraction = prune_fraction
+        self._free = []
+        self.live = 0            # nodos en algún árbol
+        self.peak = 0            # máximo de nodos vivos a la vez
+        self.created = 0         # objetos Node creados (el resto fue reciclado)
+        self.pruned = 0          # nodos eliminados por poda
+        self.node_bytes = None   # tamaño aproximado de un nodo (medido una vez)
+
+    @staticmethod
+    def estimate_bytes(node):
+        """Memoria aproximada de un nodo: objeto, estado, tablero y contenedores."""
+        return (
+            sys.getsizeof(node)
+            + sys.getsizeof(node.state)
+            + sys.getsizeof(node.state.board)
+            + sys.getsizeof(node.children)
+            + sys.getsizeof(node.untried_actions)
+        )
+
+    @property
+    def peak_bytes(self):
+        return self.peak * (self.node_bytes or 0)
+
+    def full(self, margin=1):
+        """True si crear 'margin' nodos más pasaría del presupuesto."""
+        return self.max_nodes is not None and self.live + margin > self.max_nodes
+
+    def new(self, state, parent=None, parent_action=None):
+        if self._free:
+            node = self._free.pop()
+            node.__init__(state, parent=parent, parent_action=parent_action)
+        else:
+            node = Node(state, parent=parent, parent_action=parent_action)
+            self.created += 1
+            if self.node_bytes is None:
+                self.node_bytes = self.estimate_bytes(node)
+        self.live += 1
+        self.peak = max(self.peak, self.live)
+        return node
+
+    def release(self, node):
+        """Devuelve a la lista libre el subárbol completo de 'node'."""
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            stack.extend(n.children.values())
+            n.state = None  # marca de nodo liberado (y suelta el tablero)
+            n.parent = None
+            n.children = {}
+            self._free.append(n)
+            self.live -= 1
+
+    def prune(self, root, on_prune=None):
+        """
+        Poda subárboles de pocas visitas hasta bajar del objetivo. La acción
+        de cada subárbol podado vuelve a untried_actions de su padre, así
+        que se puede volver a expandir si la búsqueda la necesita.
+
+        Si se da on_prune, se llama con la raíz de cada subárbol justo antes
+        de liberarlo (aún enganchado a su padre), p. ej. para volcar sus
+        estadísticas a la tabla Q.
+        """
+        target = int(self.max_nodes * (1 - self.prune_fraction))
+        candidates = []
+        stack = list(root.children.values())
+        while stack:
+            node = stack.pop()
+            candidates.append(node)
+            stack.extend(node.children.values())
+        candidates.sort(key=lambda n: n.visits)
+
+        before = self.live
+        for node in candidates:
+            if self.live <= target:
+                break
+            if node.state is None:
+                continue  # ya se liberó con un ancestro
+            if on_prune is not None:
+                on_prune(node)
+            parent = node.parent
+            del parent.children[node.parent_action]
+            parent.untried_actions.append(node.parent_action)
+            self.release(node)
+        self.pruned += before - self.live
+
 
 
 #                 AGENTE Aha (VERSIÓN HÍBRIDA)
@@ -124,18 +397,128 @@ class Aha(Policy):
         alpha=0.3,                       # tasa de aprendizaje para Q-learning
         beta=0.7,                        # mezcla PRIOR vs UCB1
         q_file="magnus_q.pkl",           # archivo donde guardamos la tabla Q
+        telemetry=False,                 # registrar estadísticas de cada búsqueda
+        autosave=True,                   # guardar la tabla Q en disco tras cada jugada
+        q_capacity=None,                 # máximo de entradas en Q (None = sin límite)
+        q_max_bytes=None,                # o presupuesto aproximado de memoria para Q
+        q_shared=None,                   # nombre de una SharedQTable creada por el padre
+        background_load=True,            # mount() carga Q en un hilo y retorna de inmediato
+        ponder=False,                    # seguir buscando durante el turno del rival
+        ponder_simulations=None,         # tope de simulaciones por ponder (None = simulations)
+        ponder_seconds=None,             # tope de tiempo por ponder (None = sin tope)
+        adaptive=False,                  # presupuesto de simulaciones adaptativo por jugada
+        stop_share=0.8,                  # cortar si el mejor hijo tiene esta fracción de visitas
+        max_extension=1.0,               # simulaciones extra (fracción) en posiciones inestables
+        rollout="uniform",               # política de rollout: "uniform", "tactical", "center"
+        rave=False,                      # mezclar estadísticas AMAF (RAVE) en la selección
+        rave_k=300,                      # visitas a las que AMAF y UCB pesan lo mismo (aprox.)
+        selection="ucb",                 # "ucb" (prior Q + UCB1) o "puct" (priors heurísticos)
+        c_puct=1.5,                      # peso de la exploración en modo PUCT
+        evaluator="rollout",             # "rollout" o "network" (red valor/política)
+        net_file="magnus_net.npz",       # pesos de la red (ver train_network.py)
+        leaf_batch=8,                    # hojas evaluadas juntas por la red
+        max_nodes=None,                  # tope de nodos del árbol (None = sin tope)
+        prune_fraction=0.25,             # fracción del tope que se libera al podar
+        tablebase=None,                  # archivo de finales resueltos (ver connect4/tablebase.py)
+        pure_search=False,               # siempre MCTS: sin atajos ni tabla Q (datos para la red)
     ):
         self.simulations = simulations
         self.exploration_c = exploration_c
         self.alpha = alpha
         self.beta = beta
 
+        # Telemetría opcional: un registro por jugada (ver pop_telemetry)
+        self.telemetry = telemetry
+        self.search_log = []
+        self._last_rollout_len = 0
+
         # Random generator propio del agente
         self.rng = np.random.default_rng()
 
+        # Política con la que se juegan las simulaciones (ver connect4/rollouts.py)
+        self.rollout = make_rollout(rollout)
+
+        # RAVE / all-moves-as-first: útil con pocas simulaciones
+        self.rave = rave
+        self.rave_k = rave_k
+
+        # Fórmula de selección del árbol (ver Node.best_child y Node.puct_action)
+        if selection not in ("ucb", "puct"):
+            raise ValueError(f"Selección no soportada: {selection}")
+        self.selection = selection
+        self.c_puct = c_puct
+
+        # Evaluación de hojas: rollouts o red neuronal en NumPy. Con la red,
+        # la selección es PUCT con los priors de la red y las hojas se
+        # evalúan de a 'leaf_batch' en una sola pasada (ver _search_batched).
+        if evaluator not in ("rollout", "network"):
+            raise ValueError(f"Evaluador no soportado: {evaluator}")
+        self.evaluator = evaluator
+        self.net_file = net_file
+        self.leaf_batch = leaf_batch
+        self.net = None
+
+        # Tablebase de finales: valores exactos para posiciones con pocas
+        # casillas libres. Se consulta al inicio y durante cada rollout, y en
+        # las hojas evaluadas por la red. Se abre (memory-mapped) en mount()
+        # o, si no se montó, en el primer act() (ver _load_resources).
+        self.tablebase_file = tablebase
+        self.tablebase = None
+
+        # Nodos del árbol: se reciclan y, con max_nodes, se poda al llegar
+        # al tope (ver NodePool). nodes.peak / nodes.peak_bytes miden la memoria.
+        self.nodes = NodePool(max_nodes, prune_fraction)
+
+        # Visitas de cada hijo de la raíz en la última búsqueda (objetivo
+        # de la política al entrenar la red con self-play)
+        self.last_root_visits = {}
+
         # Tabla Q y archivo donde se guarda
         self.q_file = q_file
         self.Q = {}   # diccionario donde la clave es (estado, acción)
+        self.autosave = autosave
+
+        # Límite opcional de memoria para Q: si se define, Q es un
+        # BoundedQStore que expulsa las entradas menos usadas (LFU con envejecimiento)
+        self.q_capacity = q_capacity
+        self.q_max_bytes = q_max_bytes
+
+        # Si se da el nombre de una SharedQTable, mount() se conecta a ella
+        # (sin copiar) en vez de leer q_file. Útil con varios procesos.
+        self.q_shared = q_shared
+
+        # Carga en segundo plano: mientras q_ready no esté activo, act() usa
+        # MCTS con priors neutros (Q vacía) y no aprende ni guarda.
+        self.background_load = background_load
+        self.q_ready = threading.Event()
+        self.q_load_seconds = None
+        self._loader = None
+        self._pending_Q = None
+
+        # Ponder: árbol que se sigue explorando mientras el rival piensa
+        self.ponder = ponder
+        self.ponder_simulations = ponder_simulations
+        self.ponder_seconds = ponder_seconds
+        self._ponder_root = None
+        self._ponder_thread = None
+        self._ponder_stop = None
+
+        # Presupuesto adaptativo (ver _budget_done). last_budget guarda
+        # cuántas simulaciones se gastaron en la última búsqueda.
+        self.adaptive = adaptive
+        self.stop_share = stop_share
+        self.max_extension = max_extension
+        self.last_budget = 0
+
+        # Si es un diccionario, acumulamos por (estado, acción) la suma de
+        # recompensas y las visitas que se volcaron a Q: [suma, visitas].
+        # Lo usan los workers de entrenamiento en paralelo (ver merge_deltas).
+        self.q_stats = None
+
+        # Búsqueda pura: act() siempre corre MCTS (sin jugadas tácticas
+        # directas ni consulta a Q) y no vuelca nada a Q. Así last_root_visits
+        # siempre tiene las visitas de la raíz (ver train_network.py).
+        self.pure_search = pure_search
 
 
     #  MOUNT: requerido por la interfaz de la tarea / Gradescope
@@ -146,9 +529,95 @@ class Aha(Policy):
 
         Para evitar errores de firma, aceptamos cualquier parámetro,
         pero internamente solo usamos esto para cargar la Q-table
-        desde disco (si existe).
+        desde disco (si existe) o conectarnos a la tabla compartida.
+
+        Con background_load=True la lectura ocurre en un hilo aparte y
+        mount() retorna de inmediato (ver _swap_Q).
+        """
+        self.reset()
+        self._load_resources()
+
+        if not self.background_load or self.q_shared is not None:
+            # Conectarse a la tabla compartida no copia nada: es instantáneo
+            self.load_Q()
+            return
+
+        if self._loader is not None and self._loader.is_alive():
+            return  # ya hay una carga en curso
+
+        self.q_ready.clear()
+        self._loader = threading.Thread(target=self._background_load, daemon=True)
+        self._loader.start()
+
+    def _load_resources(self):
+        """
+        Abre la red (evaluator="network") y la tablebase si hacen falta y
+        todavía no están abiertas. Lo llaman mount() y act(), así un agente
+        usado sin montar carga lo que necesita en su primera jugada.
+        """
+        if self.evaluator == "network" and self.net is None:
+            if not os.path.exists(self.net_file):
+                raise FileNotFoundError(
+                    f"evaluator='network' necesita los pesos de la red y no existe "
+                    f"'{self.net_file}' (entrénala con train_network.py)"
+                )
+            self.net = ValuePolicyNet.load(self.net_file)
+
+        if self.tablebase_file is not None and self.tablebase is None:
+            self.tablebase = Tablebase.load(self.tablebase_file)
+
+    def reset(self):
+        """Entre partidas: detiene el ponder y olvida el árbol guardado."""
+        self._stop_ponder()
+        if self._ponder_root is not None:
+            self._flush_tree(self._ponder_root)
+            self.nodes.release(self._ponder_root)
+            self._ponder_root = None
+
+    def _background_load(self):
+        """Hilo de carga: lee la tabla y la deja pendiente para _swap_Q."""
+        start = time.perf_counter()
+        self._pending_Q = self._read_Q()
+        self.q_load_seconds = time.perf_counter() - start
+
+    def _swap_Q(self):
+        """
+        Si la carga en segundo plano terminó, instala la tabla nueva.
+
+        Solo se llama al inicio de act(), así una búsqueda nunca mezcla la
+        tabla provisional con la cargada. Lo aprendido con la tabla
+        provisional se descarta.
+        """
+        if self._pending_Q is not None:
+            self.Q, self._pending_Q = self._pending_Q, None
+            self.q_ready.set()
+
+    @property
+    def q_loading(self):
+        """True mientras hay una carga en segundo plano sin instalar."""
+        return self._loader is not None and not self.q_ready.is_set()
+
+    @property
+    def learning(self):
+        """True si lo que encuentra la búsqueda se vuelca a Q."""
+        return not self.pure_search and not self.q_loading
+
+    def wait_Q(self, timeout=None):
+        """Espera a que termine la carga de Q. Devuelve True si está lista."""
+        if self._loader is not None:
+            self._loader.join(timeout)
+        self._swap_Q()
+        return self.q_ready.is_set()
+
+    def teardown(self):
+        """
+        Libera recursos al terminar (lo llama PolicyPool al cerrar el match).
+        Con tabla compartida, solo nos desconectamos: el padre la destruye.
         """
-        self.load_Q()
+        self.reset()
+        if isinstance(self.Q, SharedQTable):
+            self.Q.close()
+            self.Q = {}
 
 
     #        CARGA Y GUARDADO DE LA TABLA Q(s,a) EN DISCO
@@ -157,16 +626,35 @@ class Aha(Policy):
         """
         Carga la tabla Q desde el archivo q_file, si existe.
         Si no existe o hay algún problema, se inicializa como un diccionario vacío.
+        Con q_capacity / q_max_bytes la tabla se carga en un BoundedQStore.
+        Con q_shared se usa la SharedQTable de ese nombre (no se lee q_file).
         """
+        start = time.perf_counter()
+        self.Q = self._read_Q()
+        self.q_load_seconds = time.perf_counter() - start
+        self.q_ready.set()
+
+    def _read_Q(self):
+        """Construye la tabla Q según el almacenamiento configurado."""
+        if self.q_shared is not None:
+            if isinstance(self.Q, SharedQTable):
+                return self.Q
+            return SharedQTable.attach(self.q_shared)
+
+        loaded = {}
         if os.path.exists(self.q_file):
             try:
                 with open(self.q_file, "rb") as f:
-                    self.Q = pickle.load(f)
+                    loaded = pickle.load(f)
             except Exception:
                 # Si el archivo está corrupto o falla la carga, reiniciamos Q
-                self.Q = {}
-        else:
-            self.Q = {}
+                loaded = {}
+
+        if self.q_capacity is None and self.q_max_bytes is None:
+            return loaded
+        store = BoundedQStore(capacity=self.q_capacity, max_bytes=self.q_max_bytes)
+        store.update(loaded)
+        return store
 
     def save_Q(self):
         """
@@ -174,9 +662,21 @@ class Aha(Policy):
         En algunos entornos (como el autograder) puede no estar permitido escribir
         en disco, por eso capturamos cualquier excepción y la ignoramos.
         """
+        if self.q_loading:
+            # Aún cargando: guardar ahora borraría la tabla del disco
+            return
+        if isinstance(self.Q, SharedQTable) and not self.Q.writer:
+            # La tabla compartida la persiste el proceso que la creó
+            return
         try:
+            # En disco siempre guardamos un dict normal, sea cual sea el almacenamiento
+            table = (
+                self.Q.to_dict()
+                if isinstance(self.Q, (BoundedQStore, SharedQTable))
+                else self.Q
+            )
             with open(self.q_file, "wb") as f:
-                pickle.dump(self.Q, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
         except Exception:
             # Si no se puede guardar, simplemente seguimos (el agente igual funciona,
             # solo que no persiste lo aprendido entre ejecuciones).
@@ -187,18 +687,14 @@ class Aha(Policy):
 
     def _winning_move(self, state: ConnectState, player: int):
         """
-        Recorre todas las columnas legales y revisa si alguna produce
-        una victoria inmediata para 'player'.
+        Revisa si alguna columna legal produce una victoria inmediata
+        para 'player' (sin copiar el tablero, ver ConnectState.tactics).
 
-        Si encuentra una, devuelve esa columna. Si no, devuelve None.
+        Si encuentra una, devuelve la de menor índice. Si no, devuelve None.
         """
-        free = state.get_free_cols()
-        for col in free:
-            if state.is_applicable(col):
-                next_state = state.transition(col)
-                if next_state.get_winner() == player:
-                    return col
-        return None
+        wins, _, _ = state.tactics(player)
+        cols = ConnectState.mask_to_cols(wins)
+        return cols[0] if cols else None
 
     def _block_enemy(self, state: ConnectState, player: int):
         """
@@ -206,40 +702,29 @@ class Aha(Policy):
         próximo turno jugando en alguna columna, la devolvemos para bloquear.
         Si no hay amenaza directa, devolvemos None.
         """
-        enemy = -player
-        free = state.get_free_cols()
-        for col in free:
-            # Simulamos que el enemigo juega desde este mismo tablero
-            enemy_state = ConnectState(state.board.copy(), enemy)
-            if enemy_state.is_applicable(col):
-                next_s = enemy_state.transition(col)
-                if next_s.get_winner() == enemy:
-                    return col
-        return None
+        _, blocks, _ = state.tactics(player)
+        cols = ConnectState.mask_to_cols(blocks)
+        return cols[0] if cols else None
 
 
-    #                ROLLOUT ALEATORIO (SIMULACIÓN)
+    #                ROLLOUT (SIMULACIÓN)
 
-    def _rollout(self, state: ConnectState, root_player: int) -> float:
+    def _rollout(self, state: ConnectState, root_player: int, moves=None) -> float:
         """
-        A partir de un estado dado, jugamos una partida completamente
-        aleatoria hasta que termine.
+        A partir de un estado dado, jugamos una partida hasta que termine
+        usando la política de rollout configurada (por defecto, aleatoria).
+        Si 'moves' es una lista, se le agregan las columnas jugadas (para AMAF).
+        Con tablebase, el rollout termina en la primera posición resuelta y
+        usa su resultado exacto.
 
         Devolvemos:
           - 1.0 si gana el jugador raíz (root_player)
           - 0.5 si hay empate
           - 0.0 si pierde el jugador raíz
         """
-        current = ConnectState(state.board.copy(), state.player)
+        winner, plies = self.rollout.play(state, self.rng, moves, self.tablebase)
+        self._last_rollout_len = plies
 
-        while not current.is_final():
-            free = current.get_free_cols()
-            if not free:
-                break
-            col = int(self.rng.choice(free))
-            current = current.transition(col)
-
-        winner = current.get_winner()
         if winner == root_player:
             return 1.0
         if winner == 0:
@@ -251,89 +736,563 @@ class Aha(Policy):
 
     def _mcts(self, root_state: ConnectState, root_player: int) -> int:
         """
-        Ejecuta el ciclo completo de MCTS desde root_state:
+        Ejecuta el ciclo completo de MCTS desde root_state (ver _search).
+
+        Si estábamos "pensando en el turno del rival" (ponder) y el rival
+        jugó una respuesta que ya estaba en el árbol, reutilizamos ese
+        subárbol y solo completamos las simulaciones que falten.
+
+        Al terminar, la tabla Q(s,a) se actualiza una sola vez por arista
+        del árbol usando sus propias estadísticas (ver _update_Q).
+        """
+        root = self._take_ponder_tree(root_state) or self.nodes.new(root_state)
+        reused_visits = root.visits
+
+        # Con telemetría desactivada "phases" es None y no se mide nada
+        clock = time.perf_counter if self.telemetry else None
+        phases = None
+        if clock:
+            phases = dict.fromkeys(
+                ("selection", "expansion", "rollout", "backprop", "q_update"), 0.0
+            )
+            search_start = clock()
+
+        iterations = max(self.simulations - reused_visits, 1)
+        if self.adaptive:
+            rollout_plies, spent = self._adaptive_search(
+                root, root_player, iterations, phases
+            )
+        else:
+            rollout_plies = self._search(root, root_player, iterations, phases=phases)
+            spent = iterations
+        self.last_budget = spent
+
+        # Actualizamos la tabla Q(s,a) con las estadísticas del árbol
+        if clock:
+            t4 = clock()
+
+        # Con la tabla aún cargando no aprendemos (se descartaría igual)
+        if self.learning:
+            self._update_Q(root)
+
+        if clock:
+            phases["q_update"] = clock() - t4
+            self._record_search(
+                root, phases, rollout_plies, clock() - search_start, reused_visits
+            )
+
+        # Intentamos guardar en disco lo aprendido
+        if self.autosave:
+            self.save_Q()
+
+
+        # Elegimos la acción final: el hijo con más visitas
+
+        if not root.children:
+            # Caso raro: si por alguna razón no hay hijos,
+            # devolvemos alguna columna libre válida.
+            self.nodes.release(root)
+            free_cols = root_state.get_free_cols()
+            return int(free_cols[0])
+
+        self.last_root_visits = {
+            action: child.visits for action, child in root.children.items()
+        }
+        best_child = max(root.children.values(), key=lambda n: n.visits)
+        action = int(best_child.parent_action)
+
+        # Mientras el rival piensa, seguimos buscando desde nuestra jugada.
+        # El resto del árbol vuelve al pool de nodos antes de lanzar el hilo:
+        # NodePool no es thread-safe y el ponder también crea y libera nodos
+        if self.ponder:
+            del root.children[action]
+            best_child.parent = None
+        self.nodes.release(root)
+        if self.ponder:
+            self._start_ponder(best_child, root_player)
+
+        return action
+
+    def _search(self, root, root_player, iterations, stop=None, deadline=None, phases=None):
+        """
+        Corre hasta 'iterations' simulaciones de MCTS sobre el árbol de root:
 
           1) Selección: bajamos por el árbol usando best_child() hasta
-             llegar a un nodo no expandido o terminal.
+             llegar a un nodo no expandido o terminal (con selection="puct",
+             puct_action() elige también cuál acción nueva expandir).
           2) Expansión: si el nodo no es terminal y tiene acciones sin usar,
              expandimos una de ellas.
           3) Simulación (rollout): jugamos aleatorio hasta el final.
           4) Backpropagation: propagamos la recompensa hacia arriba,
-             actualizando visits y value.
+             actualizando visits y value (y AMAF si rave=True).
 
-        Además, guardamos (estado, acción, recompensa) en una lista de
-        experiencias para luego actualizar la tabla Q(s,a).
+        Se detiene antes si 'stop' (threading.Event) se activa o se pasa
+        'deadline' (time.perf_counter). Si 'phases' es un diccionario,
+        acumula ahí el tiempo de cada fase. Devuelve la suma de los largos
+        de los rollouts.
         """
-        root = Node(root_state)
-        experience = []
+        if self.evaluator == "network":
+            return self._search_batched(
+                root, root_player, iterations, stop, deadline, phases
+            )
+
+        clock = time.perf_counter if phases is not None else None
+        rollout_plies = 0
+
+        for _ in range(iterations):
+            if stop is not None and stop.is_set():
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.nodes.full():
+                self.nodes.prune(root, self._flush_subtree)
 
-        # Repetimos el proceso tantas veces como simulaciones hayamos configurado
-        for _ in range(self.simulations):
             node = root
+            if clock:
+                t0 = clock()
 
 
             # 1) SELECCIÓN
 
-            while not node.state.is_final() and node.is_fully_expanded():
-                node = node.best_child(
-                    self.exploration_c,
-                    self.Q,
-                    self.beta,
-                )
+            action = None
+            if self.selection == "puct":
+                # PUCT puede elegir una acción aún no expandida: ahí paramos
+                while not node.state.is_final():
+                    action = node.puct_action(self.c_puct, root_player)
+                    if action not in node.children:
+                        break
+                    node = node.children[action]
+                    action = None
+            else:
+                while not node.state.is_final() and node.is_fully_expanded():
+                    node = node.best_child(
+                        self.exploration_c,
+                        self.Q,
+                        self.beta,
+                        self.rave_k if self.rave else None,
+                    )
+            if clock:
+                t1 = clock()
+                phases["selection"] += t1 - t0
 
             # 2) EXPANSIÓN
 
             if not node.state.is_final() and node.untried_actions:
-                action = int(self.rng.choice(node.untried_actions))
+                if action is None:
+                    action = int(self.rng.choice(node.untried_actions))
                 node.untried_actions.remove(action)
 
                 new_state = node.state.transition(action)
-                child = Node(new_state, parent=node, parent_action=action)
+                child = self.nodes.new(new_state, parent=node, parent_action=action)
                 node.children[action] = child
                 node = child
+            if clock:
+                t2 = clock()
+                phases["expansion"] += t2 - t1
 
 
             # 3) SIMULACIÓN (ROLLOUT)
 
-            reward = self._rollout(node.state, root_player)
+            moves = [] if self.rave else None
+            reward = self._rollout(node.state, root_player, moves)
+            rollout_plies += self._last_rollout_len
+            if clock:
+                t3 = clock()
+                phases["rollout"] += t3 - t2
 
 
             # 4) BACKPROPAGATION
-            #    (y recolección de experiencias para Q-learning)
 
-            while node is not None:
-                node.visits += 1
-                node.value += reward
+            self._backpropagate(node, reward, moves)
+            if clock:
+                phases["backprop"] += clock() - t3
 
-                if node.parent is not None:
-                    # Guardamos la experiencia desde el padre:
-                    # estado del padre, acción que llevó a este nodo y recompensa final
-                    s_key = tuple(int(x) for x in node.parent.state.board.flatten())
-                    experience.append((s_key, node.parent_action, reward))
+        return rollout_plies
 
-                node = node.parent
+    #          BÚSQUEDA CON RED (HOJAS EVALUADAS EN LOTES)
 
-        # Actualizamos la tabla Q(s,a) con todas las experiencias
+    def _search_batched(
+        self, root, root_player, iterations, stop=None, deadline=None, phases=None
+    ):
+        """
+        Variante de _search que evalúa las hojas con la red en vez de rollouts.
+
+        En cada tanda se seleccionan hasta 'leaf_batch' hojas con PUCT. Cada
+        camino recibe una "pérdida virtual" (una visita que cuenta como
+        derrota para quien eligió) para que las siguientes selecciones de la
+        tanda se repartan por otras ramas. Después se evalúan todas las
+        hojas no terminales con una sola llamada a net.predict, se fijan sus
+        priors y se propaga el valor. Devuelve 0 (no hay rollouts).
+        """
+        clock = time.perf_counter if phases is not None else None
 
-        for (s_key, a, r) in experience:
-            old_q = self.Q.get((s_key, a), 0.5)
-            # Regla clásica de actualización incremental
-            self.Q[(s_key, a)] = old_q + self.alpha * (r - old_q)
+        if root.priors is None and not root.state.is_final():
+            self._evaluate_leaves([root], root_player)
 
-        # Intentamos guardar en disco lo aprendido
-        self.save_Q()
+        done = 0
+        while done < iterations:
+            if stop is not None and stop.is_set():
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.nodes.full(self.leaf_batch):
+                self.nodes.prune(root, self._flush_subtree)
+            if clock:
+                t0 = clock()
+
+            leaves = []
+            for _ in range(min(self.leaf_batch, iterations - done)):
+                node = root
+                while not node.state.is_final() and node.priors is not None:
+                    action = node.puct_action(self.c_puct, root_player)
+                    if action not in node.children:
+                        node.untried_actions.remove(action)
+                        child = self.nodes.new(
+                            node.state.transition(action),
+                            parent=node,
+                            parent_action=action,
+                        )
+                        node.children[action] = child
+                        node = child
+                        break
+                    node = node.children[action]
+                self._virtual_loss(node, root_player, +1)
+                leaves.append(node)
+                done += 1
+            if clock:
+                t1 = clock()
+                phases["selection"] += t1 - t0
+
+            for node in leaves:
+                self._virtual_loss(node, root_player, -1)
+            rewards = self._evaluate_leaves(leaves, root_player)
+            if clock:
+                t2 = clock()
+                phases["rollout"] += t2 - t1
+
+            for node, reward in zip(leaves, rewards):
+                self._backpropagate(node, reward)
+            if clock:
+                phases["backprop"] += clock() - t2
+
+        return 0
+
+    def _virtual_loss(self, node, root_player, sign):
+        """Suma (sign=+1) o quita (sign=-1) una derrota virtual en el camino."""
+        while node.parent is not None:
+            loss = 0.0 if node.parent.state.player == root_player else 1.0
+            node.visits += sign
+            node.value += sign * loss
+            node = node.parent
+        node.visits += sign
+
+    def _evaluate_leaves(self, leaves, root_player):
+        """
+        Recompensa de cada hoja para root_player: exacta si el juego terminó
+        o la hoja está en la tablebase, si no, el valor de la red (de
+        [-1, 1] a [0, 1]). Las hojas no terminales reciben además sus
+        priors. Una hoja repetida en la tanda se evalúa una vez.
+        """
+        rewards = [None] * len(leaves)
+        pending = {}
+        for i, node in enumerate(leaves):
+            if node.state.is_final():
+                winner = node.state.get_winner()
+                if winner == root_player:
+                    rewards[i] = 1.0
+                elif winner == 0:
+                    rewards[i] = 0.5
+                else:
+                    rewards[i] = 0.0
+            else:
+                value = self._probe_tablebase(node.state)
+                if value is not None:
+                    # Posición resuelta: no hace falta la red (priors uniformes)
+                    if node.priors is None:
+                        free = node.state.get_free_cols()
+                        node.priors = {a: 1.0 / len(free) for a in free}
+                    if node.state.player != root_player:
+                        value = -value
+                    rewards[i] = (1.0 + value) / 2
+                else:
+                    pending.setdefault(id(node), []).append(i)
+
+        if pending:
+            nodes = [leaves[idx[0]] for idx in pending.values()]
+            values, priors = self.net.predict(
+                np.stack([n.state.board for n in nodes]),
+                np.array([n.state.player for n in nodes]),
+            )
+            for node, idx, value, prior in zip(nodes, pending.values(), values, priors):
+                if node.priors is None:
+                    node.priors = {a: float(prior[a]) for a in node.state.get_free_cols()}
+                if node.state.player != root_player:
+                    value = -value
+                for i in idx:
+                    rewards[i] = float((1.0 + value) / 2)
+        return rewards
+
+    def _probe_tablebase(self, state: ConnectState):
+        """Valor exacto de state para el jugador que mueve, o None."""
+        tablebase = self.tablebase
+        if tablebase is None:
+            return None
+        empties = ConnectState.ROWS * ConnectState.COLS - int(np.count_nonzero(state.board))
+        if empties > tablebase.max_empties:
+            return None
+        return tablebase.probe(state.key())
+
+    def _backpropagate(self, node, reward, moves=None):
+        """
+        Sube desde 'node' hasta la raíz sumando la visita y la recompensa.
 
+        Con RAVE, 'moves' son las columnas jugadas en el rollout desde
+        'node'. Al subir se les antepone la acción de cada nodo, así que en
+        cada nivel moves[0::2] son las jugadas del jugador de ese nodo:
+        cada columna distinta cuenta una vez en sus estadísticas AMAF.
+        """
+        while node is not None:
+            node.visits += 1
+            node.value += reward
+            if moves is not None:
+                for action in set(moves[0::2]):
+                    node.amaf_visits[action] = node.amaf_visits.get(action, 0) + 1
+                    node.amaf_value[action] = node.amaf_value.get(action, 0.0) + reward
+                if node.parent is not None:
+                    moves.insert(0, node.parent_action)
+            node = node.parent
 
-        # Elegimos la acción final: el hijo con más visitas
+    #            PRESUPUESTO ADAPTATIVO DE SIMULACIONES
+
+    def _adaptive_search(self, root, root_player, budget, phases=None, check_every=10):
+        """
+        Corre la búsqueda en tandas de 'check_every' simulaciones y después
+        de cada tanda decide si seguir (ver _budget_done). Puede cortar antes
+        de 'budget' o extenderse hasta budget * (1 + max_extension).
 
+        Devuelve (suma de largos de rollouts, simulaciones gastadas).
+        """
+        max_budget = int(budget * (1 + self.max_extension))
+        rollout_plies = 0
+        spent = 0
+        while spent < max_budget:
+            chunk = min(check_every, max_budget - spent)
+            rollout_plies += self._search(root, root_player, chunk, phases=phases)
+            spent += chunk
+            if self._budget_done(root, spent, budget):
+                break
+        return rollout_plies, spent
+
+    def _budget_done(self, root, spent, budget):
+        """
+        Decide si la búsqueda puede terminar:
+
+          - Antes del presupuesto: si el hijo más visitado ya no puede ser
+            alcanzado por el segundo con las simulaciones que quedan, o si
+            acapara al menos stop_share de las visitas.
+          - Al llegar al presupuesto: solo si la posición es estable, es
+            decir, el hijo más visitado es también el de mejor valor medio.
+            Si no, seguimos (extensión) hasta que lo sea o se acabe el tope.
+
+        La dominancia se mide sobre todas las jugadas legales: las que aún
+        no tienen hijo (con PUCT la raíz se expande poco a poco y puede no
+        completarse nunca) cuentan con 0 visitas.
+        """
         if not root.children:
-            # Caso raro: si por alguna razón no hay hijos,
-            # devolvemos alguna columna libre válida.
-            free_cols = root_state.get_free_cols()
-            return int(free_cols[0])
+            return False
 
-        best_child = max(root.children.values(), key=lambda n: n.visits)
-        return int(best_child.parent_action)
+        children = sorted(root.children.values(), key=lambda n: n.visits, reverse=True)
+        best = children[0]
+
+        if spent < budget:
+            if spent < budget // 4:
+                return False
+            second = children[1].visits if len(children) > 1 else 0
+            if best.visits - second > budget - spent:
+                return True
+            total = sum(child.visits for child in children)
+            return best.visits >= self.stop_share * total
+
+        best_value = max(
+            (child for child in children if child.visits > 0),
+            key=lambda n: n.value / n.visits,
+        )
+        return best_value is best
+
+    #          PONDER: PENSAR DURANTE EL TURNO DEL RIVAL
+
+    def _start_ponder(self, node, root_player):
+        """
+        Lanza un hilo que sigue buscando desde 'node' (el estado tras nuestra
+        jugada) hasta que llegue el próximo act(), se agote ponder_simulations
+        o pasen ponder_seconds.
+
+        Ojo: es un hilo de Python, así que comparte el GIL. Rinde cuando el
+        rival corre en otro proceso (p. ej. con move_timeout en el torneo).
+        """
+        self._stop_ponder()
+
+        node.parent = None  # el resto del árbol ya no sirve
+        self._ponder_root = node
+        self._ponder_stop = threading.Event()
+
+        budget = self.ponder_simulations or self.simulations
+        deadline = None
+        if self.ponder_seconds is not None:
+            deadline = time.perf_counter() + self.ponder_seconds
+
+        self._ponder_thread = threading.Thread(
+            target=self._search,
+            args=(node, root_player, budget, self._ponder_stop, deadline),
+            daemon=True,
+        )
+        self._ponder_thread.start()
+
+    def _stop_ponder(self):
+        """Detiene el hilo de ponder (si hay) y espera a que termine."""
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def _take_ponder_tree(self, state):
+        """
+        Devuelve el subárbol de la respuesta que jugó el rival, si lo
+        exploramos mientras pensaba; si no, None.
+        """
+        self._stop_ponder()
+        ponder_root, self._ponder_root = self._ponder_root, None
+        if ponder_root is None:
+            return None
+
+        # Lo que aprendió el ponder se vuelca a Q antes de soltar el árbol;
+        # el subárbol reutilizado no lo vuelve a contar (ver q_visits)
+        self._flush_tree(ponder_root)
+
+        taken = None
+        for action, child in ponder_root.children.items():
+            if child.state.player == state.player and np.array_equal(
+                child.state.board, state.board
+            ):
+                del ponder_root.children[action]
+                child.parent = None
+                taken = child
+                break
+        self.nodes.release(ponder_root)
+        return taken
+
+    def _update_Q(self, root):
+        """
+        Actualiza Q(s,a) una vez por cada arista (padre -> hijo) del árbol.
+
+        La regla incremental  Q <- Q + alpha * (r - Q)  aplicada n veces
+        seguidas con recompensas de media r_media equivale (exactamente si
+        las recompensas son iguales) a:
+
+            Q <- (1 - alpha)^n * Q + (1 - (1 - alpha)^n) * r_media
+
+        donde n = visitas del hijo y r_media = valor del hijo / visitas, que
+        el árbol ya tiene acumulados. Así evitamos guardar una tupla por
+        nodo visitado en cada simulación.
+
+        Si el árbol se reutiliza (ponder), solo se aplican las visitas nuevas
+        desde la última actualización (q_visits / q_value de cada nodo).
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for action, child in node.children.items():
+                stack.append(child)
+                self._update_edge(node, action, child)
+
+    def _update_edge(self, node, action, child):
+        """Vuelca a Q(s,a) las visitas nuevas de la arista node -> child."""
+        visits = child.visits - child.q_visits
+        if visits == 0:
+            return
+        value = child.value - child.q_value
+        child.q_visits = child.visits
+        child.q_value = child.value
+
+        key = (node.q_key(), action)
+        decay = (1 - self.alpha) ** visits
+        old_q = node.q_get(self.Q, action)
+        self.Q[key] = decay * old_q + (1 - decay) * (value / visits)
+
+        if self.q_stats is not None:
+            stats = self.q_stats.setdefault(key, [0.0, 0])
+            stats[0] += value
+            stats[1] += visits
+
+    def _flush_tree(self, root):
+        """Vuelca a Q un árbol entero antes de liberarlo (p. ej. el del ponder)."""
+        if self.learning:
+            self._update_Q(root)
+
+    def _flush_subtree(self, node):
+        """
+        Callback de NodePool.prune: antes de podar un subárbol volcamos a Q
+        lo que aprendió (la arista desde su padre y todas las de adentro),
+        que si no se perdería al liberar sus nodos.
+        """
+        if not self.learning:
+            return  # igual que en act(): con la tabla cargando no aprendemos
+        self._update_edge(node.parent, node.parent_action, node)
+        self._update_Q(node)
+
+    #                  TELEMETRÍA DE LA BÚSQUEDA
+
+    def _record_search(self, root, phases, rollout_plies, elapsed, reused_visits=0):
+        """
+        Guarda un registro estructurado de la búsqueda que acaba de terminar:
+        tiempo por fase, iteraciones por segundo, tamaño y profundidad del
+        árbol, largo medio de los rollouts y visitas de cada hijo de la raíz.
+        """
+        tree_size = 0
+        max_depth = 0
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            tree_size += 1
+            max_depth = max(max_depth, depth)
+            stack.extend((child, depth + 1) for child in node.children.values())
+
+        iterations = root.visits - reused_visits
+        self.search_log.append({
+            "decision": "mcts",
+            "q_ready": not self.q_loading,
+            "seconds": elapsed,
+            "phases": phases,
+            "iterations": iterations,
+            "iterations_per_s": iterations / elapsed if elapsed > 0 else 0.0,
+            "reused_visits": reused_visits,
+            "budget": self.last_budget,
+            "tree_size": tree_size,
+            "max_depth": max_depth,
+            "live_nodes": self.nodes.live,
+            "peak_nodes": self.nodes.peak,
+            "peak_bytes": self.nodes.peak_bytes,
+            "pruned_nodes": self.nodes.pruned,
+            "mean_rollout_len": rollout_plies / iterations if iterations else 0.0,
+            "root_visits": {
+                int(a): child.visits for a, child in root.children.items()
+            },
+        })
+
+    def enable_telemetry(self):
+        """
+        Activa la telemetría después de construir el agente. PolicyPool lo
+        llama con telemetry=True, porque crea los agentes sin argumentos.
+        """
+        self.telemetry = True
+
+    def pop_telemetry(self):
+        """
+        Devuelve los registros acumulados desde la última llamada y los borra.
+        Si la telemetría está desactivada siempre devuelve una lista vacía.
+        """
+        records, self.search_log = self.search_log, []
+        return records
 
     #                        ACT (POLICY)
 
@@ -347,39 +1306,67 @@ class Aha(Policy):
           3) Si el estado ya fue visto antes, intenta usar la acción con mejor Q(s,a).
           4) Si nada de lo anterior aplica, corre MCTS y aprende de la simulación.
 
+        Con pure_search=True se salta directo a MCTS, sin aprender.
+
         En todos los casos se asegura de devolver una jugada legal.
         """
 
+        # Paramos el ponder antes de tocar el rng o la tabla Q
+        self._stop_ponder()
+
+        # Red y tablebase, si no se llamó a mount()
+        self._load_resources()
+        self.last_budget = 0  # las jugadas resueltas sin MCTS no gastan simulaciones
+        self.last_root_visits = {}
+
+        # Si la tabla Q terminó de cargarse en segundo plano, la instalamos
+        self._swap_Q()
+
         # Contamos fichas rojas y amarillas para deducir de quién es el turno
         num_red = int(np.sum(s == -1))
         num_yellow = int(np.sum(s == 1))
         current_player = -1 if num_red == num_yellow else 1
 
         # Creamos el estado a partir del tablero y el jugador actual
-        state = ConnectState(s.copy(), current_player)
+        state = ConnectState(s, current_player)  # el constructor ya copia
         free = state.get_free_cols()  # columnas legales
 
         # Si no hay movimientos posibles (tablero lleno), devolvemos algo válido
         if not free:
             return 0
 
+        # Búsqueda pura: ni atajos ni tabla Q, directo a MCTS
+        if self.pure_search:
+            return self._mcts(state, current_player)
+
         # Si solo hay una jugada posible, la tomamos sin pensar más
         if len(free) == 1:
             return int(free[0])
 
+        # Victorias y bloqueos inmediatos en una sola pasada
+        # (solo devuelve columnas legales)
+        wins, blocks, _ = state.tactics(current_player)
+
         # 1) Intentamos ganar inmediatamente
-        win = self._winning_move(state, current_player)
-        if win is not None and win in free and state.is_applicable(win):
-            return int(win)
+        if wins:
+            if self.telemetry:
+                self.search_log.append({"decision": "win"})
+            return ConnectState.mask_to_cols(wins)[0]
 
         # 2) Intentamos bloquear una victoria inmediata del rival
-        block = self._block_enemy(state, current_player)
-        if block is not None and block in free and state.is_applicable(block):
-            return int(block)
+        if blocks:
+            if self.telemetry:
+                self.search_log.append({"decision": "block"})
+            return ConnectState.mask_to_cols(blocks)[0]
 
         # 3) Buscamos si este estado ya existe en la tabla Q
+        #    (consultamos solo las 7 acciones posibles en vez de recorrer toda Q)
         s_key = tuple(int(x) for x in s.flatten())
-        candidates = [(k[1], v) for k, v in self.Q.items() if k[0] == s_key]
+        candidates = [
+            (a, self.Q[(s_key, a)])
+            for a in range(ConnectState.COLS)
+            if (s_key, a) in self.Q
+        ]
 
         if candidates:
             # Ordenamos las acciones por su valor Q de mayor a menor
@@ -388,6 +1375,8 @@ class Aha(Policy):
 
             # Si la mejor acción aprendida es legal, la usamos
             if best_q_action in free and state.is_applicable(best_q_action):
+                if self.telemetry:
+                    self.search_log.append({"decision": "q_table"})
                 return int(best_q_action)
 
         # 4) Si nada de lo anterior funcionó, usamos MCTS para decidir
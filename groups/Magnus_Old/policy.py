@@ -1,14 +1,23 @@
+import math
 import numpy as np
 from connect4.policy import Policy
-from connect4.connect_state import ConnectState
+from connect4.connect_state import CELL_LINES, LINES, ConnectState
 
 
 class Aha(Policy):
     # Simulations: Cantidad de simulaciones por movimiento para escoger la mejor acción.
-    def __init__(self, simulations: int = 100):
+    # Mode: "flat" reparte 'simulations' a cada columna (con early stopping);
+    #       "halving" reparte el mismo total con sequential halving.
+    def __init__(self, simulations: int = 100, mode: str = "flat"):
+        if mode not in ("flat", "halving"):
+            raise ValueError(f"Modo no soportado: {mode}")
         self.simulations = simulations
+        self.mode = mode
         self.rng = np.random.default_rng()
 
+        # Rollouts usados en la última jugada
+        self.last_rollouts = 0
+
     def mount(self) -> None:
         pass
 
@@ -39,7 +48,79 @@ class Aha(Policy):
 
         return current_state.get_winner()
 
+    # Simula n juegos aleatorios a la vez desde el estado dado (vectorizado)
+    def simulate_random_games(self, state: ConnectState, n: int) -> np.ndarray:
+        rows, cols = state.ROWS, state.COLS
+
+        boards = np.repeat(state.board.reshape(1, -1).astype(np.int8), n, axis=0)
+        heights = np.repeat(np.array([state.get_heights()]), n, axis=0)
+        players = np.full(n, state.player, dtype=np.int8)
+        winners = np.zeros(n, dtype=np.int8)
+
+        # Juegos que siguen en curso (el estado de partida ya podría ser final)
+        active = np.full(n, not state.is_final())
+        if not active.any():
+            winners[:] = state.get_winner()
+            return winners
+
+        while active.any():
+            idx = np.flatnonzero(active)
+
+            # Columna aleatoria uniforme entre las legales de cada juego
+            legal = heights[idx] < rows
+            cols_played = np.argmax(self.rng.random((len(idx), cols)) * legal, axis=1)
+            rows_played = rows - 1 - heights[idx, cols_played]
+
+            boards[idx, rows_played * cols + cols_played] = players[idx]
+            heights[idx, cols_played] += 1
+
+            # ¿Alguien completó 4 en línea? Solo pueden ser las líneas que
+            # pasan por la casilla recién jugada (a lo sumo 13, ver CELL_LINES)
+            line_ids = CELL_LINES[rows_played * cols + cols_played]
+            line_sums = boards[idx[:, None, None], LINES[line_ids]].sum(axis=2)
+            won = ((line_sums == 4 * players[idx, None]) & (line_ids >= 0)).any(axis=1)
+            full = heights[idx].sum(axis=1) == rows * cols
+
+            winners[idx[won]] = players[idx[won]]
+            active[idx[won | full]] = False
+            players[idx] *= -1
+
+        return winners
+
+    # Sequential halving: reparte el total de rollouts en rondas, descartando
+    # la mitad peor de las columnas en cada ronda
+    def sequential_halving(self, state: ConnectState, cols: list[int], player: int) -> int:
+        total_budget = self.simulations * len(cols)
+        rounds = max(1, math.ceil(math.log2(len(cols))))
+
+        survivors = list(cols)
+        results = {col: np.zeros(3) for col in cols}  # victorias, empates, derrotas
+
+        for _ in range(rounds):
+            per_col = max(1, total_budget // (len(survivors) * rounds))
+            for col in survivors:
+                winners = self.simulate_random_games(state.transition(col), per_col)
+                results[col] += [
+                    np.sum(winners == player),
+                    np.sum(winners == 0),
+                    np.sum(winners == -player),
+                ]
+                self.last_rollouts += per_col
+
+            # Mismo puntaje que el modo plano, pero normalizado por rollouts
+            def mean_score(col):
+                wins, draws, losses = results[col]
+                return (wins - losses + draws * 0.5) / (wins + draws + losses)
+
+            survivors.sort(key=mean_score, reverse=True)
+            if len(survivors) == 1:
+                break
+            survivors = survivors[: math.ceil(len(survivors) / 2)]
+
+        return int(survivors[0])
+
     def act(self, s: np.ndarray) -> int:
+        self.last_rollouts = 0
 
         # El agente no sabe en que turno esta, por lo que debe deducirlo
         # Para ello debe saber que color es (-1 Rojo, 1 Amarillo)
@@ -48,7 +129,7 @@ class Aha(Policy):
         current_player = -1 if num_red == num_yellow else 1
 
         # Obtiene el estado actual del juego desde la perspectiva del jugador actual
-        current_state = ConnectState(s.copy(), current_player)
+        current_state = ConnectState(s, current_player)  # el constructor ya copia
 
         # Abtener las columnas disponibles es decir que tengan espacio en la fila superior = 0
         available_cols = [c for c in range(7) if s[0, c] == 0]
@@ -62,23 +143,17 @@ class Aha(Policy):
         if len(available_cols) == 1:
             return available_cols[0]
 
-        # Verificar si podemos ganar en este turno
-        for col in available_cols:
-            if current_state.is_applicable(col):
-                next_state = current_state.transition(col)
-                if next_state.get_winner() == current_player:
-                    return col
+        # Verificar si podemos ganar en este turno, o si hay que bloquear al
+        # oponente porque puede ganar en su próximo turno (una sola pasada)
+        wins, blocks, _ = current_state.tactics(current_player)
+        if wins:
+            return ConnectState.mask_to_cols(wins)[0]
+        if blocks:
+            return ConnectState.mask_to_cols(blocks)[0]
 
-        # Bloquear al oponente si puede ganar en su próximo turno
-        opponent = -current_player
-        for col in available_cols:
-            if current_state.is_applicable(col):
-                # Simular que el oponente juega en esta columna
-                opponent_state = ConnectState(s.copy(), opponent)
-                if opponent_state.is_applicable(col):
-                    opponent_next = opponent_state.transition(col)
-                    if opponent_next.get_winner() == opponent:
-                        return col
+        # Sequential halving: mismo presupuesto total, repartido por rondas
+        if self.mode == "halving":
+            return self.sequential_halving(current_state, available_cols, current_player)
 
         # Ejecutar MCTS para cada columna disponible
         scores = {}
@@ -99,6 +174,7 @@ class Aha(Policy):
             # Con Early Stopping: Si una columna es claramente mala, dejar de simularla
             for i in range(self.simulations):
                 winner = self.simulate_random_game(next_state)
+                self.last_rollouts += 1
 
                 if winner == current_player:
                     wins += 1
@@ -1,5 +1,8 @@
+import os
+from functools import partial
+
 from connect4.policy import Policy
-from connect4.utils import find_importable_classes
+from connect4.utils import find_importable_classes, import_times
 from tournament import run_tournament, play
 
 # Read all files within subfolder of "groups"
@@ -8,10 +11,18 @@ participants = find_importable_classes("groups", Policy)
 # Build a participant list (name, class)
 players = list(participants.items())
 
+# TELEMETRY=1 python main.py also writes versus/telemetry_*.json for the
+# policies that support it (see PolicyPool)
+match = partial(play, telemetry=True) if os.environ.get("TELEMETRY") == "1" else play
+
 # Run the tournament
 champion = run_tournament(
     players,
-    play,  # You could also create your own play function for testing purposes
+    match,  # You could also create your own play function for testing purposes
     shuffle=True,
 )
 print("Champion:", champion)
+
+# Time spent importing each group that actually played
+for name, seconds in sorted(import_times(participants).items()):
+    print(f"Import time {name}: {seconds:.3f}s")
@@ -64,7 +64,11 @@ def main():
 
     for i in range(GAMES):
         print(f"Partida {i+1}/{GAMES}")
-        winner = play_game(MagnusOLD(simulations=200), MagnusNEW(simulations=200), verbose=False)
+        winner = play_game(
+            MagnusOLD(simulations=200),
+            MagnusNEW(simulations=200, background_load=False),
+            verbose=False,
+        )
 
         if winner == -1:
             results["OLD_as_RED"]["old"] += 1
@@ -79,7 +83,11 @@ def main():
 
     for i in range(GAMES):
         print(f"Partida {i+1}/{GAMES}")
-        winner = play_game(MagnusNEW(simulations=200), MagnusOLD(simulations=200), verbose=False)
+        winner = play_game(
+            MagnusNEW(simulations=200, background_load=False),
+            MagnusOLD(simulations=200),
+            verbose=False,
+        )
 
         if winner == -1:
             results["NEW_as_RED"]["new"] += 1
@@ -70,7 +70,8 @@ def main():
 
     for i in range(games):
         print(f"\n===== Partida {i+1} =====")
-        magnus = Magnus(simulations=200)   # Ajusta simulations si va muy lento
+        # Ajusta simulations si va muy lento; Q se carga antes de la primera jugada
+        magnus = Magnus(simulations=200, background_load=False)
         random_bot = RandomBot()
 
         result = play_game(magnus, random_bot, verbose=True)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from connect4.analytics import Summary
+from connect4.match_log import GameRecord
+
+EMPTY = np.zeros((6, 7), dtype=np.int8)
+
+
+def record(moves: str, winner, red: str | None) -> GameRecord:
+    moves = np.array([int(c) for c in moves], dtype=np.int8)
+    return GameRecord("alice", "bob", 0, EMPTY, moves, winner, red)
+
+
+def test_agent_results_follow_the_colour_each_agent_played():
+    summary = Summary()
+    summary.add_batch(
+        [
+            record("0101010", -1, "alice"),  # alice (Red) wins
+            record("0101010", -1, "bob"),  # bob (Red) wins
+            record("1010101", 1, "alice"),  # bob (Yellow) wins
+            record("33", None, "bob"),  # forfeit: no result
+            record("0101010", -1, None),  # unknown colours: not credited
+        ]
+    )
+    alice, bob = summary.agents["alice"], summary.agents["bob"]
+    assert (alice.games, alice.wins, alice.losses, alice.unfinished) == (4, 1, 2, 1)
+    assert (bob.games, bob.wins, bob.losses, bob.unfinished) == (4, 2, 1, 1)
+    assert (alice.red_games, alice.red_wins, alice.yellow_wins) == (2, 1, 0)
+    assert summary.games == 5
+
+
+def test_header_only_adds_latency():
+    summary = Summary()
+    latency = {"moves": 10, "p50": 0.1, "p95": 0.3, "max": 0.5}
+    summary.add_header(
+        {
+            "player_a": "alice",
+            "player_b": "bob",
+            "player_a_wins": 3,
+            "player_a_latency": latency,
+            "player_b_latency": {**latency, "moves": 30, "p50": 0.2},
+        }
+    )
+    summary.add_header(
+        {"player_a": "bob", "player_b": "alice", "player_a_latency": latency}
+    )
+    assert summary.agents["alice"].games == 0
+    bob = summary.agents["bob"].latency_summary()
+    assert bob["moves"] == 40
+    assert bob["mean_match_p50"] == pytest.approx(0.175)
+    assert bob["mean_match_p95"] == pytest.approx(0.3)
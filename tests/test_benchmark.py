@@ -0,0 +1,23 @@
+import sys
+
+import pytest
+import benchmark
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["benchmark.py", "state.get_free_cols", *args])
+    benchmark.main()
+
+
+def test_missing_baseline_fails(tmp_path, monkeypatch):
+    output = str(tmp_path / "results.json")
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(monkeypatch, "--output", output, "--baseline", str(tmp_path / "none.json"))
+    assert exit_info.value.code == 1
+
+
+def test_saved_baseline_passes(tmp_path, monkeypatch):
+    output, baseline = str(tmp_path / "results.json"), str(tmp_path / "baseline.json")
+    run_main(monkeypatch, "--output", output, "--baseline", baseline, "--save-baseline")
+    # A huge threshold: only the presence of every benchmark is checked
+    run_main(monkeypatch, "--output", output, "--baseline", baseline, "--threshold", "100")
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from connect4.connect_state import BOARD_DTYPE, ConnectState, count_threats, evaluate
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def windows(board):
+    """Every four-in-a-row window of the board, scanned cell by cell."""
+    rows, cols = board.shape
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in DIRECTIONS:
+                end_r, end_c = r + 3 * dr, c + 3 * dc
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    yield [int(board[r + i * dr, c + i * dc]) for i in range(4)]
+
+
+def loop_threats(board, player):
+    return sum(w.count(player) == 3 and w.count(0) == 1 for w in windows(board))
+
+
+def loop_evaluate(board, player):
+    weights = [0.0, 1.0, 4.0, 16.0, 1000.0]
+    score = 0.0
+    for w in windows(board):
+        own, opp = w.count(player), w.count(-player)
+        if opp == 0:
+            score += weights[own]
+        if own == 0:
+            score -= weights[opp]
+    return score
+
+
+def random_boards(n, seed=0):
+    """Positions reached by random play, stopping before the game ends."""
+    rng = np.random.default_rng(seed)
+    boards = []
+    for _ in range(n):
+        state = ConnectState()
+        for _ in range(rng.integers(0, 30)):
+            following = state.transition(int(rng.choice(state.get_free_cols())))
+            if following.is_final():
+                break
+            state = following
+        boards.append(state.board)
+    return np.stack(boards)
+
+
+@pytest.mark.parametrize("player", [-1, 1])
+def test_batch_helpers_match_a_per_board_loop(player):
+    boards = random_boards(200)
+    threats = [loop_threats(board, player) for board in boards]
+    scores = [loop_evaluate(board, player) for board in boards]
+
+    assert count_threats(boards, player).tolist() == threats
+    assert evaluate(boards, player).tolist() == scores
+    # Already-flattened batches go through the same gather
+    assert evaluate(boards.reshape(len(boards), 42), player).tolist() == scores
+    assert any(threats)
+
+
+@pytest.mark.parametrize("player", [-1, 1])
+def test_state_methods_match_a_per_board_loop(player):
+    for board in random_boards(50, seed=1):
+        state = ConnectState(board)
+        assert state.count_threats(player) == loop_threats(board, player)
+        assert state.evaluate(player) == loop_evaluate(board, player)
+
+
+def test_copy_keeps_the_callers_board_separate():
+    board = np.zeros((6, 7), dtype=np.int8)
+    state = ConnectState(board)
+    board[5, 0] = 1
+    assert state.board[5, 0] == 0
+
+    shared = ConnectState(board, copy=False)
+    board[5, 1] = -1
+    assert shared.board is board and shared.board[5, 1] == -1
+
+
+def test_boards_are_stored_as_int8():
+    assert BOARD_DTYPE == np.int8
+    assert ConnectState().board.dtype == BOARD_DTYPE
+    # Other dtypes are converted, even without copy
+    wide = np.zeros((6, 7), dtype=np.int64)
+    for copy in (True, False):
+        state = ConnectState(wide, copy=copy)
+        assert state.board.dtype == BOARD_DTYPE and state.board is not wide
+    assert ConnectState([[0] * 7] * 6).board.dtype == BOARD_DTYPE
+
+    following = ConnectState(wide).transition(3)
+    assert following.board.dtype == BOARD_DTYPE and following.board[5, 3] == -1
+
+
+def test_states_have_no_instance_dict():
+    state = ConnectState()
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.extra = 1
@@ -0,0 +1,80 @@
+import sys
+
+import pytest
+from connect4.policy import Policy
+from connect4.utils import LazyPolicy, find_importable_classes
+
+ALIASED = """
+import numpy as np
+from connect4.policy import Policy as P
+
+
+class Base(P):
+    def mount(self):
+        pass
+
+    def act(self, s):
+        return 0
+
+
+class Indirect(Base):
+    pass
+"""
+
+MODULE_ALIAS = """
+import connect4.policy as cp
+
+
+class Bot(cp.Policy):
+    def mount(self):
+        pass
+
+    def act(self, s):
+        return 0
+"""
+
+BROKEN = """
+from typing import does_not_exist
+from connect4.policy import Policy
+
+
+class Broken(Policy):
+    pass
+"""
+
+
+@pytest.fixture
+def bots(tmp_path):
+    root = tmp_path / "bots"
+    for group, source in (("aliased", ALIASED), ("alias", MODULE_ALIAS), ("broken", BROKEN)):
+        (root / group).mkdir(parents=True)
+        (root / group / "policy.py").write_text(source)
+    yield root
+    for name in [m for m in sys.modules if m == "bots" or m.startswith("bots.")]:
+        del sys.modules[name]
+
+
+def test_discovery_resolves_aliases_and_skips_broken_groups(bots, capsys):
+    found = find_importable_classes(str(bots), Policy)
+
+    # Validation imports ran in another interpreter
+    assert not [m for m in sys.modules if m.startswith("bots.")]
+    assert sorted(found) == ["alias", "aliased"]
+    assert all(isinstance(cls, LazyPolicy) for cls in found.values())
+    assert found["alias"].class_name == "Bot"
+    assert issubclass(found["aliased"].load(), Policy)
+    assert found["aliased"].import_seconds > 1e-5  # a real import, not a cache hit
+    assert "broken/policy.py" in capsys.readouterr().err
+
+
+def test_cached_discovery_does_not_import(bots, capsys):
+    find_importable_classes(str(bots), Policy)
+    for name in [m for m in sys.modules if m.startswith("bots.")]:
+        del sys.modules[name]
+
+    found = find_importable_classes(str(bots), Policy)
+
+    assert sorted(found) == ["alias", "aliased"]
+    assert not [m for m in sys.modules if m.startswith("bots.")]
+    # The import failure is cached too and still reported
+    assert "broken/policy.py" in capsys.readouterr().err
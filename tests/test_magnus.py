@@ -0,0 +1,325 @@
+import pickle
+import threading
+
+import numpy as np
+import pytest
+from connect4.connect_state import ConnectState
+from connect4.network import ValuePolicyNet
+from groups.Magnus_Carlsen.policy import Aha
+
+
+def agent(tmp_path, **kwargs):
+    kwargs.setdefault("simulations", 16)
+    return Aha(
+        autosave=False,
+        background_load=False,
+        q_file=str(tmp_path / "q.pkl"),
+        **kwargs,
+    )
+
+
+def test_network_agent_loads_the_net_on_first_act(tmp_path):
+    net_file = str(tmp_path / "net.npz")
+    ValuePolicyNet(hidden=(8,), seed=0).save(net_file)
+    magnus = agent(tmp_path, evaluator="network", net_file=net_file, leaf_batch=4)
+
+    move = magnus.act(ConnectState().board)  # no mount()
+    assert move in range(7)
+    assert magnus.net is not None
+
+
+def test_missing_network_file_is_a_clear_error(tmp_path):
+    magnus = agent(tmp_path, evaluator="network", net_file=str(tmp_path / "missing.npz"))
+    with pytest.raises(FileNotFoundError, match="missing.npz"):
+        magnus.act(np.zeros((6, 7), dtype=np.int8))
+    with pytest.raises(FileNotFoundError, match="train_network.py"):
+        magnus.mount()
+
+
+def test_pruned_subtrees_are_flushed_to_q(tmp_path):
+    magnus = agent(tmp_path, max_nodes=12, prune_fraction=0.5)
+    magnus.mount()
+    magnus.q_stats = {}
+    state = ConnectState()
+    root = magnus.nodes.new(state)
+
+    magnus._search(root, state.player, 400)
+    magnus._update_Q(root)
+
+    assert magnus.nodes.pruned > 0
+    # Every simulation crosses exactly one root edge, pruned or not
+    root_key = root.q_key()
+    flushed = sum(n for (s_key, _), (_, n) in magnus.q_stats.items() if s_key == root_key)
+    assert flushed == root.visits == 400
+
+
+def test_ponder_starts_after_the_old_tree_is_released(tmp_path):
+    magnus = agent(tmp_path, ponder=True, ponder_simulations=50)
+    magnus.mount()
+    state = ConnectState()
+    for _ in range(3):
+        state = state.transition(magnus.act(state.board))
+        state = state.transition(state.get_free_cols()[0])
+    magnus.reset()
+    assert magnus.nodes.live == 0
+
+
+def one_edge_tree(magnus, visits, reward):
+    state = ConnectState()
+    root = magnus.nodes.new(state)
+    child = magnus.nodes.new(state.transition(3), parent=root, parent_action=3)
+    root.children[3] = child
+    root.untried_actions.remove(3)
+    child.visits, child.value = visits, visits * reward
+    root.visits = visits
+    return root, child
+
+
+def sequential(q, alpha, rewards):
+    for reward in rewards:
+        q += alpha * (reward - q)
+    return q
+
+
+def test_closed_form_update_equals_sequential_updates(tmp_path):
+    magnus = agent(tmp_path)
+    root, _ = one_edge_tree(magnus, visits=5, reward=0.8)
+    key = (root.q_key(), 3)
+    magnus.Q = {key: 0.2}
+
+    magnus._update_Q(root)
+
+    assert magnus.Q[key] == pytest.approx(sequential(0.2, magnus.alpha, [0.8] * 5))
+
+
+def test_visits_are_applied_only_once(tmp_path):
+    magnus = agent(tmp_path)
+    magnus.q_stats = {}
+    root, child = one_edge_tree(magnus, visits=4, reward=1.0)
+    key = (root.q_key(), 3)
+
+    magnus._update_Q(root)
+    after_first = magnus.Q[key]
+    magnus._update_Q(root)  # nothing new
+    assert magnus.Q[key] == after_first
+
+    # The subtree is reused (ponder) and gains 2 visits with reward 0
+    child.visits += 2
+    magnus._update_Q(root)
+    expected = sequential(after_first, magnus.alpha, [0.0, 0.0])
+    assert magnus.Q[key] == pytest.approx(expected)
+
+    # Flushed before pruning, then the tree update must not count it again
+    child.visits += 1
+    child.value += 1.0
+    magnus._flush_subtree(child)
+    magnus._update_Q(root)
+    assert magnus.Q[key] == pytest.approx(sequential(expected, magnus.alpha, [1.0]))
+    assert magnus.q_stats[key] == [5.0, 7]
+
+
+def test_background_load_does_not_learn_or_save_until_swapped(tmp_path):
+    q_file = tmp_path / "q.pkl"
+    loaded_key = ((1,) + (0,) * 41, 0)
+    release = threading.Event()
+    magnus = Aha(simulations=30, q_file=str(q_file), background_load=True)
+
+    def slow_read():
+        release.wait(10)
+        return {loaded_key: 0.9}
+
+    magnus._read_Q = slow_read
+    magnus.mount()
+    assert magnus.q_loading
+
+    # act() answers while the table is still loading, without learning or saving
+    board = ConnectState().board
+    assert magnus.act(board) in range(7)
+    assert magnus.Q == {}
+    assert not q_file.exists()
+
+    release.set()
+    magnus._loader.join(10)
+    assert magnus.q_loading  # loaded, but only installed by the next act()
+
+    magnus.act(ConnectState().transition(3).board)
+    assert not magnus.q_loading
+    assert magnus.Q[loaded_key] == 0.9
+    assert len(magnus.Q) > 1  # what this search learned is kept
+    with open(q_file, "rb") as f:
+        assert pickle.load(f) == magnus.Q
+
+
+def ponder_after_first_move(tmp_path):
+    """Agent that played the first move and pondered 200 simulations on it."""
+    magnus = agent(tmp_path, ponder=True, ponder_simulations=200)
+    magnus.mount()
+    magnus.q_stats = {}
+    state = ConnectState()
+    state = state.transition(magnus.act(state.board))
+    magnus._ponder_thread.join(10)
+    magnus._stop_ponder()
+    return magnus, state
+
+
+def flushed_visits(magnus, state):
+    key = tuple(state.board.ravel().tolist())
+    return sum(n for (s_key, _), (_, n) in magnus.q_stats.items() if s_key == key)
+
+
+def test_ponder_tree_is_reused_and_flushed(tmp_path):
+    magnus, state = ponder_after_first_move(tmp_path)
+    ponder_root = magnus._ponder_root
+    visits = ponder_root.visits
+    assert visits > 200
+
+    reply = max(ponder_root.children, key=lambda a: ponder_root.children[a].visits)
+    reused = magnus._take_ponder_tree(state.transition(reply))
+    assert reused is not None and reused.parent is None and reused.visits > 0
+    # Every visit but the one that created the node crossed one of its edges
+    assert flushed_visits(magnus, state) == visits - 1
+    assert magnus._ponder_root is None
+    magnus.teardown()
+
+
+def test_discarded_ponder_tree_is_flushed(tmp_path):
+    magnus, state = ponder_after_first_move(tmp_path)
+    visits = magnus._ponder_root.visits
+
+    # A position that is not a reply to our move: nothing to reuse
+    assert magnus._take_ponder_tree(state.transition(0).transition(0)) is None
+    assert flushed_visits(magnus, state) == visits - 1
+    assert magnus.nodes.live == 0
+    magnus.teardown()
+
+
+def test_teardown_joins_the_ponder_thread(tmp_path):
+    magnus = agent(tmp_path, ponder=True, ponder_simulations=10_000)
+    magnus.mount()
+    magnus.act(ConnectState().board)
+    thread = magnus._ponder_thread
+    assert thread is not None and thread.is_alive()
+
+    magnus.teardown()
+    assert not thread.is_alive()
+    assert magnus._ponder_thread is None and magnus._ponder_root is None
+
+
+def root_with_stats(magnus, stats):
+    """Empty-board root with one child per column and the given (visits, value)."""
+    state = ConnectState()
+    root = magnus.nodes.new(state)
+    for action, (visits, value) in enumerate(stats):
+        child = magnus.nodes.new(state.transition(action), parent=root, parent_action=action)
+        child.visits, child.value = visits, value
+        root.children[action] = child
+    root.visits = sum(visits for visits, _ in stats)
+    return root
+
+
+def test_budget_stops_early_on_a_dominant_child(tmp_path):
+    magnus = agent(tmp_path, adaptive=True)
+    dominant = root_with_stats(magnus, [(45, 30.0), (3, 1.0), (2, 1.0)])
+    assert magnus._budget_done(dominant, spent=50, budget=100)
+    # Too early to stop, even though it dominates
+    assert not magnus._budget_done(dominant, spent=20, budget=100)
+
+    balanced = root_with_stats(magnus, [(20, 10.0), (18, 9.0), (12, 6.0)])
+    assert not magnus._budget_done(balanced, spent=50, budget=100)
+
+
+def test_budget_extends_a_close_decision(tmp_path):
+    magnus = agent(tmp_path, adaptive=True)
+    # The most visited child is not the best on average: unstable position
+    unstable = root_with_stats(magnus, [(40, 16.0), (38, 26.0), (22, 8.0)])
+    assert not magnus._budget_done(unstable, spent=100, budget=100)
+    stable = root_with_stats(magnus, [(40, 26.0), (38, 16.0), (22, 8.0)])
+    assert magnus._budget_done(stable, spent=100, budget=100)
+
+    # If it never settles, the search runs to the extension cap
+    magnus = agent(tmp_path, adaptive=True, max_extension=0.5)
+    magnus._budget_done = lambda root, spent, budget: False
+    root = magnus.nodes.new(ConnectState())
+    _, spent = magnus._adaptive_search(root, -1, 40)
+    assert spent == 60 and root.visits == 60
+
+
+def test_budget_is_reported(tmp_path):
+    magnus = agent(tmp_path, adaptive=True, telemetry=True, simulations=40)
+    magnus.mount()
+    magnus.act(ConnectState().board)
+    record = magnus.pop_telemetry()[-1]
+    assert record["decision"] == "mcts"
+    assert 10 <= magnus.last_budget <= 80
+    assert record["budget"] == magnus.last_budget
+
+    # A winning move is answered without spending simulations
+    state = ConnectState()
+    for action in (0, 6, 0, 6, 0, 6):
+        state = state.transition(action)
+    assert magnus.act(state.board) == 0
+    assert magnus.last_budget == 0
+    assert magnus.pop_telemetry() == [{"decision": "win"}]
+    magnus.teardown()
+
+
+def test_amaf_backpropagation_on_a_two_ply_tree(tmp_path):
+    magnus = agent(tmp_path, rave=True)
+    root = magnus.nodes.new(ConnectState())
+    child = magnus.nodes.new(root.state.transition(3), parent=root, parent_action=3)
+    root.children[3] = child
+    leaf = magnus.nodes.new(child.state.transition(2), parent=child, parent_action=2)
+    child.children[2] = leaf
+
+    # Rollout from the leaf: its player plays 4 and 4, the other one 3 and 5
+    magnus._backpropagate(leaf, 0.25, [4, 3, 4, 5])
+    assert leaf.amaf_visits == {4: 1} and leaf.amaf_value == {4: 0.25}
+    assert child.amaf_visits == {2: 1, 3: 1, 5: 1}
+    assert child.amaf_value == {2: 0.25, 3: 0.25, 5: 0.25}
+    assert root.amaf_visits == {3: 1, 4: 1}
+    assert root.amaf_value == {3: 0.25, 4: 0.25}
+
+    magnus._backpropagate(leaf, 1.0, [4])
+    assert leaf.amaf_visits == {4: 2} and leaf.amaf_value == {4: 1.25}
+    assert child.amaf_visits == {2: 2, 3: 1, 5: 1} and child.amaf_value[2] == 1.25
+    assert root.amaf_visits == {3: 2, 4: 2} and root.amaf_value == {3: 1.25, 4: 1.25}
+    assert [n.visits for n in (root, child, leaf)] == [2, 2, 2]
+
+
+def test_rave_off_leaves_ucb_untouched(tmp_path):
+    magnus = agent(tmp_path)
+    root = root_with_stats(magnus, [(10, 6.0), (10, 5.0)])
+    # AMAF strongly prefers column 1, plain UCB prefers column 0
+    root.amaf_visits = {0: 100, 1: 100}
+    root.amaf_value = {0: 0.0, 1: 100.0}
+    for _ in range(10):
+        assert root.best_child(1.0, {}, magnus.beta).parent_action == 0
+        assert root.best_child(1.0, {}, magnus.beta, rave_k=300).parent_action == 1
+
+    # Without rave, searching never collects AMAF statistics
+    root = magnus.nodes.new(ConnectState())
+    magnus._search(root, -1, 50)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        assert node.amaf_visits == {} and node.amaf_value == {}
+        stack.extend(node.children.values())
+
+
+def test_pure_search_always_searches_and_never_learns(tmp_path):
+    state = ConnectState()
+    for action in (0, 6, 0, 6, 0, 6):
+        state = state.transition(action)
+    key = tuple(state.board.ravel().tolist())
+
+    magnus = agent(tmp_path, pure_search=True, simulations=30)
+    magnus.mount()
+    magnus.Q[(key, 3)] = 1.0  # a learned move that would otherwise be played
+    assert magnus.act(state.board) == 0
+    assert sum(magnus.last_root_visits.values()) == 30
+    assert magnus.Q == {(key, 3): 1.0}
+
+    magnus = agent(tmp_path)
+    magnus.mount()
+    assert magnus.act(state.board) == 0
+    assert magnus.last_root_visits == {}
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from connect4.connect_state import ConnectState
+from groups.Magnus_Old.policy import Aha
+
+
+class RecordingRng:
+    """Wraps a Generator and keeps every random() draw so games can be replayed."""
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.draws = []
+
+    def random(self, size):
+        draw = self.rng.random(size)
+        self.draws.append(draw)
+        return draw
+
+    def choice(self, values):
+        return self.rng.choice(values)
+
+
+def random_position(seed, plies):
+    """Position after up to 'plies' random moves, stopping short of a finished game."""
+    rng = np.random.default_rng(seed)
+    state = ConnectState()
+    for _ in range(plies):
+        following = state.transition(int(rng.choice(state.get_free_cols())))
+        if following.is_final():
+            break
+        state = following
+    return state
+
+
+def replay(state, n, draws):
+    """Plays the n games one by one with ConnectState, using the recorded draws."""
+    games = [state] * n
+    for draw in draws:
+        active = [g for g in range(n) if not games[g].is_final()]
+        assert len(active) == len(draw)
+        for row, g in zip(draw, active):
+            legal = [games[g].is_applicable(c) for c in range(ConnectState.COLS)]
+            games[g] = games[g].transition(int(np.argmax(row * legal)))
+    assert all(game.is_final() for game in games)
+    return [game.get_winner() for game in games]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_vectorized_rollouts_match_a_connect_state_replay(seed):
+    magnus = Aha()
+    magnus.rng = RecordingRng(seed)
+    state = random_position(seed, plies=4 * seed)
+
+    winners = magnus.simulate_random_games(state, 200)
+    assert winners.tolist() == replay(state, 200, magnus.rng.draws)
+    # Both colours win some of the 200 games, so the win check is exercised
+    assert {-1, 1} <= set(winners.tolist())
+
+
+def test_rollouts_from_a_finished_game_return_its_winner():
+    state = ConnectState()
+    for action in (0, 6, 0, 6, 0, 6, 0):
+        state = state.transition(action)
+    assert (Aha().simulate_random_games(state, 5) == -1).all()
+
+
+@pytest.mark.parametrize("mode", ["flat", "halving"])
+def test_act_stays_within_budget_and_legal(mode):
+    magnus = Aha(simulations=12, mode=mode)
+    magnus.rng = np.random.default_rng(0)
+    for seed in range(20):
+        state = random_position(seed, plies=seed * 2)
+        free = state.get_free_cols()
+        move = magnus.act(state.board)
+        assert move in free
+        assert magnus.last_rollouts <= magnus.simulations * len(free)
+
+
+def test_sequential_halving_returns_a_candidate_column():
+    magnus = Aha(simulations=5, mode="halving")
+    magnus.rng = np.random.default_rng(1)
+    state = random_position(3, plies=10)
+    free = state.get_free_cols()
+    for size in range(1, len(free) + 1):
+        cols = free[:size]
+        magnus.last_rollouts = 0
+        assert magnus.sequential_halving(state, cols, state.player) in cols
+        assert magnus.last_rollouts <= magnus.simulations * len(cols)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from connect4.connect_state import ConnectState
+from connect4.dtos import Game, Match
+from connect4.match_log import iter_records, read_header
+from connect4.position_db import PositionIndex, PositionIndexBuilder
+
+
+def make_game(moves: str) -> Game:
+    game = Game()
+    state = ConnectState()
+    for col in map(int, moves):
+        game.append((state.board.copy().tolist(), col))
+        state = state.transition(col)
+    return game
+
+
+# Red wins in column 0; the second game stops after a forfeit
+GAMES = ["0101010", "3344"]
+
+
+def write_match(path, games=GAMES):
+    match = Match(
+        player_a="alice",
+        player_b="bob",
+        player_a_wins=1,
+        first_players=["alice", "bob"],
+        games=[make_game(moves) for moves in games],
+    )
+    path.write_text(match.model_dump_json(indent=4))
+    return str(path)
+
+
+def test_records_round_trip(tmp_path):
+    path = write_match(tmp_path / "match_alice_vs_bob.json")
+    assert read_header(path)["player_a_wins"] == 1
+
+    records = list(iter_records([path]))
+    assert [r.moves.tolist() for r in records] == [[0, 1, 0, 1, 0, 1, 0], [3, 3, 4, 4]]
+    assert [r.winner for r in records] == [-1, None]
+    assert [r.red for r in records] == ["alice", "bob"]
+    assert records[0].player_a == "alice" and records[0].index == 0
+    assert np.array_equal(records[1].start, np.zeros((6, 7)))
+
+
+def test_truncated_file_yields_complete_games_then_fails(tmp_path):
+    path = write_match(tmp_path / "match_alice_vs_bob.json")
+    text = open(path).read()
+    # The first game holds 7 of the 11 boards: cut inside the second one
+    with open(path, "w") as f:
+        f.write(text[: int(len(text) * 0.85)])
+
+    records = iter_records([path])
+    assert next(records).winner == -1
+    with pytest.raises(ValueError):
+        next(records)
+
+
+def test_position_index_keeps_losses_and_unfinished_games_apart(tmp_path):
+    path = write_match(tmp_path / "match_alice_vs_bob.json", ["0101010", "0606", "3344"])
+    builder = PositionIndexBuilder()
+    builder.add_files([path])
+    builder.save(str(tmp_path / "positions.npy"))
+    index = PositionIndex.load(str(tmp_path / "positions.npy"))
+
+    # From the empty board Red played 0 twice (one win, one unfinished game)
+    # and 3 once (unfinished)
+    rows = {r["col"]: r for r in index.moves(ConnectState())}
+    assert rows[0] == {
+        "col": 0, "plays": 2, "wins": 1, "draws": 0, "losses": 0, "unfinished": 1
+    }
+    assert rows[3]["unfinished"] == 1 and rows[3]["losses"] == 0
+    # Yellow's reply in column 1 lost
+    after_red = ConnectState().transition(0)
+    rows = {r["col"]: r for r in index.moves(after_red)}
+    assert rows[1]["losses"] == 1 and rows[1]["unfinished"] == 0
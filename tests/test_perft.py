@@ -0,0 +1,20 @@
+from connect4.connect_state import ConnectState
+from connect4.perft import EMPTY_BOARD_PERFT, perft, state_from_moves
+
+
+def counts(result):
+    return [(lvl.nodes, lvl.wins, lvl.losses, lvl.draws) for lvl in result.levels]
+
+
+def test_empty_board_matches_reference():
+    depth = 5
+    assert counts(perft(ConnectState(), depth)) == EMPTY_BOARD_PERFT[: depth + 1]
+
+
+def test_wins_are_counted_and_not_expanded():
+    # Red has three in column 0 and wins by playing it again
+    state = state_from_moves("010101")
+    result = perft(state, 2)
+    assert counts(result)[1] == (7, 1, 0, 0)
+    # The winning child is final, so only the other six are expanded
+    assert result.levels[2].nodes == 6 * 7
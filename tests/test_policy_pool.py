@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from connect4.policy import Policy
+from connect4.policy_pool import PolicyPool
+
+
+class Counter(Policy):
+    """Counts its mounts, resets and moves."""
+
+    def __init__(self):
+        self.mounts = self.resets = self.moves = 0
+        self.closed = False
+
+    def mount(self) -> None:
+        self.mounts += 1
+
+    def reset(self) -> None:
+        self.resets += 1
+
+    def teardown(self) -> None:
+        self.closed = True
+
+    def act(self, s: np.ndarray) -> int:
+        self.moves += 1
+        return 0
+
+
+def test_each_participant_is_built_and_mounted_once():
+    participant = ("a", Counter)
+    with PolicyPool() as pool:
+        policy = pool.get(participant)
+        assert pool.get(participant) is policy
+        pool.reset()
+    assert (policy.mounts, policy.resets, policy.closed) == (1, 1, True)
+
+
+def test_different_participants_with_the_same_name_are_rejected():
+    with PolicyPool() as pool:
+        first = pool.get(("a", Counter))
+        with pytest.raises(ValueError, match="'a'"):
+            pool.get(("a", Counter))
+        assert pool.get(("b", Counter)) is not first
@@ -0,0 +1,58 @@
+from connect4.q_store import BoundedQStore
+
+
+def test_least_used_entries_are_evicted():
+    store = BoundedQStore(capacity=10, slack=0.1)
+    for i in range(10):
+        store[i] = float(i)
+    for _ in range(3):
+        for i in range(5):
+            store[i]
+
+    store[10] = 10.0  # 11 entries: still within the slack
+    assert len(store) == 11
+    store[11] = 11.0
+    assert len(store) == 10
+    assert store.evictions == 2
+    assert all(i in store for i in range(5))
+    assert 11 in store
+
+
+def test_aging_lets_old_favourites_be_evicted():
+    def run(aging_interval):
+        store = BoundedQStore(capacity=2, slack=0.0, aging_interval=aging_interval)
+        store["old"] = 0.0
+        for _ in range(4):
+            store["old"]
+        store["new"] = 0.0
+        for _ in range(8):
+            store["new"]
+        store["third"] = 0.0
+        return store
+
+    aged = run(aging_interval=4)
+    assert "old" not in aged
+    assert {"new", "third"} <= set(aged)
+
+    # Without aging the early favourite keeps its place
+    assert "old" in run(aging_interval=10**9)
+
+
+def test_byte_budget_sets_the_capacity():
+    key, value = ((0,) * 42, 3), 0.5
+    entry = BoundedQStore.estimate_entry_bytes(key, value)
+    store = BoundedQStore(max_bytes=20 * entry, slack=0.0)
+    for i in range(50):
+        store[((i,) + (0,) * 41, 3)] = value
+    assert store.target_entries == 20
+    assert len(store) == 20
+    assert store.nbytes <= 20 * entry
+
+
+def test_hits_and_misses_are_counted():
+    store = BoundedQStore(capacity=4)
+    store["a"] = 1.0
+    assert store.get("a") == 1.0
+    assert store.get("b", 0.5) == 0.5
+    assert (store.hits, store.misses) == (1, 1)
+    assert store.to_dict() == {"a": 1.0}
@@ -0,0 +1,27 @@
+import pytest
+from train_selfplay import merge_deltas
+
+KEY = ((0,) * 42, 3)
+
+
+def test_updates_of_several_workers_add_up():
+    alpha = 0.3
+    one = merge_deltas({}, [{KEY: (2.0, 2)}], alpha)
+    split = merge_deltas({}, [{KEY: (1.0, 1)}, {KEY: (1.0, 1)}], alpha)
+    # Two workers with one visit each learn as much as one with two visits
+    assert split[KEY] == pytest.approx(one[KEY])
+    assert split[KEY] == pytest.approx(1 - (1 - alpha) ** 2 * 0.5)
+
+
+def test_merge_starts_from_the_base_table():
+    base = {KEY: 0.9}
+    merged = merge_deltas(base, [{KEY: (0.0, 1)}], alpha=0.5)
+    assert merged[KEY] == pytest.approx(0.45)
+    assert base[KEY] == 0.9  # only the merged entries are returned
+
+
+def test_merge_is_deterministic_and_skips_empty_deltas():
+    other = ((1,) + (0,) * 41, 0)
+    workers = [{KEY: (1.0, 3), other: (0.0, 0)}, {KEY: (0.5, 2)}]
+    assert merge_deltas({}, workers) == merge_deltas({}, workers[::-1])
+    assert other not in merge_deltas({}, workers)
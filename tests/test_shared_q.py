@@ -0,0 +1,104 @@
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+from connect4.connect_state import ConnectState, board_from_key, board_key, move_key
+from connect4.q_store import SharedQTable
+
+
+def _state(moves: str) -> ConnectState:
+    state = ConnectState()
+    for col in moves:
+        state = state.transition(int(col))
+    return state
+
+
+def _cells(moves: str) -> tuple:
+    return tuple(_state(moves).board.ravel().tolist())
+
+
+@pytest.mark.parametrize("moves", ["", "3", "3344", "0123456", "000000111111", "3" * 6 + "2" * 6])
+def test_board_key_round_trip(moves):
+    state = _state(moves)
+    key = board_key(state.board)
+    assert np.array_equal(board_from_key(key), state.board)
+    assert board_key(state.board.ravel()) == key
+
+
+def test_move_key_matches_board_key():
+    state = _state("33421")
+    key = state.key()
+    for col in state.get_free_cols():
+        child = state.transition(col)
+        height = int(np.count_nonzero(state.board[:, col]))
+        assert move_key(key, col, height, state.player) == child.key()
+
+
+@pytest.fixture
+def table():
+    shared = SharedQTable.create({(_cells(""), 3): 0.6, (_cells("3"), 3): 0.4})
+    yield shared
+    shared.close()
+    shared.unlink()
+
+
+def test_attach_reads_the_parent_values(table):
+    reader = SharedQTable.attach(table.name)
+    try:
+        assert reader[(_cells(""), 3)] == 0.6
+        assert reader.get((_cells(""), 2)) is None
+        assert len(reader) == 2
+        code = SharedQTable.encode((_cells("3"), 3))
+        assert reader.get_encoded((_cells("3"), 3), code, 0.5) == 0.4
+        # In-place writes of the creator are seen by every attached process
+        table[(_cells(""), 3)] = 0.7
+        assert reader[(_cells(""), 3)] == 0.7
+    finally:
+        reader.close()
+
+
+def test_reader_writes_stay_private(table):
+    reader = SharedQTable.attach(table.name)
+    try:
+        reader[(_cells(""), 3)] = 0.1
+        reader[(_cells("0"), 1)] = 0.9
+        assert reader[(_cells(""), 3)] == 0.1
+        assert table[(_cells(""), 3)] == 0.6
+        assert (_cells("0"), 1) not in table
+        assert len(reader) == 3
+    finally:
+        reader.close()
+
+
+def _send_updates(name, updates):
+    reader = SharedQTable.attach(name, updates=updates)
+    reader[(_cells(""), 3)] = 0.2
+    reader[(_cells("6"), 0)] = 0.8
+    reader.close()
+
+
+def test_drain_applies_updates_from_another_process():
+    updates = mp.Queue()
+    table = SharedQTable.create({(_cells(""), 3): 0.6}, updates=updates)
+    try:
+        worker = mp.Process(target=_send_updates, args=(table.name, updates))
+        worker.start()
+        assert table.drain(count=2) == 2
+        worker.join()
+        assert table[(_cells(""), 3)] == 0.2
+        assert table[(_cells("6"), 0)] == 0.8
+        assert table.drain() == 0
+    finally:
+        table.close()
+        table.unlink()
+
+
+def test_drain_can_merge_instead_of_overwrite(table):
+    table.updates = mp.Queue()
+    key = (_cells(""), 3)
+    table.updates.put((key, (1.0, 2)))
+    table.updates.put((key, (0.5, 1)))
+    received = []
+    assert table.drain(lambda k, delta: received.append((k, delta)), count=2) == 2
+    assert received == [(key, (1.0, 2)), (key, (0.5, 1))]
+    assert table[key] == 0.6
@@ -0,0 +1,72 @@
+import numpy as np
+from connect4.connect_state import ConnectState
+from connect4.tablebase import Tablebase, TablebaseBuilder
+
+MAX_EMPTIES = 6
+
+
+def brute_force(state: ConnectState) -> int:
+    """Exact value for the player to move by plain negamax: 1, 0 or -1."""
+    free = state.get_free_cols()
+    if not free:
+        return 0
+    best = -1
+    for col in free:
+        child = state.transition(col)
+        value = 1 if child.get_winner() != 0 else -brute_force(child)
+        best = max(best, value)
+        if best == 1:
+            break
+    return best
+
+
+def endgame_positions(count: int, seed: int = 1) -> list[ConnectState]:
+    """
+    Non-final positions with MAX_EMPTIES empty cells, filled with random
+    moves that never complete four (random games rarely last this long).
+    """
+    rng = np.random.default_rng(seed)
+    positions = []
+    while len(positions) < count:
+        state = ConnectState()
+        while state is not None and 42 - np.count_nonzero(state.board) > MAX_EMPTIES:
+            quiet = [
+                child
+                for child in map(state.transition, state.get_free_cols())
+                if child.get_winner() == 0
+            ]
+            state = quiet[rng.integers(len(quiet))] if quiet else None
+        if state is not None:
+            positions.append(state)
+    return positions
+
+
+def test_probe_matches_brute_force(tmp_path):
+    positions = endgame_positions(40, seed=2)
+
+    builder = TablebaseBuilder(MAX_EMPTIES)
+    for state in positions:
+        builder.add_position(state)
+    path = str(tmp_path / "tablebase.npy")
+    builder.save(path)
+    tablebase = Tablebase.load(path)
+
+    assert tablebase.max_empties == MAX_EMPTIES
+    assert len(tablebase) == len(builder)
+    for state in positions:
+        assert tablebase.value(state) == brute_force(state)
+        assert tablebase.value(state.board) == tablebase.probe(state.key())
+        # Positions solved on the way are stored too (some may be skipped)
+        for child in map(state.transition, state.get_free_cols()):
+            value = tablebase.value(child)
+            if value is not None:
+                assert value == brute_force(child)
+    assert {brute_force(state) for state in positions} == {-1, 0, 1}
+
+
+def test_unknown_positions_probe_to_none(tmp_path):
+    builder = TablebaseBuilder(MAX_EMPTIES)
+    assert builder.add_position(ConnectState()) is None  # too many empty cells
+    path = str(tmp_path / "tablebase.npy")
+    builder.save(path)
+    assert Tablebase.load(path).value(ConnectState()) is None
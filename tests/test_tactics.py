@@ -0,0 +1,67 @@
+import numpy as np
+from connect4.connect_state import ConnectState
+from connect4.perft import state_from_moves
+from connect4.rollouts import TacticalRollout
+from groups.Magnus_Carlsen.policy import heuristic_priors
+
+R, Y = -1, 1
+
+# Red to move; Yellow holds three on the second row (columns 4-6), so Red
+# playing column 3 would let Yellow complete the line right on top of it
+UNDER_THREAT = ConnectState(
+    np.array(
+        [
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [R, 0, 0, 0, Y, Y, Y],
+            [R, Y, R, 0, R, Y, R],
+        ]
+    ),
+    player=R,
+)
+
+
+def choices(state, seeds=range(50)):
+    policy = TacticalRollout()
+    cells = state.board.tolist()
+    heights = state.get_heights()
+    free = state.get_free_cols()
+    return {
+        policy.choose(cells, heights, free, state.player, np.random.default_rng(seed))
+        for seed in seeds
+    }
+
+
+def test_tactics_finds_wins_and_blocks():
+    # Red has three in column 0 and Yellow three in column 6
+    state = state_from_moves("060606")
+    assert state.tactics(R) == (1 << 0, 1 << 6, 0)
+    assert state.tactics(Y) == (1 << 6, 1 << 0, 0)
+
+
+def test_tactics_marks_moves_under_an_opponent_threat():
+    assert UNDER_THREAT.tactics(R) == (0, 0, 1 << 3)
+    assert UNDER_THREAT.threat_mask(Y) == 1 << (4 * 7 + 3)
+
+
+def test_rollout_wins_before_blocking():
+    assert choices(state_from_moves("060606")) == {0}
+
+
+def test_rollout_blocks_an_immediate_loss():
+    assert choices(state_from_moves("06060")) == {0}
+
+
+def test_rollout_avoids_unsafe_columns():
+    picked = choices(UNDER_THREAT)
+    assert 3 not in picked
+    assert len(picked) > 1
+
+
+def test_priors_prefer_blocks_and_avoid_unsafe_columns():
+    priors = heuristic_priors(state_from_moves("06060"))
+    assert max(priors, key=priors.get) == 0
+    priors = heuristic_priors(UNDER_THREAT)
+    assert priors[3] == min(priors.values())
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import pytest
+from connect4.connect_state import ConnectState
+from connect4.policy import Policy
+from groups.Magnus_Carlsen.policy import Aha
+from tournament import play
+
+PHASES = {"selection", "expansion", "rollout", "backprop", "q_update"}
+
+
+class SmallMagnus(Aha):
+    """Magnus as the pool builds it (no arguments), small and without disk I/O."""
+
+    def __init__(self):
+        super().__init__(
+            simulations=40, background_load=False, autosave=False, q_file="none.pkl"
+        )
+
+
+class FirstColumn(Policy):
+    def mount(self) -> None:
+        pass
+
+    def act(self, s: np.ndarray) -> int:
+        return int(np.flatnonzero(s[0] == 0)[0])
+
+
+def test_search_records_have_phase_timings(tmp_path):
+    magnus = Aha(
+        simulations=40, telemetry=True, autosave=False, q_file=str(tmp_path / "q")
+    )
+    magnus.mount()
+    state = ConnectState().transition(3)
+    magnus.act(state.board)
+
+    (record,) = magnus.pop_telemetry()
+    assert record["decision"] == "mcts"
+    assert set(record["phases"]) == PHASES
+    assert all(seconds >= 0 for seconds in record["phases"].values())
+    assert sum(record["phases"].values()) <= record["seconds"]
+    assert record["iterations"] == record["budget"] == 40
+    assert sum(record["root_visits"].values()) == 40
+    assert magnus.pop_telemetry() == []
+
+
+def test_telemetry_is_off_by_default(tmp_path):
+    magnus = Aha(simulations=20, autosave=False, q_file=str(tmp_path / "q"))
+    magnus.mount()
+    magnus.act(ConnectState().board)
+    assert magnus.pop_telemetry() == []
+
+
+@pytest.mark.parametrize("move_timeout", [None, 10.0])
+def test_tournament_writes_per_move_telemetry(tmp_path, monkeypatch, move_timeout):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "versus").mkdir()
+    play(
+        ("magnus", SmallMagnus),
+        ("first", FirstColumn),
+        1,
+        1.0,
+        move_timeout=move_timeout,
+        telemetry=True,
+    )
+    path = tmp_path / "versus" / "telemetry_magnus_vs_first.json"
+    records = json.loads(path.read_text())
+
+    assert records["first"] == []
+    moves = records["magnus"]
+    assert moves and all(r["game"] == 1 for r in moves)
+    searches = [r for r in moves if r["decision"] == "mcts"]
+    assert searches and all(set(r["phases"]) == PHASES for r in searches)
+
+
+def test_tournament_telemetry_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "versus").mkdir()
+    play(("magnus", SmallMagnus), ("first", FirstColumn), 1, 1.0)
+    assert not (tmp_path / "versus" / "telemetry_magnus_vs_first.json").exists()
@@ -0,0 +1,129 @@
+import json
+import time
+
+import numpy as np
+import pytest
+from connect4.policy import Policy
+from connect4.policy_worker import MoveTimeout, PolicyWorker
+from tournament import play
+
+
+class FirstColumn(Policy):
+    """Always plays the leftmost free column."""
+
+    def mount(self) -> None:
+        pass
+
+    def act(self, s: np.ndarray) -> int:
+        return int(np.flatnonzero(s[0] == 0)[0])
+
+
+class LastColumn(Policy):
+    """Always plays the rightmost free column."""
+
+    def mount(self) -> None:
+        pass
+
+    def act(self, s: np.ndarray) -> int:
+        return int(np.flatnonzero(s[0] == 0)[-1])
+
+
+class SlowOnEmptyBoard(FirstColumn):
+    """Too slow on the empty board, instant everywhere else."""
+
+    def act(self, s: np.ndarray) -> int:
+        if not s.any():
+            time.sleep(5)
+        return super().act(s)
+
+
+@pytest.fixture
+def versus_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "versus").mkdir()
+    return tmp_path / "versus"
+
+
+def test_worker_timeout_raises_and_worker_can_be_remounted():
+    worker = PolicyWorker(SlowOnEmptyBoard, move_timeout=0.3)
+    try:
+        worker.mount()
+        with pytest.raises(MoveTimeout):
+            worker.act(np.zeros((6, 7), dtype=np.int8))
+
+        worker.mount()
+        board = np.zeros((6, 7), dtype=np.int8)
+        board[5, 3] = -1
+        assert worker.act(board) == 0
+    finally:
+        worker.teardown()
+
+
+def test_timeout_forfeits_the_game(versus_dir):
+    slow = ("slow", SlowOnEmptyBoard)
+    fast = ("fast", LastColumn)
+    # slow always moves first and forfeits its first move
+    winner = play(slow, fast, 1, 1.0, move_timeout=0.3, on_timeout="forfeit")
+    assert winner is fast
+
+    with open(versus_dir / "match_slow_vs_fast.json") as f:
+        match = json.load(f)
+    assert match["first_players"] == ["slow"]
+    assert match["player_a_wins"] == 0
+    assert match["player_b_wins"] == 1
+    assert match["player_a_latency"]["timeouts"] == 1
+    assert match["games"] == [[]]
+
+
+def test_wins_are_credited_to_the_agent_that_played_the_winning_colour(versus_dir):
+    # Red stacks column 0 and wins on its fourth move whoever plays it
+    a = ("a", LastColumn)
+    b = ("b", FirstColumn)
+    winner = play(a, b, 7, 0.0)  # b always moves first (Red)
+    assert winner is b
+
+    with open(versus_dir / "match_a_vs_b.json") as f:
+        match = json.load(f)
+    assert match["first_players"] == ["b"] * 4
+    assert (match["player_a_wins"], match["player_b_wins"]) == (0, 4)
+
+
+class HangsOnReset(FirstColumn):
+    def reset(self) -> None:
+        time.sleep(5)
+
+
+class HangsOnMount(FirstColumn):
+    def mount(self) -> None:
+        time.sleep(5)
+
+
+def test_worker_reset_and_mount_have_deadlines():
+    worker = PolicyWorker(HangsOnReset, move_timeout=0.3)
+    try:
+        worker.mount()
+        start = time.perf_counter()
+        worker.reset()  # killed instead of blocking
+        assert time.perf_counter() - start < 2
+        assert worker.act(np.zeros((6, 7), dtype=np.int8)) == 0
+    finally:
+        worker.teardown()
+
+    worker = PolicyWorker(HangsOnMount, move_timeout=0.3, setup_timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(MoveTimeout, match="mount"):
+        worker.mount()
+    assert time.perf_counter() - start < 2
+    worker.teardown()
+
+
+def test_timeouts_do_not_change_who_moves_first(versus_dir):
+    play(("x", SlowOnEmptyBoard), ("y", LastColumn), 9, 0.5, move_timeout=0.3)
+    with_timeouts = json.loads((versus_dir / "match_x_vs_y.json").read_text())
+    play(("x", FirstColumn), ("y", LastColumn), 9, 0.5, move_timeout=0.3)
+    without = json.loads((versus_dir / "match_x_vs_y.json").read_text())
+
+    assert with_timeouts["player_a_latency"]["timeouts"] > 0
+    n = min(len(with_timeouts["first_players"]), len(without["first_players"]))
+    assert n > 1
+    assert with_timeouts["first_players"][:n] == without["first_players"][:n]
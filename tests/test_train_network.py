@@ -0,0 +1,15 @@
+import numpy as np
+from train_network import selfplay_records
+
+
+def test_selfplay_targets_are_root_visit_shares():
+    records = selfplay_records(games=2, simulations=20, random_plies=2, seed=0)
+    assert records
+    spread = 0
+    for board, player, pi, outcome in records:
+        assert np.isclose(pi.sum(), 1.0) and (pi >= 0).all()
+        assert (pi[board[0] != 0] == 0).all()  # only legal columns
+        assert outcome in (-1.0, 0.0, 1.0)
+        spread += (pi > 0).sum() > 1
+    # Targets come from the search, not from one-hot shortcuts
+    assert spread > len(records) // 2
@@ -1,7 +1,11 @@
 from typing import Callable
-from connect4.dtos import Game, Match, Participant, Versus
+from connect4.dtos import Game, LatencyStats, Match, Participant, Versus
 from connect4.connect_state import ConnectState
+from connect4.policy_pool import PolicyPool
+from connect4.policy_worker import MoveTimeout
 import numpy as np
+import json
+import time
 
 
 def next_power_of_two(n: int) -> int:
@@ -53,11 +57,30 @@ def play(
     best_of: int,
     first_player_distribution: float,
     seed: int = 911,
+    move_timeout: float | None = None,
+    on_timeout: str = "fallback",
+    setup_timeout: float | None = None,
+    telemetry: bool = False,
 ) -> Participant:
-    """Play a match between two participants and return the winner."""
+    """
+    Play a match between two participants and return the winner.
+
+    Every call to ``act`` is timed. When ``move_timeout`` is given, each policy
+    runs in a worker process and a move slower than the deadline is replaced
+    by a random legal column (``on_timeout="fallback"``) or loses the game
+    (``on_timeout="forfeit"``). Mounting a worker is bounded by
+    ``setup_timeout`` (default: ``move_timeout``). Latency percentiles per
+    participant are stored in the ``Match`` record, and the search telemetry
+    of policies that provide it is written next to the match file; pass
+    ``telemetry=True`` to turn it on in policies with an
+    ``enable_telemetry()`` hook.
+    """
+    if on_timeout not in ("fallback", "forfeit"):
+        raise ValueError(f"Unknown timeout action: {on_timeout}")
+
     # Variables
-    a_name, a_policy = a
-    b_name, b_policy = b
+    a_name, _ = a
+    b_name, _ = b
     a_wins = 0
     b_wins = 0
     draws = 0
@@ -66,43 +89,84 @@ def play(
 
     # Random Generator
     rng = np.random.default_rng(seed)
+    # Fallback moves after a timeout use their own generator, so a timeout
+    # does not shift who moves first in the following games
+    fallback_rng = np.random.default_rng([seed, 1])
 
     games: list[Game] = []
-
-    while a_wins < games_to_win and b_wins < games_to_win:
-        total_games += 1
-        # Decide who goes first based on the distribution
-        if rng.random() < first_player_distribution:
-            first, second = (a, a_policy()), (b, b_policy())
-        else:
-            first, second = (b, b_policy()), (a, a_policy())
-
-        # Mount agents
-        first[1].mount()
-        second[1].mount()
-
-        state = ConnectState()
-        game_history: Game = Game()
-
-        while not state.is_final():
-            _, current_policy = first if state.player == -1 else second
-            action = current_policy.act(state.board)
-            game_history.append((state.board.copy().tolist(), int(action)))
-            state = state.transition(int(action))
-
-        games.append(game_history)
-
-        # Determine winner
-        if state.get_winner() == -1:
-            a_wins += 1
-        elif state.get_winner() == 1:
-            b_wins += 1
-        else:
-            draws += 1
-
-        # Early stopping in case of too many draws
-        if draws >= games_to_win + 5:
-            break
+    first_players: list[str] = []
+    move_times: dict[str, list[float]] = {a_name: [], b_name: []}
+    timeouts: dict[str, int] = {a_name: 0, b_name: 0}
+    search_records: dict[str, list[dict]] = {a_name: [], b_name: []}
+
+    # Every participant is instantiated and mounted once for the whole match
+    with PolicyPool(move_timeout, setup_timeout, telemetry) as pool:
+        a_instance = pool.get(a)
+        b_instance = pool.get(b)
+
+        while a_wins < games_to_win and b_wins < games_to_win:
+            total_games += 1
+            # Decide who goes first based on the distribution
+            if rng.random() < first_player_distribution:
+                first, second = (a, a_instance), (b, b_instance)
+            else:
+                first, second = (b, b_instance), (a, a_instance)
+
+            # Let policies drop per-game state
+            pool.reset()
+
+            state = ConnectState()
+            game_history: Game = Game()
+            first_players.append(first[0][0])
+            forfeit_winner = 0
+
+            while not state.is_final():
+                (current_name, _), current_policy = (
+                    first if state.player == -1 else second
+                )
+                start = time.perf_counter()
+                try:
+                    action = current_policy.act(state.board)
+                except MoveTimeout:
+                    move_times[current_name].append(time.perf_counter() - start)
+                    timeouts[current_name] += 1
+                    # Restart the killed worker now so that its mount time is
+                    # not charged to the next move (if mounting times out as
+                    # well, the next act() retries and counts as a timeout)
+                    try:
+                        current_policy.mount()
+                    except MoveTimeout:
+                        pass
+                    if on_timeout == "forfeit":
+                        forfeit_winner = -state.player
+                        break
+                    action = int(fallback_rng.choice(state.get_free_cols()))
+                else:
+                    move_times[current_name].append(time.perf_counter() - start)
+
+                game_history.append((state.board.copy().tolist(), int(action)))
+                state = state.transition(int(action))
+
+            games.append(game_history)
+
+            # Search records of policies that expose pop_telemetry()
+            for name, records in pool.telemetry().items():
+                search_records[name].extend({"game": total_games, **r} for r in records)
+
+            # Determine winner: map the winning colour to whoever played it
+            winner = forfeit_winner or state.get_winner()
+            if winner == 0:
+                draws += 1
+            else:
+                (winner_name, _), _ = first if winner == -1 else second
+                if winner_name == a_name:
+                    a_wins += 1
+                else:
+                    b_wins += 1
+
+            # Early stopping in case of too many draws
+            if draws >= games_to_win + 5:
+                break
 
     # Save match result
     match = Match(
@@ -111,6 +175,13 @@ def play(
         player_a_wins=a_wins,
         player_b_wins=b_wins,
         draws=draws,
+        player_a_latency=LatencyStats.from_samples(
+            move_times[a_name], timeouts[a_name]
+        ),
+        player_b_latency=LatencyStats.from_samples(
+            move_times[b_name], timeouts[b_name]
+        ),
+        first_players=first_players,
         games=games,
     )
 
@@ -119,6 +190,10 @@ def play(
     with open("versus/" + match_filename, "w") as f:
         f.write(match.model_dump_json(indent=4))
 
+    if any(search_records.values()):
+        with open(f"versus/telemetry_{a_name}_vs_{b_name}.json", "w") as f:
+            json.dump(search_records, f, indent=4)
+
     if a_wins > 0 or b_wins > 0:
         return a if a_wins > b_wins else b
     # Decide winner at random in case of too many draws with no wins or tie
@@ -68,10 +68,10 @@ def main():
         if game_idx % 2 == 1:
             mode = "OLD_as_RED"
             red_agent = MagnusOLD(simulations=SIM_OLD)
-            yellow_agent = MagnusNEW(simulations=SIM_NEW)
+            yellow_agent = MagnusNEW(simulations=SIM_NEW, background_load=False)
         else:
             mode = "NEW_as_RED"
-            red_agent = MagnusNEW(simulations=SIM_NEW)
+            red_agent = MagnusNEW(simulations=SIM_NEW, background_load=False)
             yellow_agent = MagnusOLD(simulations=SIM_OLD)
 
         print(f"Partida {game_idx}/{TOTAL_GAMES}  ({mode})")
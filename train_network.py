@@ -0,0 +1,193 @@
+import sys
+import os
+
+# --- FIX IMPORTS PARA EJECUTAR DESDE CONSOLA ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+# ------------------------------------------------
+
+import argparse
+import glob
+import json
+import time
+import numpy as np
+from connect4.connect_state import ConnectState
+from connect4.network import ValuePolicyNet
+from groups.Magnus_Carlsen.policy import Aha as Magnus
+
+
+# ------------------------------------------------
+#   Registros de entrenamiento
+# ------------------------------------------------
+# Cada registro es (tablero, jugador que mueve, distribución objetivo de
+# jugadas (7), resultado de la partida para ese jugador en [-1, 1]).
+
+def _with_outcome(positions, winner):
+    """Agrega a cada (tablero, jugador, pi) el resultado visto por su jugador."""
+    return [
+        (board, player, pi, float(winner * player))
+        for board, player, pi in positions
+    ]
+
+
+def selfplay_records(
+    games: int,
+    simulations: int = 200,
+    random_plies: int = 4,
+    seed: int = 0,
+    net_file: str | None = None,
+) -> list:
+    """
+    Juega 'games' partidas de Magnus contra sí mismo y devuelve los registros.
+
+    El objetivo de la política es la fracción de visitas de cada hijo de la
+    raíz tras el MCTS. Magnus juega en modo pure_search: siempre busca (sin
+    atajos tácticos ni tabla Q), así el objetivo nunca es una jugada suelta
+    aprendida en partidas anteriores. Las primeras 'random_plies' jugadas son aleatorias para variar
+    las aperturas. Si se da net_file, Magnus busca con esa red (iteración
+    estilo AlphaZero); si no, con PUCT y priors heurísticos.
+    """
+    rng = np.random.default_rng(seed)
+    magnus = Magnus(
+        simulations=simulations,
+        q_file=os.devnull,
+        autosave=False,
+        background_load=False,
+        selection="puct",
+        evaluator="network" if net_file else "rollout",
+        net_file=net_file or "magnus_net.npz",
+        pure_search=True,
+    )
+    magnus.mount()
+    magnus.rng = np.random.default_rng(rng.integers(2**32))
+
+    records = []
+    for _ in range(games):
+        magnus.reset()
+        state = ConnectState()
+        positions = []
+        while not state.is_final():
+            if len(positions) < random_plies:
+                action = int(rng.choice(state.get_free_cols()))
+                state = state.transition(action)
+                positions.append(None)
+                continue
+
+            action = int(magnus.act(state.board.copy()))
+            pi = np.zeros(ConnectState.COLS, dtype=np.float32)
+            for col, visits in magnus.last_root_visits.items():
+                pi[col] = visits
+            pi /= pi.sum()
+            positions.append((state.board.copy(), state.player, pi))
+            state = state.transition(action)
+
+        positions = [p for p in positions if p is not None]
+        records.extend(_with_outcome(positions, state.get_winner()))
+    return records
+
+
+def match_records(paths: list[str]) -> list:
+    """
+    Registros a partir de archivos de partidas (versus/match_*.json).
+
+    El objetivo de la política es la jugada que se hizo. Las partidas que
+    no terminaron en una posición final (p. ej. por forfeit) se ignoran.
+    """
+    records = []
+    for path in paths:
+        with open(path) as f:
+            match = json.load(f)
+        for game in match["games"]:
+            positions = []
+            state = None
+            for board, action in game:
+                board = np.array(board)
+                player = -1 if np.sum(board == -1) == np.sum(board == 1) else 1
+                pi = np.zeros(ConnectState.COLS, dtype=np.float32)
+                pi[action] = 1.0
+                positions.append((board, player, pi))
+                state = ConnectState(board, player).transition(int(action))
+            if state is None or not state.is_final():
+                continue
+            records.extend(_with_outcome(positions, state.get_winner()))
+    return records
+
+
+def train_network(
+    records: list,
+    net_file: str = "magnus_net.npz",
+    hidden: tuple[int, ...] = (128, 64),
+    epochs: int = 20,
+    batch_size: int = 256,
+    lr: float = 1e-3,
+    resume: bool = False,
+    seed: int = 0,
+) -> ValuePolicyNet:
+    """Entrena la red con los registros y guarda los pesos en net_file."""
+    if resume and os.path.exists(net_file):
+        net = ValuePolicyNet.load(net_file)
+    else:
+        net = ValuePolicyNet(hidden=hidden, seed=seed)
+
+    boards = np.stack([r[0] for r in records])
+    players = np.array([r[1] for r in records])
+    pi = np.stack([r[2] for r in records])
+    z = np.array([r[3] for r in records], dtype=np.float32)
+
+    history = net.fit(
+        boards, players, z, pi, epochs=epochs, batch_size=batch_size, lr=lr, seed=seed
+    )
+    for epoch, loss in enumerate(history, 1):
+        print(f"Época {epoch:>3}: pérdida {loss:.4f}")
+
+    net.save(net_file)
+    print("Red guardada en:", net_file)
+    return net
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entrena la red valor/política de Magnus")
+    parser.add_argument("--selfplay", type=int, default=100, help="partidas de self-play")
+    parser.add_argument("--simulations", type=int, default=200)
+    parser.add_argument(
+        "--matches", default=None,
+        help="glob de archivos de partidas para sumar, p. ej. 'versus/match_*.json'",
+    )
+    parser.add_argument("--net-file", default="magnus_net.npz")
+    parser.add_argument(
+        "--use-net", action="store_true",
+        help="jugar el self-play con la red actual de --net-file",
+    )
+    parser.add_argument("--resume", action="store_true", help="seguir entrenando --net-file")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = []
+    if args.selfplay:
+        records += selfplay_records(
+            args.selfplay,
+            simulations=args.simulations,
+            seed=args.seed,
+            net_file=args.net_file if args.use_net else None,
+        )
+    if args.matches:
+        records += match_records(sorted(glob.glob(args.matches)))
+    print(f"{len(records)} posiciones en {time.perf_counter() - start:.1f}s")
+
+    if not records:
+        raise SystemExit("No hay posiciones para entrenar.")
+
+    train_network(
+        records,
+        net_file=args.net_file,
+        epochs=args.epochs,
+        resume=args.resume,
+        seed=args.seed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,12 @@ if SCRIPT_DIR not in sys.path:
     sys.path.append(SCRIPT_DIR)
 # ------------------------------------------------
 
+import multiprocessing as mp
+import time
 import numpy as np
 from connect4.connect_state import ConnectState
 from connect4.policy import Policy
+from connect4.q_store import BoundedQStore, SharedQTable
 from groups.Magnus_Carlsen.policy import Aha as Magnus
 
 
@@ -29,12 +32,20 @@ class RandomBot(Policy):
 # ------------------------------------------------
 #   Función para jugar UNA partida entre 2 agentes
 # ------------------------------------------------
-def play_single_game(agent_first: Policy, agent_second: Policy, verbose: bool = False) -> int:
+def play_single_game(
+    agent_first: Policy,
+    agent_second: Policy,
+    verbose: bool = False,
+    mount: bool = True,
+) -> int:
     """
     Juega una partida completa entre dos políticas.
     agent_first  = jugador ROJO (-1)
     agent_second = jugador AMARILLO (1)
 
+    Si mount=False no se vuelve a montar a los agentes (útil cuando su
+    tabla Q vive solo en memoria, como en los workers de self-play).
+
     Devuelve:
         -1 si gana rojo
          1 si gana amarillo
@@ -43,8 +54,9 @@ def play_single_game(agent_first: Policy, agent_second: Policy, verbose: bool =
     state = ConnectState()  # tablero vacío
 
     # mount solo por si algún agente lo requiere (Magnus carga Q en mount)
-    agent_first.mount()
-    agent_second.mount()
+    if mount:
+        agent_first.mount()
+        agent_second.mount()
 
     while not state.is_final():
         if state.player == -1:  # turno del rojo
@@ -68,10 +80,179 @@ def play_single_game(agent_first: Policy, agent_second: Policy, verbose: bool =
     return winner
 
 
+# ------------------------------------------------
+#   Self-play en paralelo (Magnus vs Magnus)
+# ------------------------------------------------
+# Cola por la que los workers devuelven sus deltas (ver _init_worker)
+_updates = None
+
+
+def _init_worker(updates):
+    global _updates
+    _updates = updates
+
+
+def _selfplay_worker(args):
+    """
+    Juega 'episodes' partidas Magnus vs Magnus sobre la tabla Q compartida.
+
+    El worker se conecta a la SharedQTable que creó el padre (sin copiarla)
+    y lo que aprende queda en su capa privada. Al terminar envía por la
+    cola, por cada (estado, acción) tocado, (índice del worker, suma de
+    recompensas, visitas). Devuelve cuántos mensajes envió y los
+    resultados de las partidas.
+    """
+    q_shared, episodes, seed, simulations, index = args
+
+    magnus = Magnus(
+        simulations=simulations,
+        autosave=False,
+        background_load=False,
+        q_shared=q_shared,
+    )
+    magnus.mount()
+    magnus.q_stats = {}
+    magnus.rng = np.random.default_rng(seed)
+
+    results = {-1: 0, 0: 0, 1: 0}
+    for _ in range(episodes):
+        # La misma instancia juega ambos colores: aprende de los dos lados
+        winner = play_single_game(magnus, magnus, mount=False)
+        results[winner] += 1
+
+    for key, (value_sum, visits) in magnus.q_stats.items():
+        _updates.put((key, (index, value_sum, visits)))
+    sent = len(magnus.q_stats)
+    magnus.teardown()
+    return sent, results
+
+
+def merge_deltas(Q, worker_deltas: list[dict], alpha: float = 0.3) -> dict:
+    """
+    Combina los deltas de todos los workers de forma determinista.
+
+    Cada delta es (suma de recompensas, visitas) de una entrada. Se suman
+    las de todos los workers y se aplican a la Q base como si un solo
+    proceso hubiera hecho todas esas actualizaciones, con la misma regla
+    cerrada de Aha._update_Q:
+
+        Q <- (1 - alpha)^n * Q + (1 - (1 - alpha)^n) * (suma / n)
+
+    con n = visitas totales. Así N workers aprenden lo mismo que N veces
+    más partidas en un proceso, en vez de promediarse entre ellos. Los
+    workers se recorren siempre en el mismo orden, así que el resultado no
+    depende de cuál terminó primero.
+
+    Devuelve solo las entradas que cambian, listas para Q.update(...).
+    """
+    sums = {}
+    counts = {}
+    for deltas in worker_deltas:
+        for key, (value_sum, visits) in deltas.items():
+            sums[key] = sums.get(key, 0.0) + value_sum
+            counts[key] = counts.get(key, 0) + visits
+
+    merged = {}
+    for key, visits in counts.items():
+        if visits == 0:
+            continue
+        decay = (1 - alpha) ** visits
+        merged[key] = decay * Q.get(key, 0.5) + (1 - decay) * (sums[key] / visits)
+    return merged
+
+
+def train_selfplay_parallel(
+    episodes: int = 300,
+    workers: int | None = None,
+    sync_every: int = 10,
+    simulations: int = 200,
+    q_file: str = "magnus_q.pkl",
+    seed: int = 0,
+    q_capacity: int | None = None,
+):
+    """
+    Entrena a Magnus contra sí mismo con 'workers' procesos.
+
+    Cada ronda, el coordinador copia Q a una SharedQTable a la que se
+    conectan todos los workers; juegan 'sync_every' partidas cada uno y
+    envían sus deltas por una cola. El coordinador los recoge (drain), los
+    combina (merge_deltas), guarda la tabla y libera el bloque compartido.
+    Con q_capacity la tabla nunca supera ese número de entradas.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    magnus = Magnus(
+        simulations=simulations,
+        q_file=q_file,
+        q_capacity=q_capacity,
+        background_load=False,
+    )
+    magnus.mount()
+
+    totals = {-1: 0, 0: 0, 1: 0}
+    played = 0
+    round_idx = 0
+    start = time.perf_counter()
+
+    updates = mp.Queue()
+    with mp.Pool(workers, initializer=_init_worker, initargs=(updates,)) as pool:
+        while played < episodes:
+            # Repartimos las partidas que faltan entre los workers
+            per_worker = [
+                min(sync_every, max(episodes - played - i * sync_every, 0))
+                for i in range(workers)
+            ]
+            shared = SharedQTable.create(magnus.Q, updates=updates)
+            tasks = [
+                (shared.name, n, seed + round_idx * workers + i, simulations, i)
+                for i, n in enumerate(per_worker)
+                if n > 0
+            ]
+            outputs = pool.map(_selfplay_worker, tasks)
+
+            # Deltas agrupados por worker, para combinarlos siempre en el
+            # mismo orden sin importar cuál llegó primero
+            worker_deltas = [{} for _ in range(workers)]
+
+            def collect(key, delta):
+                index, value_sum, visits = delta
+                worker_deltas[index][key] = (value_sum, visits)
+
+            shared.drain(collect, count=sum(sent for sent, _ in outputs))
+            shared.close()
+            shared.unlink()
+
+            magnus.Q.update(merge_deltas(magnus.Q, worker_deltas, magnus.alpha))
+            magnus.save_Q()
+
+            for _, results in outputs:
+                for winner, n in results.items():
+                    totals[winner] += n
+            played += sum(per_worker)
+            round_idx += 1
+
+            elapsed = time.perf_counter() - start
+            print(f"\n===== Sync {round_idx}: {played}/{episodes} partidas =====")
+            print(f"Ganadas rojo: {totals[-1]}  amarillo: {totals[1]}  empates: {totals[0]}")
+            print(f"Partidas por segundo: {played / elapsed:.2f}")
+            print(f"Estados aprendidos (|Q|): {len(magnus.Q)}")
+
+    print("\n===== SELF-PLAY FINALIZADO =====")
+    print(f"Partidas totales: {played} con {workers} workers")
+    print(f"Estados almacenados en Q: {len(magnus.Q)}")
+    print("Archivo de conocimiento:", magnus.q_file)
+
+
 # ------------------------------------------------
 #   Entrenamiento principal
 # ------------------------------------------------
-def train(episodes: int = 300, mode: str = "vs_random", report_every: int = 50):
+def train(
+    episodes: int = 300,
+    mode: str = "vs_random",
+    report_every: int = 50,
+    workers: int | None = None,
+    q_capacity: int | None = None,
+):
     """
     Entrena a Magnus en diferentes modos.
 
@@ -79,9 +260,20 @@ def train(episodes: int = 300, mode: str = "vs_random", report_every: int = 50):
         episodes: número total de episodios de entrenamiento
         mode:
             - "vs_random": Magnus vs bot aleatorio
-            # Podrías extender a "selfplay" si luego quieres Magnus vs Magnus
+            - "selfplay": Magnus vs Magnus en varios procesos
+              (ver train_selfplay_parallel)
         report_every: cada cuántos episodios mostrar métricas
+            (en "selfplay", partidas por worker entre sincronizaciones)
+        workers: procesos para "selfplay" (por defecto, todos los núcleos)
+        q_capacity: máximo de entradas de la tabla Q (None = sin límite)
     """
+    if mode == "selfplay":
+        return train_selfplay_parallel(
+            episodes=episodes,
+            workers=workers,
+            sync_every=report_every,
+            q_capacity=q_capacity,
+        )
 
     # Agente que APRENDE
     magnus = Magnus(
@@ -90,6 +282,8 @@ def train(episodes: int = 300, mode: str = "vs_random", report_every: int = 50):
         alpha=0.3,
         beta=0.7,
         q_file="magnus_q.pkl",
+        q_capacity=q_capacity,
+        background_load=False,  # entrenando queremos aprender desde la 1ra jugada
     )
     # Cargar Q existente (si hay)
     magnus.mount()
@@ -163,6 +357,8 @@ def train(episodes: int = 300, mode: str = "vs_random", report_every: int = 50):
             print(f"Perdidas contra random: {total_losses_magnus}")
             print(f"Win rate aproximado: {win_rate:.3f}")
             print(f"Estados aprendidos (|Q|): {len(magnus.Q)}")
+            if isinstance(magnus.Q, BoundedQStore):
+                print(f"Estadísticas de Q: {magnus.Q.stats()}")
             print("Q-table almacenada en:", magnus.q_file)
 
     print("\n===== ENTRENAMIENTO FINALIZADO =====")